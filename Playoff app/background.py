@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# background.py
+# -*- coding: utf-8 -*-
+# Background image for the playoff canvas: reduced-resolution decoding and
+# a cache of pre-scaled copies (LANCZOS on a worker thread, NEAREST preview).
+# No Tk here - PhotoImage is created by the GUI thread in playoff.py.
+# test: python test_background.py
+__author__ = 'Martin Pihrt'
+
+import sys
+import threading
+from collections import OrderedDict
+
+# Pillow optional
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except Exception:
+    PIL_AVAILABLE = False
+
+CACHE_SIZES = 4             # scaled copies kept (last used canvas sizes)
+
+
+def load_background(path, max_size):
+    """Open an image no larger than needed for max_size (w, h).
+
+    JPEG files are decoded directly at a reduced scale (draft mode, 1/2 to
+    1/8), other formats are reduced after decoding. Returns an RGBA image.
+    """
+    img = Image.open(path)
+    max_w, max_h = max_size
+    if img.format == 'JPEG':
+        img.draft('RGB', (max_w, max_h))
+    if img.width > max_w or img.height > max_h:
+        # keeps aspect ratio, covers max_size (image is stretched to canvas)
+        scale = max(max_w / img.width, max_h / img.height)
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img = img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+    return img.convert('RGBA')
+
+
+class BackgroundScaler:
+    """Scaled copies of one source image, keyed by canvas size.
+
+    get()      cached LANCZOS copy or None
+    preview()  cheap NEAREST copy for the time until LANCZOS is ready
+    request()  LANCZOS resample on the worker thread, then on_done()
+
+    Only the newest requested size is resampled, sizes requested while the
+    worker is busy (window drag) are skipped, so is a size that is already
+    cached or being resampled. on_done is called from the worker thread,
+    the GUI must hand it over to Tk (TkBridge.post); an error in it is
+    logged and does not stop the worker.
+    """
+
+    def __init__(self, cache_sizes=CACHE_SIZES):
+        self.source = None
+        self.cache = OrderedDict()      # (w, h) -> PIL image
+        self.cache_sizes = cache_sizes
+        self.lock = threading.Lock()
+        self.pending = None             # (source, size, on_done)
+        self.running = None             # (source, size) the worker is resampling
+        self.worker = None
+        self.stats = {"hits": 0, "previews": 0, "resampled": 0, "skipped": 0}
+
+    def _use(self, source):
+        if source is not self.source:
+            with self.lock:
+                self.source = source
+                self.cache.clear()
+                self.pending = None
+
+    def get(self, source, size):
+        self._use(source)
+        with self.lock:
+            img = self.cache.get(size)
+            if img is not None:
+                self.cache.move_to_end(size)
+                self.stats["hits"] += 1
+            return img
+
+    def preview(self, source, size):
+        self._use(source)
+        self.stats["previews"] += 1
+        return source.resize(size, Image.NEAREST)
+
+    def request(self, source, size, on_done=None):
+        self._use(source)
+        with self.lock:
+            if self.pending is not None:
+                self.stats["skipped"] += 1
+            running = self.running
+            if size in self.cache or (running is not None and running[0] is source
+                                      and running[1] == size and self.worker is not None):
+                # ready or on the way, its on_done comes from that job
+                self.pending = None
+                self.stats["skipped"] += 1
+                return
+            self.pending = (source, size, on_done)
+            if self.worker is None:
+                self._start()
+
+    def _start(self):
+        # with self.lock held
+        self.worker = threading.Thread(target=self._work, daemon=True)
+        self.worker.start()
+
+    def _work(self):
+        try:
+            while True:
+                with self.lock:
+                    job = self.pending
+                    self.pending = None
+                    if job is None:
+                        self.worker = None
+                        return
+                    source, size, on_done = job
+                    if size in self.cache:
+                        continue        # resampled by an earlier job
+                    self.running = (source, size)
+                img = source.resize(size, Image.LANCZOS)
+                with self.lock:
+                    self.running = None
+                    if source is not self.source:
+                        continue        # image changed meanwhile
+                    self.cache[size] = img
+                    self.cache.move_to_end(size)
+                    while len(self.cache) > self.cache_sizes:
+                        self.cache.popitem(last=False)
+                    self.stats["resampled"] += 1
+                if on_done:
+                    try:
+                        on_done()
+                    except Exception as e:
+                        print(f"[background] on_done error {e!r}", file=sys.stderr)
+        finally:
+            # resample error: the next request() must start a new worker
+            with self.lock:
+                self.running = None
+                if self.worker is threading.current_thread():
+                    self.worker = None
+                    if self.pending is not None:
+                        self._start()
+
+    def wait(self, timeout=None):
+        """Join the worker (tests, benchmarks)."""
+        worker = self.worker
+        if worker is not None:
+            worker.join(timeout)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# bench_bracket.py
+# -*- coding: utf-8 -*-
+# Benchmarky pro bracket_core (bez GUI, běží i na Linuxu).
+# run:     python bench_bracket.py --output bench.json
+# compare: python bench_bracket.py --output new.json --compare bench.json
+__author__ = 'Martin Pihrt'
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from bracket_core import Bracket, bracket_to_setup, bracket_from_setup
+from bracket_layout import compute_layout
+from text_measure import TextMeasure
+
+DEFAULT_SIZES = [4, 8, 16, 24, 32, 64, 128, 256, 512, 1024, 2048, 4096]
+
+
+def _teams(n, rng=None, fill=1.0):
+    """Team ids 1..n; with fill < 1 some slots stay empty (BYE)."""
+    if rng is None:
+        return [str(i + 1) for i in range(n)]
+    return [str(i + 1) if rng.random() < fill else "" for i in range(n)]
+
+
+def _play_out(bracket):
+    """Promote side a of every match, round by round, up to the winner."""
+    for r_idx in range(bracket.depth):
+        for m_idx in range(bracket.match_counts[r_idx]):
+            src = bracket.slot_index(r_idx, m_idx, 'a')
+            if not bracket.slots[src].strip():
+                src = bracket.slot_index(r_idx, m_idx, 'b')
+            bracket.promote(src)
+
+
+# --- cases: setup(n) -> state, run(state) ---
+def case_build(n):
+    teams = _teams(n)
+    return lambda: Bracket(teams, [])
+
+
+def case_build_pre_round(n):
+    teams = _teams(n)
+    pre = [""] * n
+    return lambda: Bracket(teams, pre, use_pre_round=True)
+
+
+def case_resolve_byes(n):
+    teams = _teams(n, random.Random(n), fill=0.7)
+
+    def run():
+        b = Bracket(teams, [])
+        b.resolve_byes()
+    return run
+
+
+def case_bye_edits(n):
+    """100 random round-1 edits and their undo, path-only BYE propagation."""
+    rng = random.Random(n)
+    b = Bracket(_teams(n, rng, fill=0.7), [])
+    b.resolve_byes()
+    edits = []
+    for _ in range(100):
+        index = b.slot_index(0, rng.randrange(b.match_counts[0]), rng.choice("ab"))
+        text = "" if b.slots[index] else str(rng.randint(1, n))
+        edits.append((index, text, b.slots[index]))
+
+    def run():
+        for index, text, _ in edits:
+            b.set_text(index, text, auto_bye=True)
+        for index, _, old in reversed(edits):
+            b.set_text(index, old, auto_bye=True)
+    return run
+
+
+def case_promote_chain(n):
+    """One team promoted from round 1 through to the winner box."""
+    teams = _teams(n)
+
+    def run():
+        b = Bracket(teams, [])
+        index = b.slot_index(0, 0, 'a')
+        while index != 1:
+            b.promote(index)
+            index = b.parent_slot(index)
+    return run
+
+
+def case_play_out(n):
+    """Every match decided (n - 1 promotes)."""
+    teams = _teams(n)
+
+    def run():
+        _play_out(Bracket(teams, []))
+    return run
+
+
+def case_save(n):
+    b = Bracket(_teams(n), [""] * n, use_pre_round=True)
+    _play_out(b)
+    return lambda: json.dumps(bracket_to_setup(b), ensure_ascii=False, indent=2)
+
+
+def case_load(n):
+    b = Bracket(_teams(n), [""] * n, use_pre_round=True)
+    _play_out(b)
+    text = json.dumps(bracket_to_setup(b), ensure_ascii=False, indent=2)
+    return lambda: bracket_from_setup(json.loads(text))
+
+
+class _LenFont:
+    """Stand-in for tkfont.Font (no display here): ~7 px per character."""
+
+    def __init__(self, family, size):
+        self.size = size
+
+    def measure(self, text):
+        return len(text) * self.size // 2
+
+
+def case_layout(n):
+    """Full bracket geometry (cold: every text measured)."""
+    b = Bracket(_teams(n), [])
+    return lambda: compute_layout(b, 1920, 1080, TextMeasure(_LenFont).font("Arial", 14), 11)
+
+
+CASES = {
+    "build": case_build,
+    "build_pre_round": case_build_pre_round,
+    "resolve_byes": case_resolve_byes,
+    "bye_edit_undo_x100": case_bye_edits,
+    "promote_chain": case_promote_chain,
+    "play_out": case_play_out,
+    "save_setup": case_save,
+    "load_setup": case_load,
+    "layout": case_layout,
+}
+
+
+def measure(run, min_time=0.2, min_runs=5):
+    """Per-call times in ms; repeats until min_time and min_runs are reached."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < min_runs or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return times
+
+
+def run_suite(sizes, cases, min_time):
+    results = []
+    for name in cases:
+        for n in sizes:
+            times = measure(CASES[name](n), min_time=min_time)
+            results.append({
+                "case": name,
+                "teams": n,
+                "runs": len(times),
+                "best_ms": round(min(times), 6),
+                "median_ms": round(statistics.median(times), 6),
+            })
+            print(f"{name:16s} {n:5d}  best {min(times):10.4f} ms  "
+                  f"median {statistics.median(times):10.4f} ms", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print median ratios against a previous JSON run; returns regressions."""
+    old = {(r["case"], r["teams"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        prev = old.get((r["case"], r["teams"]))
+        if not prev or prev["median_ms"] <= 0:
+            continue
+        ratio = r["median_ms"] / prev["median_ms"]
+        mark = "  REGRESSION" if ratio > threshold else ""
+        print(f"{r['case']:16s} {r['teams']:5d}  {prev['median_ms']:10.4f} -> "
+              f"{r['median_ms']:10.4f} ms  x{ratio:5.2f}{mark}")
+        if mark:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="bracket_core benchmarks")
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    ap.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    ap.add_argument("--min-time", type=float, default=0.2, help="seconds per case/size")
+    ap.add_argument("--output", default="bench_bracket.json")
+    ap.add_argument("--compare", help="previous JSON result")
+    ap.add_argument("--threshold", type=float, default=1.25, help="regression ratio")
+    args = ap.parse_args(argv)
+
+    results = run_suite(args.sizes, args.cases, args.min_time)
+    data = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "min_time": args.min_time,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"saved {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
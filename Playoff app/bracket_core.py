@@ -0,0 +1,391 @@
+#!/usr/bin/env python
+# bracket_core.py
+# -*- coding: utf-8 -*-
+# Bracket data model without GUI/export dependencies (tkinter, reportlab,
+# openpyxl, PIL). Used by playoff.py, tests and benchmarks.
+# test: python test_bracket.py
+__author__ = 'Martin Pihrt'
+
+import math
+
+# max teams in bracket (qualifiers)
+MAX_TEAMS = 2048
+
+# --- Data classes ---
+class Slot:
+    __slots__ = ("text",)
+
+    def __init__(self, text=""):
+        self.text = text
+
+class Match:
+    __slots__ = ("a", "b")
+
+    def __init__(self, a=None, b=None):
+        self.a = a if a else Slot()
+        self.b = b if b else Slot()
+
+class SlotRef:
+    """Slot view into Bracket.slots (no text is stored here)."""
+    __slots__ = ("_bracket", "_index")
+
+    def __init__(self, bracket, index):
+        self._bracket = bracket
+        self._index = index
+
+    @property
+    def text(self):
+        return self._bracket.slots[self._index]
+
+    @text.setter
+    def text(self, value):
+        self._bracket.set_slot(self._index, value)
+
+class Bracket:
+    """Playoff bracket stored as one flat list of slot texts.
+
+    Matches are numbered heap-style: the final is match 1 and match h is fed
+    by matches 2h and 2h+1. Match h owns slots 2h (side a) and 2h+1 (side b),
+    so the winner of match h always lands in slot h. Slot 1 is the winner
+    box, slot 0 its (unused) second side.
+
+    `rounds` is a cached list-of-lists view of Match/SlotRef objects, so the
+    GUI can keep using rounds[r][m].a.text for reading and writing.
+
+    All writes go through set_slot(), which also keeps a reverse index
+    team id (stripped text) -> slot index (int, or tuple when the team is
+    in several slots) for positions() and furthest_round(), and bumps
+    round_versions[r] of the written round (layout caches compare it).
+    """
+
+    def __init__(self, team_list, pre_round_list, use_pre_round=False):
+        """team_list: list of initial team names (may be empty strings)"""
+        self.use_pre_round = use_pre_round
+        self.team_count = max(0, int(len(team_list)))
+        self.pre_count = max(0, int(len(pre_round_list)))
+        self.slots = []          # flat slot texts, see class docstring
+        self.match_counts = []   # real matches per round (without Vítěz)
+        self.depth = 0           # number of real rounds (without Vítěz)
+        self._where = {}         # team id -> slot index or tuple of them
+        self.round_versions = [] # per round (incl. Vítěz), +1 on every write
+        self.titles = []
+        self.pre_rounds = []
+        self.pre_titles = []
+        self._rounds_view = None
+        if use_pre_round:
+            self._build_pre(pre_round_list)
+        self._build(team_list)
+
+    def _build_pre(self, pre_round_list):
+        self.pre_rounds = []
+        self.pre_titles = ["Předkolo"]
+        first_round_match_count = math.ceil(len(pre_round_list) / 2)
+        matches = [Match(Slot(""), Slot("")) for _ in range(first_round_match_count)]
+        self.pre_rounds.append(matches)
+
+    def _build(self, team_list):
+        teams = [str(t) if t is not None else "" for t in team_list]
+
+        # first round matches: ceil(n/2), at least one
+        first_matches = math.ceil(len(teams) / 2) if len(teams) > 0 else 1
+        self.depth = (first_matches - 1).bit_length() + 1
+        width = 1 << (self.depth - 1)   # heap positions in round 1
+
+        self.match_counts = [math.ceil(first_matches / (1 << r)) for r in range(self.depth)]
+
+        # round 1: team i goes to match i // 2, side i % 2
+        self.slots = [""] * (4 * width)
+        self.slots[2 * width:2 * width + len(teams)] = teams
+        self._rounds_view = None
+        self.round_versions = [0] * (self.depth + 1)
+
+        self._where = {}
+        for i, t in enumerate(teams, start=2 * width):
+            key = t.strip()
+            if key:
+                self._index_add(key, i)
+
+        # default titles
+        self.titles = ["Kolo 1"]
+        for r in range(1, self.depth):
+            if self.match_counts[r] == 1:
+                self.titles.append("Finále")
+            else:
+                self.titles.append(f"Kolo {r+1}")
+        self.titles.append("Vítěz")
+
+    # --- index helpers ---
+    def slot_index(self, r_idx, m_idx, side):
+        if r_idx == self.depth:
+            return 1 if side == 'a' else 0
+        h = (1 << (self.depth - 1 - r_idx)) + m_idx
+        return 2 * h + (0 if side == 'a' else 1)
+
+    def slot_position(self, index):
+        """Inverse of slot_index: (round, match, side)."""
+        if index < 2:
+            return self.depth, 0, 'a' if index == 1 else 'b'
+        h = index >> 1
+        level = h.bit_length() - 1
+        return self.depth - 1 - level, h - (1 << level), 'b' if index & 1 else 'a'
+
+    def slot_round(self, index):
+        """Round of slot `index` (depth = Vítěz)."""
+        return self.depth + 1 - index.bit_length() if index >= 2 else self.depth
+
+    def parent_slot(self, index):
+        """Slot that receives the winner of the match owning `index`."""
+        return index >> 1 if index >= 2 else 1
+
+    def promote(self, index, auto_bye=False):
+        """Move the team from slot `index` one round up (right-click).
+
+        Returns list of changed slot indices, empty when the slot is empty.
+        """
+        winner = self.slots[index].strip()
+        if not winner:
+            return []
+        return self.set_text(self.parent_slot(index), winner, auto_bye=auto_bye)
+
+    def set_slot(self, index, text):
+        old = self.slots[index].strip()
+        if old:
+            self._index_remove(old, index)
+        self.slots[index] = text
+        self.round_versions[self.slot_round(index)] += 1
+        key = text.strip()
+        if key:
+            self._index_add(key, index)
+
+    def set_text(self, index, text, auto_bye=False):
+        """Write one slot; with auto_bye re-evaluate only its path to the final.
+
+        Returns list of changed slot indices (the written slot first).
+        """
+        if self.slots[index] == text:
+            return []
+        self.set_slot(index, text)
+        changed = [index]
+        if auto_bye:
+            changed += self.propagate_byes(index)
+        return changed
+
+    def is_padding(self, index):
+        """Slot that never gets a team: past the last team in round 1, or
+        fed by a match that does not exist (odd team counts)."""
+        first = len(self.slots) // 2           # first round-1 slot
+        if index >= first:
+            return index - first >= self.team_count
+        r, m, _ = self.slot_position(2 * index)   # match `index` feeds it
+        return m >= self.match_counts[r]
+
+    def _bye_winner(self, h):
+        # only a team against padding is a BYE; an empty side fed by an
+        # unplayed match is not
+        a = self.slots[2 * h].strip()
+        b = self.slots[2 * h + 1].strip()
+        if a and not b and self.is_padding(2 * h + 1):
+            return a
+        if b and not a and self.is_padding(2 * h):
+            return b
+        return None
+
+    def propagate_byes(self, index):
+        """Automatic BYE for the matches on the path from slot `index` up.
+
+        Stops at the first match that is not a BYE or whose winner slot
+        already holds the BYE team, so the cost is O(log n) per change.
+        """
+        changed = []
+        # a BYE match below still owns this slot (same as the full scan)
+        if 1 <= index < len(self.slots) // 2:
+            winner = self._bye_winner(index)
+            if winner is not None and self.slots[index] != winner:
+                self.set_slot(index, winner)
+                changed.append(index)
+        h = index >> 1
+        while h >= 1:
+            winner = self._bye_winner(h)
+            if winner is None or self.slots[h] == winner:
+                break
+            self.set_slot(h, winner)
+            changed.append(h)
+            h >>= 1
+        return changed
+
+    def resolve_byes(self):
+        """Automatic BYE over the whole bracket (full scan, round by round)."""
+        # descending heap index = round 1 first; padding matches stay empty
+        for h in range(len(self.slots) // 2 - 1, 0, -1):
+            winner = self._bye_winner(h)
+            if winner is not None:
+                self.set_slot(h, winner)
+
+    def clear_slots(self):
+        self.slots = [""] * len(self.slots)
+        self._where = {}
+        self.round_versions = [v + 1 for v in self.round_versions]
+
+    # --- 3rd place ---
+    @staticmethod
+    def touches_third_place(changed):
+        """True if one of the changed slots is in the final (2-3) or semifinal (4-7)."""
+        return any(2 <= i < 8 for i in changed)
+
+    def semifinal_losers(self):
+        """Semifinal teams that did not reach the final, in match order."""
+        if self.depth < 2:
+            return []
+
+        slots = self.slots
+        finalists = (slots[2].strip(), slots[3].strip())
+        losers = []
+        for h in range(2, 2 + self.match_counts[self.depth - 2]):
+            a = slots[2 * h].strip()
+            b = slots[2 * h + 1].strip()
+            if a in finalists:
+                loser = b
+            elif b in finalists:
+                loser = a
+            else:
+                loser = ""
+            if loser:
+                losers.append(loser)
+        return losers
+
+    # --- team index ---
+    def _index_add(self, key, index):
+        cur = self._where.get(key)
+        if cur is None:
+            self._where[key] = index
+        elif isinstance(cur, int):
+            self._where[key] = (cur, index)
+        else:
+            self._where[key] = cur + (index,)
+
+    def _index_remove(self, key, index):
+        cur = self._where[key]
+        if isinstance(cur, int):
+            del self._where[key]
+            return
+        rest = tuple(i for i in cur if i != index)
+        self._where[key] = rest[0] if len(rest) == 1 else rest
+
+    def team_slots(self, team):
+        """Slot indices of team id, sorted."""
+        cur = self._where.get(str(team).strip())
+        if cur is None:
+            return []
+        if isinstance(cur, int):
+            return [cur]
+        return sorted(cur)
+
+    def positions(self, team):
+        """All (round, match, side) positions of team id, in slot order."""
+        return [self.slot_position(i) for i in self.team_slots(team)]
+
+    def furthest_round(self, team):
+        """Highest round index the team reached (Vítěz = depth), or -1."""
+        where = self.team_slots(team)
+        if not where:
+            return -1
+        return self.slot_position(where[0])[0]
+
+    def round_slots(self, team, r_idx):
+        """Slot indices of team id within one round."""
+        lo = 2 * (1 << (self.depth - 1 - r_idx)) if r_idx < self.depth else 0
+        hi = 2 * lo if r_idx < self.depth else 2
+        return [i for i in self.team_slots(team) if lo <= i < hi]
+
+    def load_rounds(self, rounds_in):
+        """Fill slot texts from setup data: [[{'a': .., 'b': ..}, ...], ...]"""
+        for r_idx, rd in enumerate(rounds_in):
+            if r_idx > self.depth:
+                break
+            count = 1 if r_idx == self.depth else self.match_counts[r_idx]
+            for m_idx, mdata in enumerate(rd[:count]):
+                self.set_slot(self.slot_index(r_idx, m_idx, 'a'), mdata.get('a', ''))
+                self.set_slot(self.slot_index(r_idx, m_idx, 'b'), mdata.get('b', ''))
+
+    @property
+    def rounds(self):
+        if self._rounds_view is None:
+            view = []
+            for r_idx, count in enumerate(self.match_counts):
+                base = 2 * (1 << (self.depth - 1 - r_idx))
+                view.append([
+                    Match(SlotRef(self, base + 2 * m), SlotRef(self, base + 2 * m + 1))
+                    for m in range(count)
+                ])
+            view.append([Match(SlotRef(self, 1), SlotRef(self, 0))])
+            self._rounds_view = view
+        return self._rounds_view
+
+    def rounds_count(self):
+        return self.depth + 1
+
+
+# --- setup file (.setup JSON) ---
+def bracket_to_setup(bracket, pre_round_enabled=True):
+    """Bracket part of the setup file: team_count, titles, rounds, pre-round."""
+    data = {
+        'team_count': 0,
+        'titles': [],
+        'rounds': [],
+        'pre_titles': [],
+        'pre_rounds': [],
+    }
+    if bracket is None:
+        return data
+
+    slots = bracket.slots
+    data['team_count'] = bracket.team_count
+    data['titles'] = bracket.titles
+    data['pre_titles'] = bracket.pre_titles
+    for r_idx, count in enumerate(bracket.match_counts):
+        base = 2 * (1 << (bracket.depth - 1 - r_idx))
+        data['rounds'].append([
+            {'a': slots[base + 2 * m], 'b': slots[base + 2 * m + 1]}
+            for m in range(count)
+        ])
+    data['rounds'].append([{'a': slots[1], 'b': slots[0]}])
+
+    if pre_round_enabled and bracket.pre_rounds:
+        data['pre_rounds'] = [
+            [{'a': m.a.text, 'b': m.b.text} for m in bracket.pre_rounds[0]]
+        ]
+    return data
+
+
+def bracket_from_setup(data, pre_round_enabled=True):
+    """Rebuild Bracket from setup data; the shape is given by team_count."""
+    n = int(max(0, data.get('team_count', 0)))
+    bracket = Bracket(
+        [""] * n,
+        pre_round_list=[""] * n if pre_round_enabled else [],
+        use_pre_round=pre_round_enabled
+    )
+
+    # --- pre-round ---
+    pre_titles = data.get('pre_titles', [])
+    pre_rounds = data.get('pre_rounds', [])
+
+    if pre_round_enabled and pre_rounds:
+        if not bracket.pre_rounds:
+            bracket._build_pre([""] * n)
+
+        bracket.pre_titles = pre_titles if pre_titles else ["Předkolo"]
+
+        for m_idx, mdata in enumerate(pre_rounds[0]):
+            if m_idx < len(bracket.pre_rounds[0]):
+                bracket.pre_rounds[0][m_idx].a.text = mdata.get('a', '')
+                bracket.pre_rounds[0][m_idx].b.text = mdata.get('b', '')
+
+    # --- titles ---
+    for i, t in enumerate(data.get('titles', [])):
+        if i < len(bracket.titles):
+            bracket.titles[i] = t
+
+    # --- rounds text ---
+    bracket.load_rounds(data.get('rounds', []))
+    return bracket
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# bracket_layout.py
+# -*- coding: utf-8 -*-
+# Bracket geometry (boxes, lines, titles) shared by the Tk canvas (redraw)
+# and the PDF export. Pure computation, no Tk/reportlab - the font is any
+# object with measure(text) (text_measure.CachedFont in the app).
+# test: python test_bracket_layout.py
+__author__ = 'Martin Pihrt'
+
+from bisect import bisect_right
+
+# font_scale -> (cell font size, title font size) on the canvas
+FONT_SIZES = {
+    'large': (28, 13),
+    'medium': (14, 11),
+    'small': (12, 8),
+}
+DEFAULT_FONT_SIZES = (14, 8)
+
+MARGIN_X = 40
+MARGIN_Y = 40
+H_GAP = 70          # between columns
+V_GAP = 10          # between matches
+BOX_H = 40          # one slot (before scaling to canvas height)
+MIN_SCALE = 0.25
+
+COL_PADDING = 20
+COL_MIN_W = 60
+COL_MAX_W = 220
+
+THIRD_OFFSET_Y = 100    # 3rd place below the winner box
+THIRD_GAP = 6
+
+
+def font_sizes(font_scale):
+    return FONT_SIZES.get(font_scale, DEFAULT_FONT_SIZES)
+
+
+def column_widths(bracket, font, current_winner="", round_widths=None):
+    """Column width per bracket round (Vítěz last).
+
+    With round_widths (text_measure.RoundWidths) only rounds whose texts
+    changed since the last call (Bracket.round_versions) are measured.
+    """
+    rounds = bracket.rounds
+    last_round = len(rounds) - 1
+    widths = []
+    for r_idx, matches in enumerate(rounds):
+        if r_idx == last_round:
+            winner_match = rounds[last_round][0]
+            winner_text = winner_match.a.text.strip() or winner_match.b.text.strip() or current_winner
+            key = (getattr(font, "key", None), bracket.round_versions[r_idx], current_winner)
+            compute = lambda: font.measure(winner_text)
+        else:
+            key = (getattr(font, "key", None), bracket.round_versions[r_idx])
+            compute = lambda matches=matches: max(
+                max(font.measure(m.a.text.strip()), font.measure(m.b.text.strip()))
+                for m in matches
+            )
+        if round_widths is not None:
+            text_px = round_widths.get(bracket, r_idx, key, compute)
+        else:
+            text_px = compute()
+        widths.append(max(COL_MIN_W, min(COL_MAX_W, text_px + COL_PADDING)))
+    return widths
+
+
+class Layout:
+    """Geometry of one bracket frame in canvas coordinates.
+
+    Texts are not stored here, renderers read them from the bracket
+    (rounds[r][m].a.text, titles[r], ...).
+
+    matches   [(r, m, x1, y1, x2, y2)] whole match box; side a is
+              y1..y1+box_h, side b is y1+box_h+8..y2
+    links     [(r, m, x1, y1, x2, y2)] match -> next column
+    titles    [(x, y, width)] per round, anchor "n"
+    winner    (x1, y1, x2, y2) of the Vítěz box
+    third     dict a/b/winner boxes, title and lines, or None
+    """
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.box_h = BOX_H
+        self.v_gap = V_GAP
+        self.title_font_size = 0
+        self.offset = 0                 # 1 = pre round column first
+        self.col_widths = []            # bracket rounds (no pre round)
+        self.col_x = []                 # incl. pre round column
+        self.titles = []
+        self.pre_title = None
+        self.pre_matches = []           # [(m, x1, y1, x2, y2)]
+        self.matches = []
+        self.links = []
+        self.final_centers = []
+        self.semi_losers_centers = []
+        self.winner = None
+        self.winner_text = ""
+        self.third = None
+        self._hits = None
+
+    def hit_index(self):
+        """HitIndex for this layout (built on first use)."""
+        if self._hits is None:
+            self._hits = HitIndex(self)
+        return self._hits
+
+    def side_boxes(self, x1, y1, x2, y2):
+        """Slot boxes (a, b) of a match box."""
+        return (x1, y1, x2, y1 + self.box_h), (x1, y1 + self.box_h + 8, x2, y2)
+
+
+def compute_layout(bracket, width, height, font, title_font_size,
+                   current_winner="", pre_round=False, third_place_winner=None,
+                   round_widths=None):
+    """Layout for `bracket` on a width x height canvas.
+
+    third_place_winner: text of the 3rd place winner box, None = no 3rd place.
+    """
+    lay = Layout()
+    lay.width = width
+    lay.height = height
+    lay.title_font_size = title_font_size
+
+    rounds = bracket.rounds
+    rounds_count = len(rounds)
+    last_round = rounds_count - 1
+    final_real_round = last_round - 1
+
+    col_widths = column_widths(bracket, font, current_winner, round_widths)
+    lay.col_widths = col_widths
+
+    box_h = BOX_H
+    v_gap = V_GAP
+    per_match_h = box_h * 2 + 8
+    initial_matches = len(rounds[0])
+
+    total_h = initial_matches * per_match_h + (initial_matches - 1) * v_gap + 2 * MARGIN_Y
+    if total_h > height:
+        scale = max(MIN_SCALE, height / total_h)
+        box_h = int(box_h * scale)
+        v_gap = max(3, int(v_gap * scale))
+        per_match_h = box_h * 2 + 8
+    lay.box_h = box_h
+    lay.v_gap = v_gap
+    step = per_match_h + v_gap
+
+    def column_top(count):
+        total_col_h = count * per_match_h + (count - 1) * v_gap
+        return max(MARGIN_Y + title_font_size + 10, (height - total_col_h) // 2)
+
+    # --- X column positions (pre round column uses the round 1 width) ---
+    offset = 1 if (pre_round and bracket.pre_rounds) else 0
+    lay.offset = offset
+    x = MARGIN_X
+    if offset:
+        lay.col_x.append(x)
+        x += col_widths[0] + H_GAP
+    for w in col_widths:
+        lay.col_x.append(x)
+        x += w + H_GAP
+    col_x = lay.col_x
+
+    # --- pre round ---
+    if offset:
+        box_w = col_widths[0]
+        lay.pre_title = (col_x[0] + box_w / 2, MARGIN_Y - 10, box_w + 60)
+        pre_matches = bracket.pre_rounds[0]
+        start_y = column_top(len(pre_matches))
+        for m_idx in range(len(pre_matches)):
+            y1 = start_y + m_idx * step
+            lay.pre_matches.append((m_idx, col_x[0], y1, col_x[0] + box_w, y1 + per_match_h))
+
+    # --- rounds ---
+    for r_idx, matches in enumerate(rounds):
+        x1 = col_x[r_idx + offset]
+        box_w = col_widths[r_idx]
+        lay.titles.append((x1 + box_w / 2, MARGIN_Y - 10, box_w + 60))
+
+        if r_idx == last_round and len(matches) == 1:
+            continue
+
+        start_y = column_top(len(matches))
+        if r_idx + 1 < rounds_count:
+            next_x = col_x[r_idx + 1 + offset]
+            next_top = column_top(len(rounds[r_idx + 1]))
+
+        for m_idx, match in enumerate(matches):
+            y1 = start_y + m_idx * step
+            x2 = x1 + box_w
+            y2 = y1 + per_match_h
+            lay.matches.append((r_idx, m_idx, x1, y1, x2, y2))
+
+            if r_idx + 1 < rounds_count:
+                ny = next_top + (m_idx // 2) * step + box_h
+                lay.links.append((r_idx, m_idx, x2, (y1 + y2) / 2, next_x, ny))
+
+            if r_idx == final_real_round:
+                lay.final_centers.append((x2, (y1 + y2) / 2))
+
+            if r_idx == last_round - 2:
+                final_match = rounds[last_round - 1][0]
+                if m_idx == 0:
+                    finalist = final_match.a.text.strip()
+                else:
+                    finalist = final_match.b.text.strip()
+                text_a = match.a.text.strip()
+                text_b = match.b.text.strip()
+                if text_a and text_a != finalist:
+                    lay.semi_losers_centers.append((x2, y1 + box_h / 2))
+                if text_b and text_b != finalist:
+                    lay.semi_losers_centers.append((x2, y1 + box_h + 8 + box_h / 2))
+
+    # --- winner box ---
+    winner_match = rounds[last_round][0]
+    winner_text = winner_match.a.text.strip() or winner_match.b.text.strip() or current_winner
+    lay.winner_text = winner_text
+
+    text_width = font.measure(winner_text) if winner_text else 0
+    win_w = max(text_width + 60, col_widths[last_round] + 40)
+    win_h = box_h * 2
+    win_x_center = col_x[last_round + offset] + col_widths[last_round] / 2
+    win_y1 = (height // 2) - win_h // 2
+    lay.winner = (win_x_center - win_w / 2, win_y1, win_x_center + win_w / 2, win_y1 + win_h)
+
+    # --- 3rd place ---
+    if third_place_winner is not None:
+        win_x1 = lay.winner[0]
+        base_x = col_x[final_real_round + offset]
+        base_y = lay.winner[3] + THIRD_OFFSET_Y
+        box_w = col_widths[final_real_round]
+        a_y1 = base_y
+        b_y1 = a_y1 + box_h + THIRD_GAP
+
+        text_width_tp = font.measure(third_place_winner) if third_place_winner else 0
+        winner_w = max(text_width_tp + 60, col_widths[last_round] + 40)
+
+        third = {
+            "title": (base_x + 60, base_y - 25),
+            "a": (base_x, a_y1, base_x + box_w, a_y1 + box_h),
+            "b": (base_x, b_y1, base_x + box_w, b_y1 + box_h),
+            "winner": (win_x1, a_y1, win_x1 + winner_w, a_y1 + box_h * 2),
+            "link": (base_x + box_w, a_y1 + box_h, win_x1, a_y1 + box_h),
+            "semi_links": [],
+        }
+        if len(lay.semi_losers_centers) >= 2:
+            p1, p2 = lay.semi_losers_centers[:2]
+            third["semi_links"] = [
+                (p1[0], p1[1], base_x, a_y1 + box_h / 2),
+                (p2[0], p2[1], base_x, b_y1 + box_h / 2),
+            ]
+        lay.third = third
+
+    return lay
+
+
+class HitIndex:
+    """Click position -> target, without per-item canvas bindings.
+
+    Slot boxes are grouped by column (columns never overlap in x). find()
+    bisects the column by x and then the slot by y, O(log n). The few
+    boxes outside columns (Vítěz, 3rd place) are checked one by one.
+
+    targets: ('slot', r, m, side), ('pre', m, side), ('winner',),
+             ('tp', 'a' | 'b' | 'winner')
+    """
+
+    def __init__(self, lay):
+        columns = {}                    # x1 -> (x2, [(y1, y2, target)])
+        for m_idx, x1, y1, x2, y2 in lay.pre_matches:
+            box_a, box_b = lay.side_boxes(x1, y1, x2, y2)
+            items = columns.setdefault(x1, (x2, []))[1]
+            items.append((box_a[1], box_a[3], ('pre', m_idx, 'a')))
+            items.append((box_b[1], box_b[3], ('pre', m_idx, 'b')))
+        for r_idx, m_idx, x1, y1, x2, y2 in lay.matches:
+            box_a, box_b = lay.side_boxes(x1, y1, x2, y2)
+            items = columns.setdefault(x1, (x2, []))[1]
+            items.append((box_a[1], box_a[3], ('slot', r_idx, m_idx, 'a')))
+            items.append((box_b[1], box_b[3], ('slot', r_idx, m_idx, 'b')))
+
+        self.col_x1 = sorted(columns)
+        self.columns = []
+        for x1 in self.col_x1:
+            x2, items = columns[x1]
+            items.sort(key=lambda item: item[0])
+            self.columns.append((x2, [item[0] for item in items], items))
+
+        self.extra = []                 # [(x1, y1, x2, y2, target)]
+        if lay.winner:
+            self.extra.append(lay.winner + (('winner',),))
+        if lay.third:
+            for field in ('a', 'b', 'winner'):
+                self.extra.append(lay.third[field] + (('tp', field),))
+
+    def find(self, x, y):
+        i = bisect_right(self.col_x1, x) - 1
+        if i >= 0:
+            x2, y1s, items = self.columns[i]
+            if x <= x2:
+                j = bisect_right(y1s, y) - 1
+                if j >= 0 and y <= items[j][1]:
+                    return items[j][2]
+        for x1, y1, x2, y2, target in self.extra:
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                return target
+        return None
+
+
+class LayoutCache:
+    """Last computed layout, reused while the key is the same.
+
+    The app builds the key from the bracket, Bracket.round_versions, canvas
+    size and font scale, so redraw and a following PDF export share one
+    computation.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.layout = None
+        self.stats = {"hits": 0, "computed": 0}
+
+    def get(self, key, compute):
+        if self.layout is not None and key == self.key:
+            self.stats["hits"] += 1
+            return self.layout
+        self.layout = compute()
+        self.key = key
+        self.stats["computed"] += 1
+        return self.layout
+
+    def clear(self):
+        self.key = None
+        self.layout = None
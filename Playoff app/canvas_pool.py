@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# canvas_pool.py
+# -*- coding: utf-8 -*-
+# Retained-mode helper for tk.Canvas: items are kept between redraws and
+# only changed coordinates/options are sent to Tk.
+# test: python test_canvas_pool.py
+__author__ = 'Martin Pihrt'
+
+# stacking order, bottom -> top (every pool item carries its layer tag)
+LAYERS = ("bg", "link", "box", "mark", "text", "top")
+
+
+class CanvasPool:
+    """Canvas items keyed by a logical key, e.g. ('slot', r, m, 'a').
+
+    Usage per frame:
+        pool.begin()
+        pool.item(key, 'rectangle', (x1, y1, x2, y2), layer='box', fill=...)
+        ...
+        pool.end()   # deletes items not drawn this frame
+
+    An existing item is only moved (coords) or reconfigured (itemconfigure)
+    when its coordinates or options differ from the last frame. New items
+    are created with their layer tag and, if any were created, the layers
+    are re-stacked once at end(). `binds` are attached only on creation.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.items = {}       # key -> [item_id, coords, opts]
+        self.live = set()
+        self.stats = {"created": 0, "moved": 0, "configured": 0, "deleted": 0}
+
+    def begin(self):
+        self.live = set()
+        for k in self.stats:
+            self.stats[k] = 0
+
+    def item(self, key, kind, coords, layer="box", binds=None, **opts):
+        coords = tuple(coords)
+        entry = self.items.get(key)
+
+        if entry is None:
+            tags = opts.pop("tags", ())
+            if isinstance(tags, str):
+                tags = (tags,)
+            create = getattr(self.canvas, "create_" + kind)
+            item_id = create(*coords, tags=(layer,) + tuple(tags), **opts)
+            if binds:
+                for seq, func in binds.items():
+                    self.canvas.tag_bind(item_id, seq, func)
+            opts["tags"] = tags
+            self.items[key] = [item_id, coords, opts]
+            self.stats["created"] += 1
+        else:
+            item_id, old_coords, old_opts = entry
+            opts.pop("tags", None)
+            if coords != old_coords:
+                self.canvas.coords(item_id, *coords)
+                entry[1] = coords
+                self.stats["moved"] += 1
+            changed = {k: v for k, v in opts.items() if old_opts.get(k) != v}
+            if changed:
+                self.canvas.itemconfigure(item_id, **changed)
+                old_opts.update(changed)
+                self.stats["configured"] += 1
+
+        self.live.add(key)
+        return item_id
+
+    def keep(self, key, **opts):
+        """Keep an existing item for this frame without new coordinates.
+
+        Returns the item id, or None if the item does not exist.
+        """
+        entry = self.items.get(key)
+        if entry is None:
+            return None
+        item_id, _, old_opts = entry
+        changed = {k: v for k, v in opts.items() if old_opts.get(k) != v}
+        if changed:
+            self.canvas.itemconfigure(item_id, **changed)
+            old_opts.update(changed)
+            self.stats["configured"] += 1
+        self.live.add(key)
+        return item_id
+
+    def get(self, key):
+        entry = self.items.get(key)
+        return entry[0] if entry else None
+
+    def end(self):
+        stale = [k for k in self.items if k not in self.live]
+        for k in stale:
+            self.canvas.delete(self.items.pop(k)[0])
+        self.stats["deleted"] = len(stale)
+
+        if self.stats["created"]:
+            for layer in LAYERS:
+                self.canvas.tag_raise(layer)
+
+    def clear(self):
+        """Delete every pool item (e.g. when switching views)."""
+        for entry in self.items.values():
+            self.canvas.delete(entry[0])
+        self.items.clear()
+        self.live = set()
+
+    def forget(self):
+        """Drop the bookkeeping after canvas.delete('all') elsewhere."""
+        self.items.clear()
+        self.live = set()
+
+    def __len__(self):
+        return len(self.items)
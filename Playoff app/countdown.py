@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# countdown.py
+# -*- coding: utf-8 -*-
+# Match countdown computed from a monotonic deadline: remaining = deadline -
+# now, so a late tick (redraw, dialog, busy GUI) only delays the display,
+# it never makes the countdown itself slower. Pause keeps the remaining
+# time, resume sets a new deadline. No Tk import.
+# test: python test_countdown.py
+__author__ = 'Martin Pihrt'
+
+import time
+
+NS_PER_MS = 1_000_000
+DIGITS = (0, 1, 2)          # shown decimal places: MM:SS, MM:SS.d, MM:SS.cc
+
+
+def format_remaining(ms, digits=0):
+    """MM:SS[.d[c]] rounded up, so 00:00 is shown only when the time is over."""
+    unit = 10 ** (3 - digits)                   # ms per last shown digit
+    units = -(-max(0, ms) // unit)              # ceil
+    sec, frac = divmod(units * unit, 1000)
+    text = f"{sec // 60:02d}:{sec % 60:02d}"
+    if digits:
+        text += "." + f"{frac:03d}"[:digits]
+    return text
+
+
+class Countdown:
+    """One countdown (the timer box).
+
+        cd.start(300_000)           # 5 min from now
+        cd.text(digits=1)           # "04:59.3"
+        cd.pause(); cd.resume()
+        cd.expired                  # deadline reached (not while paused)
+        cd.next_change_ms(digits)   # when the shown text changes next
+    """
+
+    def __init__(self, clock=time.monotonic_ns):
+        self.clock = clock
+        self.deadline_ns = None
+        self.paused_left_ns = None      # remaining time while paused
+
+    @property
+    def running(self):
+        return self.deadline_ns is not None and self.paused_left_ns is None
+
+    @property
+    def paused(self):
+        return self.paused_left_ns is not None
+
+    @property
+    def expired(self):
+        return self.running and self.remaining_ns() == 0
+
+    def start(self, ms, now_ns=None):
+        now = self.clock() if now_ns is None else now_ns
+        self.deadline_ns = now + int(ms) * NS_PER_MS
+        self.paused_left_ns = None
+
+    def stop(self):
+        self.deadline_ns = None
+        self.paused_left_ns = None
+
+    def pause(self, now_ns=None):
+        if not self.running:
+            return False
+        self.paused_left_ns = self.remaining_ns(now_ns)
+        return True
+
+    def resume(self, now_ns=None):
+        if not self.paused:
+            return False
+        now = self.clock() if now_ns is None else now_ns
+        self.deadline_ns = now + self.paused_left_ns
+        self.paused_left_ns = None
+        return True
+
+    def remaining_ns(self, now_ns=None):
+        if self.paused_left_ns is not None:
+            return self.paused_left_ns
+        if self.deadline_ns is None:
+            return 0
+        now = self.clock() if now_ns is None else now_ns
+        return max(0, self.deadline_ns - now)
+
+    def remaining_ms(self, now_ns=None):
+        return -(-self.remaining_ns(now_ns) // NS_PER_MS)     # ceil
+
+    def text(self, digits=0, now_ns=None):
+        return format_remaining(self.remaining_ms(now_ns), digits)
+
+    def next_change_ms(self, digits=0, now_ns=None):
+        """ms until the shown text changes (or the countdown expires)."""
+        unit_ns = 10 ** (3 - digits) * NS_PER_MS
+        left = self.remaining_ns(now_ns) % unit_ns or unit_ns
+        return max(1, -(-left // NS_PER_MS))
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# gate_simulator.py
+# -*- coding: utf-8 -*-
+# Simulator of the gate semaphore firmware (fw1.6 protocol) for tests and
+# for running the app on Linux without hardware.
+#
+#   GateSimulator   in-process replacement of serial.Serial (in_waiting,
+#                   read, write), own micros() clock with drift and random
+#                   USB latency; used by test_device_clock.py
+#   python gate_simulator.py
+#                   the same on a pseudo terminal: prints /dev/pts/N, set it
+#                   as the USB port in the app (Linux/macOS)
+# test: python test_device_clock.py
+__author__ = 'Martin Pihrt'
+
+import argparse
+import os
+import random
+import select
+import sys
+import threading
+import time
+
+NS_PER_MS = 1_000_000
+WRAP_US = 1 << 32
+
+OK_DELAY_MS = 3400          # START -> semafor -> "ok" (2x800 ms steps + fades)
+
+
+class GateSimulator:
+    """Gate firmware as seen through the serial port.
+
+    Lines are queued with the device micros() of the event and delivered
+    after a random latency (FIFO like a real port). With auto=True it
+    answers "start" (playoff) and drives laps in "mode_laps" like cars
+    passing the beams.
+    """
+
+    def __init__(self, clock=time.perf_counter_ns, drift_ppm=0.0, latency_ms=(1.0, 16.0),
+                 micros_start=0, sync_ms=500, seed=None, auto=False, lap_ms=(12000, 20000),
+                 timeout=0, boot_ms=0):
+        self.clock = clock
+        self.timeout = timeout      # read(): 0 = return at once, None = block (real clock only)
+        self.drift = drift_ppm / 1e6
+        self.latency_ms = latency_ms
+        self.micros_start = micros_start
+        self.sync_ns = sync_ms * NS_PER_MS
+        self.rnd = random.Random(seed)
+        self.auto = auto
+        self.lap_ms = lap_ms
+
+        self.boot_ns = clock()
+        self.is_open = True
+        self.timestamps = False
+        self.mode = "playoff"
+        self.rx = b""               # commands from the app
+        self.out = []               # [deliver_ns, bytes]
+        self.last_deliver = 0
+        self.next_sync = None
+        self.pending = []           # auto mode: [at_ns, event]
+        self.lap_running = {"a": False, "b": False}
+        self._cond = threading.Condition()     # blocking read() wakes on new output
+        self._cancelled = False
+        # reset on open: commands are lost until setup() prints the banner
+        self.ready_ns = self.boot_ns + int(boot_ms * NS_PER_MS)
+        if boot_ms:
+            self._schedule(self.ready_ns, "[BOOT] READY")
+
+    # --- device clock ---
+    def micros(self, host_ns):
+        elapsed_us = (host_ns - self.boot_ns) * (1 + self.drift) / 1000
+        return int(self.micros_start + elapsed_us) % WRAP_US
+
+    # --- events (device -> app) ---
+    def event(self, name, host_ns=None, stamp=True):
+        """The firmware sends `name` at host time host_ns (default now)."""
+        at = self.clock() if host_ns is None else host_ns
+        line = name
+        if self.timestamps and stamp:
+            line += f" @{self.micros(at)}"
+        lo, hi = self.latency_ms
+        deliver = at + int(self.rnd.uniform(lo, hi) * NS_PER_MS)
+        deliver = max(deliver, self.last_deliver)
+        self.last_deliver = deliver
+        with self._cond:
+            self.out.append([deliver, (line + "\r\n").encode()])
+            self._cond.notify_all()
+
+    def _pump(self):
+        # sync lines and scheduled events up to now, in time order
+        now = self.clock()
+        while True:
+            sync = self.next_sync if self.timestamps else None
+            event = self.pending[0][0] if self.pending else None
+            if event is not None and event <= now and (sync is None or event <= sync):
+                at, name = self.pending.pop(0)
+                self.event(name, at)
+                if self.auto and self.mode == "laps" and name.startswith(("start_", "stop_")):
+                    self._next_lap(name[-1], at)
+            elif sync is not None and sync <= now:
+                self.event("sync", sync)
+                self.next_sync += self.sync_ns
+            else:
+                break
+
+    def _schedule(self, at, name):
+        self.pending.append([at, name])
+        self.pending.sort(key=lambda item: item[0])
+
+    def _next_lap(self, side, at):
+        # start -> stop after one lap, stop -> start again shortly after
+        if self.lap_running[side]:
+            self.lap_running[side] = False
+            self._schedule(at + self.rnd.randrange(1500, 4000) * NS_PER_MS, f"start_{side}")
+        else:
+            self.lap_running[side] = True
+            lap = self.rnd.randrange(*self.lap_ms)
+            self._schedule(at + lap * NS_PER_MS, f"stop_{side}")
+
+    # --- commands (app -> device) ---
+    def command(self, cmd):
+        cmd = cmd.strip().lower()
+        now = self.clock()
+        if now < self.ready_ns:
+            return                      # bootloader
+        if cmd == "ping":
+            self.event("pong", now, stamp=False)
+        elif cmd == "ts_on":
+            self.timestamps = True
+            self.next_sync = now
+        elif cmd == "ts_off":
+            self.timestamps = False
+        elif cmd == "mode_laps":
+            self.mode = "laps"
+            self.pending.clear()
+            self.lap_running = {"a": False, "b": False}
+            if self.auto:
+                for side in "ab":
+                    self._schedule(now + self.rnd.randrange(1000, 3000) * NS_PER_MS, f"start_{side}")
+        elif cmd == "mode_playoff":
+            self.mode = "playoff"
+            self.pending.clear()
+        elif cmd == "start" and self.auto and self.mode == "playoff":
+            self.pending.clear()
+            ok = now + OK_DELAY_MS * NS_PER_MS
+            self._schedule(ok, "ok")
+            finish = [ok + self.rnd.randrange(*self.lap_ms) * NS_PER_MS for _ in "ab"]
+            self._schedule(finish[0], "finish_a")
+            self._schedule(finish[1], "finish_b")
+            self._schedule(max(finish) + NS_PER_MS, "race_finished")
+
+    # --- serial.Serial interface ---
+    def write(self, data):
+        self.rx += bytes(data)
+        while b"\n" in self.rx:
+            line, self.rx = self.rx.split(b"\n", 1)
+            self.command(line.decode(errors="ignore"))
+        with self._cond:
+            self._cond.notify_all()     # new sync / scheduled events
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def _ready(self):
+        self._pump()
+        now = self.clock()
+        n = 0
+        while n < len(self.out) and self.out[n][0] <= now:
+            n += 1
+        return n
+
+    @property
+    def in_waiting(self):
+        return sum(len(item[1]) for item in self.out[:self._ready()])
+
+    def read(self, size=1):
+        if size <= 0:
+            return b""
+        ready = self._wait_ready()
+        data = b"".join(item[1] for item in self.out[:ready])
+        del self.out[:ready]
+        if len(data) > size:
+            # the rest stays first in the queue, already delivered
+            self.out.insert(0, [0, data[size:]])
+            data = data[:size]
+        return data
+
+    def _wait_ready(self):
+        # like a port with a read timeout: sleep until the next delivery
+        ready = self._ready()
+        if ready or self.timeout == 0:
+            return ready
+        deadline = None if self.timeout is None else self.clock() + int(self.timeout * 1e9)
+        with self._cond:
+            while not ready and self.is_open and not self._cancelled:
+                now = self.clock()
+                if deadline is not None and now >= deadline:
+                    break
+                times = [t for t in (self.next_delivery_ns(), deadline) if t is not None]
+                wait = max(0.0, (min(times) - now) / 1e9) if times else None
+                self._cond.wait(wait)
+                ready = self._ready()
+            self._cancelled = False
+        return ready
+
+    def cancel_read(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+    def next_delivery_ns(self):
+        """Host time of the next byte (or sync/pending event), None = idle."""
+        times = [item[0] for item in self.out[:1]]
+        if self.pending:
+            times.append(self.pending[0][0])
+        if self.timestamps:
+            times.append(self.next_sync)
+        return min(times) if times else None
+
+    def reset_input_buffer(self):
+        self.out.clear()
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+        self.cancel_read()
+
+
+def run_pty(sim):
+    """Serve the simulator on a pseudo terminal until Ctrl+C."""
+    import tty
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    print(f"gate simulator on {os.ttyname(slave)}  (Ctrl+C = konec)", flush=True)
+    try:
+        while True:
+            nxt = sim.next_delivery_ns()
+            wait = 0.05 if nxt is None else max(0.0, (nxt - sim.clock()) / 1e9)
+            r, _, _ = select.select([master], [], [], min(wait, 0.05))
+            if r:
+                sim.write(os.read(master, 1024))
+            data = sim.read(sim.in_waiting)
+            if data:
+                os.write(master, data)
+                sys.stdout.write(data.decode(errors="ignore"))
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simulátor brány (fw1.6 protokol)")
+    ap.add_argument("--drift-ppm", type=float, default=50.0, help="chyba krystalu brány")
+    ap.add_argument("--latency-ms", type=float, nargs=2, default=(1.0, 16.0),
+                    metavar=("MIN", "MAX"), help="zpoždění USB")
+    ap.add_argument("--lap-ms", type=int, nargs=2, default=(12000, 20000),
+                    metavar=("MIN", "MAX"), help="délka kola / jízdy")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+    sim = GateSimulator(drift_ppm=args.drift_ppm, latency_ms=tuple(args.latency_ms),
+                        lap_ms=tuple(args.lap_ms), seed=args.seed, auto=True)
+    run_pty(sim)
+
+
+if __name__ == "__main__":
+    main()
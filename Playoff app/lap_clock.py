@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# lap_clock.py
+# -*- coding: utf-8 -*-
+# Lap time = difference of two monotonic timestamps (start, stop) taken at
+# the gate events. The 50 ms GUI loop only reads elapsed_ms() for display,
+# so a slow tick or a wall clock change does not change the measured time.
+# test: python test_lap_clock.py
+__author__ = 'Martin Pihrt'
+
+import time
+
+NS_PER_MS = 1_000_000
+
+
+class LapClock:
+    """One lap timer (A or B).
+
+        clock.start()           # gate event (optional t_ns = event timestamp)
+        clock.elapsed_ms()      # running time for the display
+        ms = clock.stop()       # final lap time in ms (floor, no rounding up)
+    """
+
+    def __init__(self, clock=time.perf_counter_ns):
+        self.clock = clock
+        self.start_ns = None
+        self.stop_ns = None
+
+    @property
+    def running(self):
+        return self.start_ns is not None and self.stop_ns is None
+
+    def start(self, t_ns=None):
+        self.start_ns = self.clock() if t_ns is None else t_ns
+        self.stop_ns = None
+
+    def stop(self, t_ns=None):
+        """Stop the lap and return its time in ms (last time if not running)."""
+        if self.running:
+            stop_ns = self.clock() if t_ns is None else t_ns
+            self.stop_ns = max(stop_ns, self.start_ns)
+        return self.elapsed_ms()
+
+    def reset(self):
+        self.start_ns = None
+        self.stop_ns = None
+
+    def elapsed_ms(self, now_ns=None):
+        if self.start_ns is None:
+            return 0
+        end = self.stop_ns
+        if end is None:
+            end = self.clock() if now_ns is None else now_ns
+        return max(0, end - self.start_ns) // NS_PER_MS
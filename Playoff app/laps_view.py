@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# laps_view.py
+# -*- coding: utf-8 -*-
+# Rows of one laps table (A or B) on the canvas, virtualized: only the
+# visible window records[offset:offset + visible_rows] has canvas items, so
+# the cost of a redraw, scroll or new lap does not depend on how many laps
+# are stored. A new lap on top moves the rows down by one (single
+# canvas.move on the table tag); scrolling reuses the row items.
+# No Tk import, the canvas is passed in by playoff.py.
+# test: python test_laps_view.py
+__author__ = 'Martin Pihrt'
+
+from collections import deque
+
+MIN_VALID_MS = 10000        # shorter laps are invalid (red)
+
+INVALID_FILL = "#ffb3b3"    # red
+BEST_FILL = "#b8ffb8"       # grn
+STRIPE_FILL = "#f2f7ff"
+SEPARATOR_COLOR = "#d8d8d8"
+MARK_OUTLINE = "#0b6bd6"    # row found by jump_to_id()
+
+
+def best_lap(records):
+    """Best (lowest) valid lap time in ms, None if there is none."""
+    valid = [int(r.get("ms", 0)) for r in records if int(r.get("ms", 0)) >= MIN_VALID_MS]
+    return min(valid) if valid else None
+
+
+def row_text(rec):
+    return (
+        f"{rec['id']:>3}   "
+        f"{rec['date']}   "
+        f"{rec['time']}   "
+        f"({int(rec.get('ms', 0))}ms)"
+    )
+
+
+def row_fill(rec, best):
+    ms = int(rec.get("ms", 0))
+    if ms < MIN_VALID_MS:
+        return INVALID_FILL
+    if best is not None and ms == best:
+        return BEST_FILL
+    # stripes follow the lap id, so rows keep their colour when shifted
+    return STRIPE_FILL if int(rec["id"]) % 2 else ""
+
+
+def find_lap(records, lap_id):
+    """Index of lap `lap_id` in records (newest first, ids descending)."""
+    lo, hi = 0, len(records)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if int(records[mid]["id"]) > lap_id:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < len(records) and int(records[lo]["id"]) == lap_id:
+        return lo
+    # ids not descending (hand edited data) - plain search
+    for i, rec in enumerate(records):
+        if int(rec["id"]) == lap_id:
+            return i
+    return None
+
+
+class LapsTable:
+    """Visible window of one laps list (newest first).
+
+    place()      geometry of the table (after a full draw_laps rebuild)
+    rebuild()    recreate the rows of the window (new geometry)
+    insert()     records[0] is a new lap: shift, add one row, fix best lap
+    sync()       refresh the window if it differs from the records
+
+    The best lap is found by a full scan only in rebuild(), insert()
+    compares just the new lap, reset() (list cleared) forgets it; so a
+    new lap or a redraw costs the same for 10 or 10000 laps.
+    scroll()     move the window by n rows (+ = older laps)
+    jump_to_id() scroll to a lap id and mark its row
+    reset()      back to the newest laps
+    """
+
+    def __init__(self, canvas, tag):
+        self.canvas = canvas
+        self.tag = tag                  # canvas tag of all rows of this table
+        self.rows = deque()             # [rec, rect_id, text_id, line_id]
+        self.geometry = None
+        self.info_pos = None            # (x, y, font) of the "1-30 / 4000" text
+        self.info_id = None
+        self.offset = 0                 # index of the first visible record
+        self.mark = None                # record found by jump_to_id()
+        self.best = None
+        self.stats = {"inserted": 0, "rebuilt": 0, "recoloured": 0, "refilled": 0}
+
+    def place(self, x1, x2, first_row_y, row_height, visible_rows, font, info_pos=None):
+        self.geometry = (x1, x2, first_row_y, row_height, visible_rows, font)
+        self.info_pos = info_pos
+
+    def reset(self):
+        """Back to the newest laps (list cleared)."""
+        self.offset = 0
+        self.mark = None
+        self.best = None
+
+    def _window(self, records):
+        visible_rows = self.geometry[4]
+        self.offset = max(0, min(self.offset, len(records) - visible_rows))
+        return records[self.offset:self.offset + visible_rows]
+
+    def _outline(self, rec):
+        return MARK_OUTLINE if rec is self.mark else ""
+
+    def _create(self, pos, rec):
+        x1, x2, first_row_y, row_height, _, font = self.geometry
+        y = first_row_y + pos * row_height
+        row_top = y - row_height // 2
+        row_bottom = row_top + row_height
+        rect = self.canvas.create_rectangle(
+            x1 + 1, row_top, x2 - 1, row_bottom,
+            fill=row_fill(rec, self.best), outline=self._outline(rec), width=2,
+            tags=(self.tag,)
+        )
+        text = self.canvas.create_text(
+            x1 + 8, y, anchor="w", text=row_text(rec), font=font, fill="black",
+            tags=(self.tag,)
+        )
+        # separator line
+        line = self.canvas.create_line(
+            x1, row_bottom, x2, row_bottom, fill=SEPARATOR_COLOR, tags=(self.tag,)
+        )
+        return [rec, rect, text, line]
+
+    def _delete_row(self, row):
+        for item_id in row[1:]:
+            self.canvas.delete(item_id)
+
+    def _update_info(self, records):
+        if self.info_pos is None:
+            return
+        if len(records) <= self.geometry[4]:
+            text = ""
+        else:
+            first = self.offset + 1
+            last = self.offset + len(self.rows)
+            text = f"{first}–{last} / {len(records)}"
+        if self.info_id is None:
+            x, y, font = self.info_pos
+            self.info_id = self.canvas.create_text(
+                x, y, anchor="e", text=text, fill="white", font=font, tags=(self.tag,)
+            )
+        else:
+            self.canvas.itemconfigure(self.info_id, text=text)
+
+    def rebuild(self, records):
+        self.canvas.delete(self.tag)
+        self.rows.clear()
+        self.info_id = None
+        self.best = best_lap(records)
+        if self.geometry is None:
+            return
+        for pos, rec in enumerate(self._window(records)):
+            self.rows.append(self._create(pos, rec))
+        self._update_info(records)
+        self.stats["rebuilt"] += 1
+
+    def _refill(self, records):
+        """Show the current window reusing the existing row items."""
+        window = self._window(records)
+        for pos, rec in enumerate(window):
+            if pos < len(self.rows):
+                row = self.rows[pos]
+                if row[0] is not rec:
+                    row[0] = rec
+                    self.canvas.itemconfigure(row[1], fill=row_fill(rec, self.best),
+                                              outline=self._outline(rec))
+                    self.canvas.itemconfigure(row[2], text=row_text(rec))
+            else:
+                self.rows.append(self._create(pos, rec))
+        while len(self.rows) > len(window):
+            self._delete_row(self.rows.pop())
+        self._update_info(records)
+        self.stats["refilled"] += 1
+
+    def _recolour(self, ms):
+        for row in self.rows:
+            if int(row[0].get("ms", 0)) == ms:
+                self.canvas.itemconfigure(row[1], fill=row_fill(row[0], self.best))
+                self.stats["recoloured"] += 1
+
+    def insert(self, records):
+        rec = records[0]
+        ms = int(rec.get("ms", 0))
+        old_best = self.best
+        if ms >= MIN_VALID_MS and (old_best is None or ms < old_best):
+            self.best = ms
+
+        if self.offset > 0:
+            # scrolled to older laps: keep showing the same records
+            self.offset += 1
+        elif not self.shown(records, 1):
+            self.rebuild(records)       # rows out of date, no shifting
+            return
+        else:
+            row_height = self.geometry[3]
+            visible_rows = self.geometry[4]
+            self.canvas.move(self.tag, 0, row_height)
+            if self.info_id is not None:
+                self.canvas.move(self.info_id, 0, -row_height)
+            self.rows.appendleft(self._create(0, rec))
+            while len(self.rows) > visible_rows:
+                self._delete_row(self.rows.pop())
+
+        # previous best lap(s) lose the highlight
+        if self.best != old_best and old_best is not None:
+            self._recolour(old_best)
+        self._update_info(records)
+        self.stats["inserted"] += 1
+
+    def shown(self, records, start=0):
+        """True if the rows show exactly the current window of records[start:]."""
+        if self.geometry is None:
+            return False
+        first = start + self.offset
+        window = records[first:first + self.geometry[4]]
+        return (len(window) == len(self.rows)
+                and all(row[0] is rec for row, rec in zip(self.rows, window)))
+
+    def sync(self, records):
+        if not self.shown(records):
+            self._refill(records)
+
+    def scroll(self, records, rows):
+        if self.geometry is None:
+            return
+        old = self.offset
+        self.offset += rows
+        self._window(records)
+        if self.offset != old:
+            self._refill(records)
+
+    def jump_to_id(self, records, lap_id):
+        """Scroll so that lap `lap_id` is the first row; returns False if missing."""
+        index = find_lap(records, lap_id)
+        if index is None or self.geometry is None:
+            return False
+        old_mark = self.mark
+        self.mark = records[index]
+        self.offset = index
+        self._refill(records)
+        for row in self.rows:
+            if row[0] is old_mark or row[0] is self.mark:
+                self.canvas.itemconfigure(row[1], outline=self._outline(row[0]))
+        return True
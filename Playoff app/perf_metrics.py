@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# perf_metrics.py
+# -*- coding: utf-8 -*-
+# Render/USB timings for the debug overlay (F12) and an optional JSON lines
+# log (one object per measurement) for later analysis. No Tk import, the
+# values may be recorded from the serial reader thread as well.
+# test: python test_perf_metrics.py
+__author__ = 'Martin Pihrt'
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+WINDOW = 120            # last N samples per metric for avg/max
+
+
+class PerfMetrics:
+    """Named timings in ms (last / avg / max over the last WINDOW samples).
+
+        with perf.timed("redraw", view="laps"):
+            ...
+        perf.record("tk_lag", 3.2)
+        perf.record_since("export_pdf", t0_ns)
+        perf.gauge("canvas_items", 1234)     # latest value only (counts)
+
+    `extra` values go only to the JSON lines log.
+    """
+
+    def __init__(self, window=WINDOW, clock=time.perf_counter_ns):
+        self.window = window
+        self.clock = clock
+        self.samples = {}           # name -> deque of ms
+        self.counts = {}            # name -> total number of samples
+        self.gauges = {}            # name -> latest value
+        self.log_path = None
+        self._log_file = None
+        self._lock = threading.Lock()
+
+    # --- recording ---
+    def record(self, name, ms, **extra):
+        with self._lock:
+            q = self.samples.get(name)
+            if q is None:
+                q = self.samples[name] = deque(maxlen=self.window)
+            q.append(ms)
+            self.counts[name] = self.counts.get(name, 0) + 1
+            if self._log_file is not None:
+                self._write(name, {"ms": round(ms, 3)}, extra)
+
+    def gauge(self, name, value, **extra):
+        with self._lock:
+            self.gauges[name] = value
+            if self._log_file is not None:
+                self._write(name, {"value": value}, extra)
+
+    def _write(self, name, values, extra):
+        row = {"t": round(time.time(), 3), "name": name}
+        row.update(values)
+        row.update(extra)
+        try:
+            self._log_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        except (OSError, ValueError):
+            self._log_file = None
+
+    def record_since(self, name, start_ns, **extra):
+        ms = (self.clock() - start_ns) / 1e6
+        self.record(name, ms, **extra)
+        return ms
+
+    @contextmanager
+    def timed(self, name, **extra):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record_since(name, start, **extra)
+
+    # --- JSON lines log ---
+    @property
+    def logging(self):
+        return self._log_file is not None
+
+    def start_log(self, path):
+        """Append measurements to `path` (one JSON object per line)."""
+        self.stop_log()
+        f = open(path, "a", encoding="utf-8", buffering=1)     # line buffered
+        with self._lock:
+            self._log_file = f
+            self.log_path = path
+
+    def stop_log(self):
+        with self._lock:
+            f, self._log_file = self._log_file, None
+        if f is not None:
+            f.close()
+
+    # --- reading ---
+    def summary(self, name):
+        """(last, avg, max, count) in ms, None if nothing was recorded."""
+        with self._lock:
+            q = self.samples.get(name)
+            if not q:
+                return None
+            values = list(q)
+            count = self.counts[name]
+        return values[-1], sum(values) / len(values), max(values), count
+
+    def lines(self):
+        """Overlay text, one metric per line."""
+        with self._lock:
+            names = sorted(self.samples)
+            gauges = sorted(self.gauges.items())
+        out = []
+        for name in names:
+            s = self.summary(name)
+            if s is None:
+                continue
+            last, avg, peak, count = s
+            out.append(f"{name:<12} {last:7.2f} {avg:7.2f} {peak:7.2f} ms  n={count}")
+        for name, value in gauges:
+            out.append(f"{name:<12} {value}")
+        return out
@@ -11,7 +11,7 @@ import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox, filedialog, colorchooser
 from tkinter import font as tkfont
 
-import math, json, os, sys
+import json, os, sys
 import urllib.request
 import time
 
@@ -60,6 +60,19 @@ except Exception as e:
     usb_module = None
     USB_AVAILABLE = False
 
+# bracket data model (no GUI dependencies)
+from bracket_core import Bracket, MAX_TEAMS, bracket_to_setup, bracket_from_setup
+from canvas_pool import CanvasPool
+from background import BackgroundScaler, load_background
+from text_measure import TextMeasure, RoundWidths
+from bracket_layout import compute_layout, font_sizes, LayoutCache, MARGIN_Y
+from laps_view import LapsTable
+from perf_metrics import PerfMetrics
+from lap_clock import LapClock
+from ticker import Ticker
+from countdown import Countdown, format_remaining
+from serial_loop import TkBridge
+
 # default settings
 DEFAULT_BOX_W = 180
 DEFAULT_BOX_H = 30
@@ -75,6 +88,15 @@ CANVAS_BG_DEFAULT = "#ffffff"
 WINNER_FILL = "#ffe06a"
 WINNER_OUTLINE = "#cc9a00"
 WINNER_TEXT_COLOR = "#000000"
+# search highlight
+SEARCH_FILL = "#9ad0ff"
+
+REDRAW_FRAME_MS = 16                # max one render per frame (~60 fps)
+LAPS_WHEEL_ROWS = 3                 # rows per mouse wheel step in the laps view
+PERF_OVERLAY_MS = 500               # refresh of the debug overlay (F12)
+LAP_DISPLAY_MS = 50                 # lap timer labels A/B
+USB_CHECK_MS = 1500                 # USB / LED panel status dots
+DISPLAY_ID_MS = 4500                # "ID-1" / "ID-2" on the LED panels after connect
 
 # Default USB settings defaults (kept in setup file)
 DEFAULT_USB_PORT           = ""
@@ -84,81 +106,6 @@ DEFAULT_USB_TIMEOUT        = 10.0
 DEFAULT_USB_DISPLAY_A_BAUD = 115200
 DEFAULT_USB_DISPLAY_B_BAUD = 115200
 
-# --- Data classes ---
-class Slot:
-    def __init__(self, text=""):
-        self.text = text
-
-class Match:
-    def __init__(self, a=None, b=None):
-        self.a = a if a else Slot()
-        self.b = b if b else Slot()
-
-class Bracket:
-    def __init__(self, team_list, pre_round_list, use_pre_round=False):
-        """team_list: list of initial team names (may be empty strings)"""
-        self.use_pre_round = use_pre_round
-        self.team_count = max(0, int(len(team_list)))
-        self.pre_count = max(0, int(len(pre_round_list)))
-        self.rounds = []  # list of lists of Match
-        self.titles = []
-        self.pre_rounds = []
-        self.pre_titles = []
-        if use_pre_round:
-            self._build_pre(pre_round_list)
-        self._build(team_list)
-
-    def _build_pre(self, pre_round_list):
-        self.pre_rounds = []
-        self.pre_titles = ["Předkolo"]
-        first_round_match_count = math.ceil(len(pre_round_list) / 2)
-        matches = []
-        for i in range(first_round_match_count):
-            matches.append(Match(Slot(""), Slot("")))
-        self.pre_rounds.append(matches)
-
-    def _build(self, team_list):
-        self.rounds = []
-        self.titles = []
-        # initial round: pair teams sequentially, allowing last single
-        teams = list(team_list)
-        teams = [str(t) if t is not None else "" for t in teams]
-
-        # first round matches: ceil(n/2)
-        first_matches = math.ceil(len(teams) / 2) if len(teams) > 0 else 1
-        matches0 = []
-        for i in range(first_matches):
-            a_idx = 2 * i
-            b_idx = 2 * i + 1
-            a = Slot(teams[a_idx]) if a_idx < len(teams) else Slot("")
-            b = Slot(teams[b_idx]) if b_idx < len(teams) else Slot("")
-            matches0.append(Match(a, b))
-        self.rounds.append(matches0)
-        self.titles.append("Kolo 1")
-
-        # build subsequent rounds until 1 match
-        prev_matches = matches0
-        r = 1
-        while len(prev_matches) > 1:
-            next_count = math.ceil(len(prev_matches) / 2)
-            next_matches = [Match() for _ in range(next_count)]
-            self.rounds.append(next_matches)
-            # default title
-            if next_count == 1:
-                self.titles.append("Finále")
-            else:
-                self.titles.append(f"Kolo {r+1}")
-            prev_matches = next_matches
-            r += 1
-        # --- Winner ---
-        # last real round = final → add a round with one slot
-        winner_match = Match(Slot(""), Slot(""))
-        self.rounds.append([winner_match])
-        self.titles.append("Vítěz")            
-
-    def rounds_count(self):
-        return len(self.rounds)
-
 # --- App ---
 class PlayoffApp:
     def __init__(self, root):
@@ -171,6 +118,13 @@ class PlayoffApp:
         self.bg_path = None
         self.bg_image = None
         self.bg_tk = None
+        self.bg_tk_size = None          # canvas size of bg_tk
+        self.bg_tk_preview = False      # bg_tk is the NEAREST preview, LANCZOS pending
+        self.bg_scaler = BackgroundScaler()
+        # cached fonts / text widths for layout (redraw, PDF export)
+        self.text_measure = TextMeasure(lambda family, size: tkfont.Font(family=family, size=size))
+        self.round_widths = RoundWidths()
+        self.layout_cache = LayoutCache()   # shared by redraw and export_pdf
         self.canvas_bg = CANVAS_BG_DEFAULT
         self.line_width = 2           # normal/thick
         self.font_scale = "large"     # small/medium/large
@@ -182,30 +136,40 @@ class PlayoffApp:
         self.timer_running = False
         self.timer_blink = False
         self.current_seconds = 0
+        # remaining time = monotonic deadline - now (countdown.py)
+        self.countdown = Countdown()
+        self.timer_digits = 0           # decimal places shown: 0, 1 (0.1 s), 2 (0.01 s)
         self.timer_start_mode = "ok"  # "start" | "ok"  
         self.team_names = []          # Team naming database
+        self._team_lookup = None      # cached {id: desc} from team_names
+        self.search_team = ""         # highlighted team (Najít tým)
         self.pre_round_enabled = True
         self.third_place_enabled = True
         self.third_place_title = "3. místo"
         self.lap_timer_enabled = True
         self.lap_timer_var = tk.BooleanVar(value=self.lap_timer_enabled)
-        self.lap_time_a = 0   # ms
+        self.lap_time_a = 0   # ms (shown / last finished lap)
         self.lap_time_b = 0   # ms
+        # measured time = stop - start timestamps; lap_loop only refreshes the display
+        self.lap_clock_a = LapClock()
+        self.lap_clock_b = LapClock()
         self.lap_time_a_var = tk.StringVar(value="A 00:00:000")
         self.lap_time_b_var = tk.StringVar(value="B 00:00:000")
         self.lap_running_a = False
         self.lap_running_b = False
-        self.lap_after_id = None        
         self.font_scale_var = tk.StringVar(value=self.font_scale)
         self.odd_behavior_var = tk.StringVar(value=self.odd_behavior)
         self.line_width_var = tk.IntVar(value=self.line_width)
         self.timer_menu_var = tk.BooleanVar(value=self.enable_timer)
         self.timer_start_mode_var = tk.StringVar(value=self.timer_start_mode)
+        self.timer_digits_var = tk.IntVar(value=self.timer_digits)
         self.pre_round_var = tk.BooleanVar(value=self.pre_round_enabled)
         self.third_place_var = tk.BooleanVar(value=self.third_place_enabled)
 
         self.third_place = {"a": "", "b": "", "winner": ""}        
 
+        # serial loop thread -> Tk thread (USB lines, send results)
+        self.usb_bridge = TkBridge(self.root)
         # USB manager (from usb_module)
         if USB_AVAILABLE:
             try:
@@ -414,6 +378,7 @@ class PlayoffApp:
         self.settings_menu.add_command(label='Počet týmů', command=self.ask_team_count)
         self.settings_menu.add_command(label='Generovat týmy', command=self.generate_from_entry)
         self.settings_menu.add_command(label='Pojmenování týmů', command=self.open_team_naming_dialog)
+        self.settings_menu.add_command(label='Najít tým', command=self.find_team_dialog)
         self.settings_menu.add_command(label='Smazat jen obsah', command=self.reset_values)
         self.settings_menu.add_command(label='Vymazat všechno', command=self.clear_all)
         self.settings_menu.add_checkbutton(label='Používat předkolo', variable=self.pre_round_var, command=self.toggle_pre_round)
@@ -518,6 +483,18 @@ class PlayoffApp:
             command=lambda: self.set_timer_start_mode('ok')
         )
 
+        # countdown display precision
+        timer_digits_menu = tk.Menu(self.settings_menu, tearoff=0)
+        self.settings_menu.add_cascade(label='Zobrazení odpočtu', menu=timer_digits_menu)
+        for digits, label in ((0, 'MM:SS'), (1, 'MM:SS.d (desetiny)'), (2, 'MM:SS.cc (setiny)')):
+            timer_digits_menu.add_radiobutton(
+                label=label,
+                variable=self.timer_digits_var,
+                value=digits,
+                command=lambda d=digits: self.set_timer_digits(d)
+            )
+        self.settings_menu.add_command(label='Pozastavit / pokračovat odpočet', command=self.toggle_countdown_pause)
+
         self.settings_menu.add_checkbutton(
             label='Měřit a zobrazit čas kola',
             variable=self.lap_timer_var,
@@ -526,6 +503,13 @@ class PlayoffApp:
 
         self.settings_menu.add_separator()
         self.settings_menu.add_command(label='USB nastavení', command=self.open_usb_dialog)
+        # gate fw1.6+: events carry the gate's micros(), laps without USB latency
+        self.gate_timestamps_var = tk.BooleanVar(value=False)
+        self.settings_menu.add_checkbutton(
+            label='Časové značky z brány (fw1.6)',
+            variable=self.gate_timestamps_var,
+            command=self.on_toggle_gate_timestamps
+        )
 
         self.settings_menu.add_separator()
         self.settings_menu.add_command(label='Export do PDF', command=self.export_pdf)
@@ -538,6 +522,16 @@ class PlayoffApp:
             command=self.toggle_projector
         )
 
+        # debug: render/USB timings
+        perf_menu = tk.Menu(self.settings_menu, tearoff=0)
+        self.settings_menu.add_cascade(label='Ladění výkonu', menu=perf_menu)
+        self.perf_overlay_var = tk.BooleanVar(value=False)
+        perf_menu.add_checkbutton(label='Zobrazit měření (F12)', variable=self.perf_overlay_var,
+                                  command=lambda: self.toggle_perf_overlay(self.perf_overlay_var.get()))
+        self.perf_log_var = tk.BooleanVar(value=False)
+        perf_menu.add_checkbutton(label='Zapisovat měření do souboru', variable=self.perf_log_var,
+                                  command=self.toggle_perf_log)
+
         self.settings_menu.add_command(label='Nápověda', command=self.show_help)
         
         self.settings_menu.add_command(label='Kontrola aktualizace', command=self.check_for_update)
@@ -609,6 +603,29 @@ class PlayoffApp:
         self.canvas = tk.Canvas(root, bg=self.canvas_bg)
         self.canvas.pack(fill="both", expand=True)
         self.canvas.bind('<Configure>', lambda e: self.redraw())
+        # one click handler for all slots (layout hit index, no per-item binds)
+        self.canvas.bind('<Button-1>', lambda e: self.on_canvas_click(e, 1))
+        self.canvas.bind('<Button-3>', lambda e: self.on_canvas_click(e, 3))
+        # laps tables scroll with the mouse wheel (Windows/mac: MouseWheel, X11: Button-4/5)
+        self.canvas.bind('<MouseWheel>', lambda e: self.on_laps_wheel(e, -1 if e.delta > 0 else 1))
+        self.canvas.bind('<Button-4>', lambda e: self.on_laps_wheel(e, -1))
+        self.canvas.bind('<Button-5>', lambda e: self.on_laps_wheel(e, 1))
+        self.drawn_layout = None
+        # laps view: static part redrawn only when _laps_key changes
+        self._laps_key = None
+        self.laps_table_a = LapsTable(self.canvas, "laps_rows_a")
+        self.laps_table_b = LapsTable(self.canvas, "laps_rows_b")
+        self.pool = CanvasPool(self.canvas)   # items kept between redraws
+        self._canvas_config = None
+        # redraw() only schedules; requests within one frame are merged
+        self._redraw_after_id = None
+        self._last_render = 0.0
+        self.redraw_stats = {"requested": 0, "executed": 0}
+        # timings for the debug overlay / JSON lines log (perf_metrics)
+        self.perf = PerfMetrics()
+        self.perf_overlay = False
+        if self.usb:
+            self.usb.tx.perf = self.perf        # tx_queue depth, tx_* latency
 
         # Timer overlay (canvas create_window)
         self.timer_label = tk.Label( # timer MM:SS box size
@@ -636,14 +653,22 @@ class PlayoffApp:
         except Exception:
             n = 16
 
-        self.update_datetime()
+        # one after() loop for all clocks and periodic checks (ticker.py)
+        self.ticker = Ticker(self.root)
+        self.ticker.add("datetime", 1000, self.update_datetime, start=True)
+        self.ticker.add("countdown", 1000, self.countdown_tick)
+        self.ticker.add("laps", LAP_DISPLAY_MS, self.lap_display_tick)
+        self.ticker.add("blink", 500, self._blink_step)
+        self.ticker.add("perf", PERF_OVERLAY_MS, self._perf_tick)
+        # automatic USB check every 1.5 s
+        self.ticker.add("usb", USB_CHECK_MS, self.auto_check_usb)
+        self.ticker.start("usb", USB_CHECK_MS)
+
         self.on_toggle_lap_timer()
         self.check_for_update()
-        
-        # automatic USB check every 1.5 s
-        self.root.after(1500, self.auto_check_usb)
 
         root.bind('<Escape>', lambda e: self.exit_fullscreen())
+        root.bind('<F12>', lambda e: self.toggle_perf_overlay())
 
         # try load usb settings from previous setup file if available
         try:
@@ -667,6 +692,12 @@ class PlayoffApp:
                 self.view_mode = s.get('view_mode', 'playoff')
                 self.view_mode_var.set(self.view_mode)
 
+                self.gate_timestamps_var.set(s.get('gate_timestamps', False))
+                self.timer_digits = s.get('timer_digits', self.timer_digits)
+                self.timer_digits_var.set(self.timer_digits)
+                if self.usb:
+                    self.usb.device_timestamps = self.gate_timestamps_var.get()
+
                 self.root.after(100, self.update_view_mode_gui)
 
                 try:
@@ -701,26 +732,11 @@ class PlayoffApp:
                         self.usb.connect_displays()
                         self.update_usb_status(True)
                         self._log(f"USB AUTO CONNECT: port { self.usb_port} speed {self.usb_baud}")
-                        self.root.after(
-                            2500,
-                            lambda: self.usb.send_display(1, "TXT:ID-1")
-                        )
-                        self.root.after(
-                            2600,
-                            lambda: self.usb.send_display(2, "TXT:ID-2")
-                        )                
-                        self.root.after(
-                            7000,
-                            lambda: self.usb.send_display(1, "TXT:-------")
-                        )
-                        self.root.after(
-                            7200,
-                            lambda: self.usb.send_display(2, "TXT:-------")
-                        )                        
+                        self.show_display_ids()
                         if self.view_mode == "laps":
-                            self.usb.handler.send(b"mode_laps\n")
+                            self.usb.send_command(b"mode_laps\n")
                         else:
-                            self.usb.handler.send(b"mode_playoff\n")
+                            self.usb.send_command(b"mode_playoff\n")
 
                     except Exception as e:
                         self._log("USB AUTO CONNECT ERROR:", e)
@@ -736,45 +752,21 @@ class PlayoffApp:
         print(f"[playoff {self._now()}] {msg} {param}", file=sys.stderr)
 
     def on_close(self):
+        self.perf.stop_log()
         if self.usb:
-            self.usb.disconnect_displays()
             self.usb.disconnect()
+        self.usb_bridge.close()
         self.root.destroy()
 
-    def update_third_place_from_semifinal(self):
+    def update_third_place_from_semifinal(self, changed=None):
+        """changed: slot indices from Bracket.set_text; None = always recompute"""
         if not self.bracket or not self.third_place_enabled:
             return
 
-        rounds = self.bracket.rounds
-
-        if len(rounds) < 3:
+        if changed is not None and not self.bracket.touches_third_place(changed):
             return
 
-        semifinal_round = len(rounds) - 3
-        final_round = len(rounds) - 2
-
-        semifinal_matches = rounds[semifinal_round]
-        final_match = rounds[final_round][0]
-
-        losers = []
-
-        for m_idx, match in enumerate(semifinal_matches):
-            a = match.a.text.strip()
-            b = match.b.text.strip()
-
-            finalist_a = final_match.a.text.strip()
-            finalist_b = final_match.b.text.strip()
-
-            if a == finalist_a or a == finalist_b:
-                loser = b
-            elif b == finalist_a or b == finalist_b:
-                loser = a
-            else:
-                loser = ""
-
-            if loser:
-                losers.append(loser)
-
+        losers = self.bracket.semifinal_losers()
         if len(losers) >= 2:
             self.third_place["a"] = losers[0]
             self.third_place["b"] = losers[1]
@@ -913,8 +905,8 @@ class PlayoffApp:
                 messagebox.showerror("Chyba", "Počet týmů musí být kladné číslo.")
                 return
 
-            if not val.isdigit() or int(val) > 24:
-                messagebox.showerror("Chyba", "Počet týmů musí být <= 24.")
+            if not val.isdigit() or int(val) > MAX_TEAMS:
+                messagebox.showerror("Chyba", f"Počet týmů musí být <= {MAX_TEAMS}.")
                 return                
 
             self.team_var.set(val)
@@ -926,49 +918,49 @@ class PlayoffApp:
         dlg.bind("<Return>", lambda e: on_ok())
         dlg.bind("<Escape>", lambda e: dlg.destroy())
     
-    def update_datetime(self):
+    def update_datetime(self, tick_now=None):
         import datetime
         now = datetime.datetime.now()
-        self.datetime_var.set(now.strftime("%d.%m.%Y  %H:%M:%S"))
-        self.root.after(1000, self.update_datetime)
+        self.ticker.set_text("datetime", now.strftime("%d.%m.%Y  %H:%M:%S"), self.datetime_var.set)
+        # next run just after the next full second
+        return 1000 - now.microsecond // 1000 + 2
 
-    def start_lap_timer(self):
+    def start_lap_timer(self, t_ns=None):
         self.lap_running_a = True
         self.lap_running_b = True
 
-        if self.lap_after_id:
-            try:
-                self.root.after_cancel(self.lap_after_id)
-            except:
-                pass
+        # A and B start at the same instant (USB "ok" arrival if known)
+        now = time.perf_counter_ns() if t_ns is None else t_ns
+        self.lap_clock_a.start(now)
+        self.lap_clock_b.start(now)
 
-        import time
-        self.lap_last_time = time.time()
-
-        self.lap_loop()
-
-    def lap_loop(self):
-        import time
+        self.ticker.start("laps")
 
+    def lap_display_tick(self, now=None):
+        # display refresh only, the time comes from lap_clock_a/b;
+        # the last run after both stopped shows the final times
+        self.update_lap_display()
         if not self.lap_running_a and not self.lap_running_b:
-            return
-
-        now = time.time()
-        delta = now - self.lap_last_time
-        self.lap_last_time = now
-
-        delta_ms = int(delta * 1000)
+            self.ticker.stop("laps")
 
+    def update_lap_display(self):
+        now = time.perf_counter_ns()
         if self.lap_running_a:
-            self.lap_time_a += delta_ms
-
+            self.lap_time_a = self.lap_clock_a.elapsed_ms(now)
         if self.lap_running_b:
-            self.lap_time_b += delta_ms
+            self.lap_time_b = self.lap_clock_b.elapsed_ms(now)
 
-        self.lap_time_a_var.set("A " + self.format_lap(self.lap_time_a))
-        self.lap_time_b_var.set("B " + self.format_lap(self.lap_time_b))
+        self.ticker.set_text("lap_a", "A " + self.format_lap(self.lap_time_a), self.lap_time_a_var.set)
+        self.ticker.set_text("lap_b", "B " + self.format_lap(self.lap_time_b), self.lap_time_b_var.set)
 
-        self.lap_after_id = self.root.after(50, self.lap_loop)
+    def stop_lap_clocks(self, t_ns=None):
+        """Stop both laps (race finished, countdown over, new START)."""
+        if self.lap_running_a:
+            self.lap_time_a = self.lap_clock_a.stop(t_ns)
+        if self.lap_running_b:
+            self.lap_time_b = self.lap_clock_b.stop(t_ns)
+        self.lap_running_a = False
+        self.lap_running_b = False
 
     def format_lap(self, ms):
         minutes = ms // 60000
@@ -977,51 +969,25 @@ class PlayoffApp:
         return f"{minutes:02d}:{seconds:02d}:{millis:03d}"
 
     def start_laps_timer(self):
-        import time
-        if self.lap_after_id:
-            try:
-                self.root.after_cancel(self.lap_after_id)
-            except:
-                pass
-        self.lap_last_time = time.time()
-        self.lap_after_id = self.root.after(50, self.laps_loop)        
-
-    def laps_loop(self):
-        import time
-        if not self.lap_running_a and not self.lap_running_b:
-            self.lap_after_id = None
-            return
-
-        now = time.time()
-        delta = now - self.lap_last_time
-        self.lap_last_time = now
-        delta_ms = int(delta * 1000)
-        if self.lap_running_a:
-            self.lap_time_a += delta_ms
-        if self.lap_running_b:
-            self.lap_time_b += delta_ms
-        self.lap_time_a_var.set(
-            "A " + self.format_lap(self.lap_time_a)
-        )
-        self.lap_time_b_var.set(
-            "B " + self.format_lap(self.lap_time_b)
-        )
-        self.lap_after_id = self.root.after(50, self.laps_loop)
+        # laps mode: start_a/start_b started the clocks, ticker refreshes labels
+        self.ticker.start("laps", LAP_DISPLAY_MS)
 
-    def finish_a(self):
+    def finish_a(self, t_ns=None):
         if not self.lap_running_a:
             return
 
         self._log("FINISH A")
+        self.lap_time_a = self.lap_clock_a.stop(t_ns)
         self.lap_running_a = False
         self.lap_label_a.config(fg="green")
 
 
-    def finish_b(self):
+    def finish_b(self, t_ns=None):
         if not self.lap_running_b:
             return
 
         self._log("FINISH B")
+        self.lap_time_b = self.lap_clock_b.stop(t_ns)
         self.lap_running_b = False
         self.lap_label_b.config(fg="green")
 
@@ -1073,9 +1039,9 @@ class PlayoffApp:
         try:
             if self.usb:
                 if self.view_mode == "laps":
-                    self.usb.handler.send(b"mode_laps\n")
+                    self.usb.send_command(b"mode_laps\n")
                 else:
-                    self.usb.handler.send(b"mode_playoff\n")
+                    self.usb.send_command(b"mode_playoff\n")
         except Exception as e:
             self._log(f"MODE SEND ERROR: {e}")        
 
@@ -1094,7 +1060,9 @@ class PlayoffApp:
         self.lap_time_b = 0
         self.lap_running_a = False
         self.lap_running_b = False
-        self.lap_after_id = None
+        self.lap_clock_a.reset()
+        self.lap_clock_b.reset()
+        self.ticker.stop("laps")
         self.view_mode = new_mode
         self.view_mode_var.set(new_mode)
         self.update_view_mode_buttons()
@@ -1109,10 +1077,10 @@ class PlayoffApp:
             if self.usb:
                 if self.view_mode == "laps":
                     self._log("TX mode_laps")
-                    self.usb.handler.send(b"mode_laps\n")
+                    self.usb.send_command(b"mode_laps\n")
                 else:
                     self._log("TX mode_playoff")
-                    self.usb.handler.send(b"mode_playoff\n")
+                    self.usb.send_command(b"mode_playoff\n")
         except Exception as e:
             self._log(f"MODE SEND ERROR: {e}")        
 
@@ -1157,9 +1125,10 @@ class PlayoffApp:
         except:
             pass            
 
-    def auto_check_displays(self):
+    def auto_check_displays(self, ports=None):
         try:
-            ports = self.usb.list_ports() if self.usb else []
+            if ports is None:
+                ports = self.usb.list_ports() if self.usb else []
             id1 = (
                 self.display_port_a
                 and self.display_port_a in ports
@@ -1182,8 +1151,9 @@ class PlayoffApp:
         self.update_display_status(1, id1)
         self.update_display_status(2, id2)
 
-    def auto_check_usb(self):
-        """Automatic USB port check."""
+    def auto_check_usb(self, now=None):
+        """Automatic USB port check (ticker, every USB_CHECK_MS)."""
+        ports = []
         try:
             if self.usb:
                 ports = self.usb.list_ports()
@@ -1197,11 +1167,14 @@ class PlayoffApp:
         except Exception:
             self.update_usb_status(False)
 
-        # refresh for 1500 ms
-        self.root.after(1500, self.auto_check_usb)
-        self.root.after(1500, self.auto_check_displays)
+        # LED panels with the same port list
+        self.auto_check_displays(ports)
 
-    def on_usb_line(self, line):
+    def on_usb_line(self, line, rx_ns=None):
+        # rx_ns = arrival time from the reader thread; lap start/stop use it
+        # instead of the (later) moment gui() runs in the Tk loop
+        if rx_ns is None:
+            rx_ns = time.perf_counter_ns()
         line = line.strip().lower()
         self._log(f"USB RX: {repr(line)}")
 
@@ -1215,17 +1188,16 @@ class PlayoffApp:
                     self.start_countdown()
                     self.lap_time_a = 0
                     self.lap_time_b = 0
-                    self.lap_time_a_var.set("A 00:00:000")
-                    self.lap_time_b_var.set("B 00:00:000")
+                    self.update_lap_display()
                     if self.lap_timer_enabled:
-                        self.start_lap_timer()
+                        self.start_lap_timer(rx_ns)
 
             elif line == "finish_a":
-                self.finish_a()
+                self.finish_a(rx_ns)
                 self.usb.send_display(1, f"TXT:{self.format_display_time(self.lap_time_a)}")
 
             elif line == "finish_b":
-                self.finish_b()
+                self.finish_b(rx_ns)
                 self.usb.send_display(2, f"TXT:{self.format_display_time(self.lap_time_b)}")
 
             elif line == "race_finished":
@@ -1235,14 +1207,9 @@ class PlayoffApp:
                 else:
                     self.status_var.set("")
                 self.timer_running = False
-                self.lap_running_a = False
-                self.lap_running_b = False
-                if self.lap_after_id:
-                    try:
-                        self.root.after_cancel(self.lap_after_id)
-                    except:
-                        pass
-                    self.lap_after_id = None
+                self.countdown.stop()
+                self.ticker.stop("countdown")
+                self.stop_lap_clocks(rx_ns)
 
             elif line == "start_a":
                 self._log("LAPS START A")
@@ -1250,8 +1217,8 @@ class PlayoffApp:
                     self.usb.send_display(1, "TXT:00.000")
                     self.lap_label_a.config(fg="#FF8C00")
                     self.lap_time_a = 0
+                    self.lap_clock_a.start(rx_ns)
                     self.lap_running_a = True
-                    self._log(f"lap_after_id={self.lap_after_id}")
                     self.start_laps_timer()
 
             elif line == "start_b":
@@ -1260,12 +1227,13 @@ class PlayoffApp:
                     self.usb.send_display(2, "TXT:00.000")
                     self.lap_label_b.config(fg="#FF8C00")
                     self.lap_time_b = 0
+                    self.lap_clock_b.start(rx_ns)
                     self.lap_running_b = True
-                    self._log(f"lap_after_id={self.lap_after_id}")
                     self.start_laps_timer()
 
             elif line == "stop_a":
                 self._log("LAPS STOP A")
+                self.lap_time_a = self.lap_clock_a.stop(rx_ns)
                 self.lap_running_a = False
                 if self.view_mode == "laps":
                     self.lap_label_a.config(fg="green")
@@ -1278,11 +1246,12 @@ class PlayoffApp:
                     }
                     self.laps_a.insert(0, rec)
                     self.lap_id_a += 1
-                    self.redraw()
+                    self.show_new_lap(self.laps_table_a, self.laps_a)
                     self.usb.send_display(1, f"TXT:{self.format_display_time(self.lap_time_a)}")
 
             elif line == "stop_b":
                 self._log("LAPS STOP B")
+                self.lap_time_b = self.lap_clock_b.stop(rx_ns)
                 self.lap_running_b = False
                 if self.view_mode == "laps":
                     self.lap_label_b.config(fg="green")
@@ -1295,10 +1264,40 @@ class PlayoffApp:
                     }
                     self.laps_b.insert(0, rec)
                     self.lap_id_b += 1
-                    self.redraw() 
+                    self.show_new_lap(self.laps_table_b, self.laps_b)
                     self.usb.send_display(2, f"TXT:{self.format_display_time(self.lap_time_b)}")               
 
-        self.root.after(0, gui)        
+        self.usb_bridge.post(self._run_usb_gui, gui, line, time.perf_counter_ns())
+
+    def show_display_ids(self):
+        # ID-1 / ID-2 as soon as the panel answered (queued after its
+        # connect on the serial loop), dashes DISPLAY_ID_MS later - only
+        # when the ID was written and nothing else was sent to the panel
+        for id in (1, 2):
+            fut = self.usb.send_display(id, f"TXT:ID-{id}")
+            if fut is None:
+                continue
+            sent = self.usb.display_sent[id]
+            fut.add_done_callback(
+                lambda f, id=id, sent=sent: self._display_id_written(f, id, sent)
+            )
+
+    def _display_id_written(self, fut, id, sent):
+        # serial loop thread
+        if fut.cancelled() or fut.exception() is not None or fut.result() is not True:
+            return                  # not connected, queue full or replaced
+
+        def dashes():
+            if self.usb.display_sent[id] == sent:
+                self.usb.send_display(id, "TXT:-------")
+
+        self.usb_bridge.post(self.root.after, DISPLAY_ID_MS, dashes)
+
+    def _run_usb_gui(self, gui, line, scheduled_ns):
+        # Tk queue lag = posted on the serial loop -> running on Tk
+        self.perf.record_since("tk_lag", scheduled_ns, line=line)
+        with self.perf.timed("usb_gui", line=line):
+            gui()
 
     def on_start(self):
         self.lap_label_a.config(fg="#FF8C00")
@@ -1306,24 +1305,13 @@ class PlayoffApp:
         self._log(f"usb_port= {self.usb_port} usb_baud= {self.usb_baud} usb_timeout= {self.usb_timeout} usb obj existuje: {bool(self.usb)} timer_start_mode= {self.timer_start_mode}")
 
         # STOP old countdown
-        try:
-            self.timer_running = False
-            if getattr(self, 'countdown_after_id', None):
-                self.root.after_cancel(self.countdown_after_id)
-                self.countdown_after_id = None
-        except Exception:
-            pass
-
-        # STOP old lap timer
-        try:
-            self.lap_running_a = False
-            self.lap_running_b = False
-            if self.lap_after_id:
-                self.root.after_cancel(self.lap_after_id)
-                self.lap_after_id = None
+        self.timer_running = False
+        self.countdown.stop()
+        self.ticker.stop("countdown")
+        self.timer_label.config(fg='white')
 
-        except Exception:
-            pass
+        # STOP old lap timer (last display refresh shows the final times)
+        self.stop_lap_clocks()
 
         self.start_btn.config(state='disabled')
 
@@ -1358,7 +1346,7 @@ class PlayoffApp:
                 self.start_btn.config(state='normal')
 
             try:
-                self.root.after(0, cb)
+                self.usb_bridge.post(cb)
 
             except Exception:
                 pass
@@ -1372,9 +1360,7 @@ class PlayoffApp:
 
                 self.current_seconds = self.time_to_seconds(self.timer_value)
 
-                self.timer_label.config(
-                    text=self.seconds_to_time(self.current_seconds)
-                )
+                self.show_timer_text(self.format_timer_value())
 
                 # START MODE = start
                 if self.timer_start_mode == 'start':
@@ -1385,8 +1371,7 @@ class PlayoffApp:
                     self.lap_time_a = 0
                     self.lap_time_b = 0
 
-                    self.lap_time_a_var.set("A 00:00:000")
-                    self.lap_time_b_var.set("B 00:00:000")
+                    self.update_lap_display()
 
                     if self.lap_timer_enabled:
                         self.start_lap_timer()
@@ -1513,6 +1498,7 @@ class PlayoffApp:
                     def tracer(*args):
                         self.team_names[index]["id"] = var_id.get()
                         self.team_names[index]["desc"] = var_desc.get()
+                        self._team_lookup = None
                     return tracer
 
                 id_var.trace_add("write", make_trace(i, id_var, desc_var))
@@ -1522,18 +1508,21 @@ class PlayoffApp:
 
         def add_row():
             self.team_names.append({"id": "", "desc": ""})
+            self._team_lookup = None
             refresh_table()
 
         def delete_row(index):
             if index < 0 or index >= len(self.team_names):
                 return
             self.team_names.pop(index)
+            self._team_lookup = None
             refresh_table()
 
         def clear_all_rows():
             if not messagebox.askyesno("Potvrzení", "Opravdu chceš smazat všechny záznamy?"):
                 return
             self.team_names.clear()
+            self._team_lookup = None
             refresh_table()
 
         def export_to_excel():
@@ -1580,6 +1569,7 @@ class PlayoffApp:
                     "desc": str(row[1]) if row[1] is not None else ""
                 })
 
+            self._team_lookup = None
             refresh_table()
 
         # --- BUTTONS ---
@@ -1633,6 +1623,32 @@ class PlayoffApp:
         self.timer_start_mode = mode
         self.timer_start_mode_var.set(mode)
 
+    def set_timer_digits(self, digits):
+        self.timer_digits = digits
+        self.timer_digits_var.set(digits)
+        if self.countdown.running or self.countdown.paused:
+            self.show_timer_text(self.countdown.text(self.timer_digits))
+            if self.countdown.running:
+                self.ticker.start("countdown")
+        else:
+            self.show_timer_text(self.format_timer_value())
+
+        # save to file
+        try:
+            spath = os.path.join(os.path.expanduser('~'), '.playoff_settings.json')
+            data = {}
+            if os.path.exists(spath):
+                try:
+                    with open(spath, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except Exception:
+                    data = {}
+            data['timer_digits'] = digits
+            with open(spath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except Exception:
+            pass
+
     def toggle_third_place(self):
         self.third_place_enabled = self.third_place_var.get()
         self.redraw()        
@@ -1862,23 +1878,7 @@ class PlayoffApp:
             try:
                 self.usb.disconnect_displays()
                 self.usb.connect_displays()
-
-                self.root.after(
-                    2500,
-                    lambda: self.usb.send_display(1, "TXT:ID-1")
-                )
-                self.root.after(
-                    2600,
-                    lambda: self.usb.send_display(2, "TXT:ID-2")
-                )                
-                self.root.after(
-                    7000,
-                    lambda: self.usb.send_display(1, "TXT:-------")
-                )
-                self.root.after(
-                    7200,
-                    lambda: self.usb.send_display(2, "TXT:-------")
-                )
+                self.show_display_ids()
             except:
                 pass                
 
@@ -1930,25 +1930,18 @@ class PlayoffApp:
         if not fname:
             return
 
-        if self.bracket:
-            team_count = self.bracket.team_count
-            titles = self.bracket.titles
-            pre_titles = self.bracket.pre_titles
-        else:
-            team_count = 0
-            titles = []
-            pre_titles = []
+        core = bracket_to_setup(self.bracket, self.pre_round_enabled)
 
         data = {
-            'team_count': team_count,
+            'team_count': core['team_count'],
             'odd_behavior': self.odd_behavior,
             'font_scale': self.font_scale,
             'canvas_bg': self.canvas_bg,
             'line_width': self.line_width,
             'bg_path': self.bg_path,
             'lock_edit': self.lock_edit,
-            'titles': titles,
-            'rounds': [],
+            'titles': core['titles'],
+            'rounds': core['rounds'],
             'winner': self.current_winner,
             'enable_timer': self.enable_timer,
             'timer_value': self.timer_value, 
@@ -1972,26 +1965,10 @@ class PlayoffApp:
             'third_place': self.third_place,
             'third_place_title': self.third_place_title,
             # PRE ROUNDS
-            'pre_titles': pre_titles,
-            'pre_rounds': [],
+            'pre_titles': core['pre_titles'],
+            'pre_rounds': core['pre_rounds'],
             'lap_timer_enabled': self.lap_timer_enabled,
         }
-        if (self.bracket and self.pre_round_enabled and self.bracket.pre_rounds):
-            data['pre_rounds'] = [
-                [
-                    {
-                        'a': m.a.text,
-                        'b': m.b.text
-                    }
-                    for m in self.bracket.pre_rounds[0]
-                ]
-            ]
-        if self.bracket:
-            for r in self.bracket.rounds:
-                rd = []
-                for m in r:
-                    rd.append({'a': m.a.text, 'b': m.b.text})
-                data['rounds'].append(rd)
         try:
             with open(fname, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
@@ -2011,8 +1988,6 @@ class PlayoffApp:
             messagebox.showerror('Chyba', f'Nepodařilo se načíst soubor: {e}')
             self._log('Chyba', f'Nepodařilo se načíst soubor: {e}')
             return
-        # rebuild bracket with exact count
-        n = data.get('team_count', 0)
         self.odd_behavior = data.get('odd_behavior', 'manual')
         self.font_scale = data.get('font_scale', 'medium')
         self.canvas_bg = data.get('canvas_bg', CANVAS_BG_DEFAULT)
@@ -2026,6 +2001,8 @@ class PlayoffApp:
         self.timer_start_mode = data.get('timer_start_mode', 'start')
         self.timer_start_mode_var.set(self.timer_start_mode)
         self.team_names = data.get('team_names', [])
+        self._team_lookup = None
+        self.search_team = ""
         self.pre_round_enabled = data.get('pre_round_enabled', True)
         self.pre_round_var.set(self.pre_round_enabled)
         self.third_place_enabled = data.get('third_place_enabled', False)
@@ -2046,22 +2023,9 @@ class PlayoffApp:
         if self.lap_timer_enabled:
             self.lap_label_a.pack(side='left', padx=(10, 5))
             self.lap_label_b.pack(side='left', padx=(0, 20))                
-        self.generate_bracket_with_empty(n)
-
-        # --- LOAD PRE ROUND ---
-        pre_titles = data.get('pre_titles', [])
-        pre_rounds = data.get('pre_rounds', [])
 
-        if self.pre_round_enabled and pre_rounds:
-            if not self.bracket.pre_rounds:
-                self.bracket._build_pre([""] * n)
-
-            self.bracket.pre_titles = pre_titles if pre_titles else ["Předkolo"]
-
-            for m_idx, mdata in enumerate(pre_rounds[0]):
-                if m_idx < len(self.bracket.pre_rounds[0]):
-                    self.bracket.pre_rounds[0][m_idx].a.text = mdata.get('a', '')
-                    self.bracket.pre_rounds[0][m_idx].b.text = mdata.get('b', '')
+        # rebuild bracket with exact count, titles, rounds and pre-round
+        self.bracket = bracket_from_setup(data, self.pre_round_enabled)
         try:
             # ensure timer menu var exists
             self.timer_menu_var.set(self.enable_timer)
@@ -2069,50 +2033,18 @@ class PlayoffApp:
             pass
         # update timer display/visibility
         try:
-            self.timer_label.config(text=self.timer_value)
+            self.show_timer_text(self.format_timer_value())
             self.update_timer_visibility()
         except Exception:
             pass
 
-        # rebuild rounds exactly as in setup
-        rounds_in = data.get('rounds', [])
-        if rounds_in:
-            self.bracket.rounds = []
-            for rdata in rounds_in:
-                round_list = []
-                for m in rdata:
-                    a = Slot(m.get('a', ''))
-                    b = Slot(m.get('b', ''))
-                    round_list.append(Match(a, b))
-                self.bracket.rounds.append(round_list)
-
-        # load titles
-        titles = data.get('titles', [])
-        for i, t in enumerate(titles):
-            if i < len(self.bracket.titles):
-                self.bracket.titles[i] = t
-        if self.bracket.rounds:
-            if len(self.bracket.rounds[-1]) > 1:
-                self.bracket.rounds[-1] = [self.bracket.rounds[-1][0]]
-
-        # load rounds text
-        rounds_in = data.get('rounds', [])
-        for r_idx, rd in enumerate(rounds_in):
-            if r_idx >= len(self.bracket.rounds):
-                break
-            matches = self.bracket.rounds[r_idx]
-            for m_idx, mdata in enumerate(rd):
-                if m_idx >= len(matches):
-                    break
-                matches[m_idx].a.text = mdata.get('a', '')
-                matches[m_idx].b.text = mdata.get('b', '')
-
         # try load bg image if exists
         if self.bg_path and PIL_AVAILABLE and os.path.exists(self.bg_path):
             try:
-                self.bg_image = Image.open(self.bg_path).convert('RGBA')
+                self.bg_image = load_background(self.bg_path, self._bg_max_size())
             except Exception:
                 self.bg_image = None
+            self.bg_tk = None
 
         self.current_winner = data.get('winner', '')
         
@@ -2161,6 +2093,31 @@ class PlayoffApp:
 
         self.redraw()
 
+    def on_toggle_gate_timestamps(self):
+        on = self.gate_timestamps_var.get()
+        if self.usb:
+            self.usb.set_device_timestamps(on)
+
+        # save to file
+        try:
+            spath = os.path.join(os.path.expanduser('~'), '.playoff_settings.json')
+            data = {}
+
+            if os.path.exists(spath):
+                try:
+                    with open(spath, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except Exception:
+                    data = {}
+
+            data['gate_timestamps'] = on
+
+            with open(spath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+        except Exception:
+            pass
+
     def on_toggle_lap_timer(self):
         self.lap_timer_enabled = self.lap_timer_var.get()
 
@@ -2211,10 +2168,15 @@ class PlayoffApp:
 
     def update_timer_display(self):
         try:
-            self.timer_label.config(text=self.timer_value, bg='black', fg='white')
+            self.show_timer_text(self.format_timer_value())
+            self.timer_label.config(bg='black', fg='white')
         except Exception:
             pass
 
+    def show_timer_text(self, text):
+        # countdown label, Tk is called only when the text changes
+        self.ticker.set_text("timer", text, lambda t: self.timer_label.config(text=t))
+
     def on_timer_right_click(self, event=None):
         class WideEntryDialog(simpledialog._QueryString):
             def body(self, master):
@@ -2235,7 +2197,7 @@ class PlayoffApp:
         
         if self.validate_time_format(val):
             self.timer_value = val
-            self.timer_label.config(text=self.timer_value)
+            self.show_timer_text(self.format_timer_value())
             try:
                 spath = os.path.join(os.path.expanduser('~'), '.playoff_settings.json')
                 data = {}
@@ -2273,86 +2235,85 @@ class PlayoffApp:
         s = sec % 60
         return f"{m:02d}:{s:02d}"
 
+    def format_timer_value(self):
+        # preset MM:SS in the chosen precision (before start)
+        return format_remaining(self.time_to_seconds(self.timer_value) * 1000, self.timer_digits)
+
     def start_countdown(self):
         try:
             # stop blinking if active
             self.stop_blinking()
         except Exception:
             pass
-        try:
-            if getattr(self, 'countdown_after_id', None):
-                try:
-                    self.root.after_cancel(self.countdown_after_id)
-                except Exception:
-                    pass
-                self.countdown_after_id = None
-        except Exception:
-            self.countdown_after_id = None
         try:
             self.current_seconds = self.time_to_seconds(self.timer_value)
-            self.timer_label.config(text=self.seconds_to_time(self.current_seconds))
+            self.countdown.start(self.current_seconds * 1000)
+            self.timer_label.config(fg='white')
+            self.show_timer_text(self.countdown.text(self.timer_digits))
             self.timer_running = True
-            # schedule tick
-            self.countdown_after_id = self.root.after(1000, self.countdown_tick)
+            self.ticker.start("countdown", self.countdown.next_change_ms(self.timer_digits))
         except Exception:
             pass
 
-    def countdown_tick(self):
+    def countdown_tick(self, now=None):
+        # the text is computed from the deadline, a late tick cannot add up
         try:
-            if not getattr(self, 'timer_running', False):
+            if not getattr(self, 'timer_running', False) or not self.countdown.running:
+                self.ticker.stop("countdown")
                 return
-            if self.current_seconds <= 0:
+            now_ns = self.countdown.clock()
+            self.show_timer_text(self.countdown.text(self.timer_digits, now_ns))
+            if self.countdown.remaining_ns(now_ns) == 0:
                 self.timer_running = False
-                self.lap_running_a = False
-                self.lap_running_b = False
-                if self.lap_after_id:
-                    try:
-                        self.root.after_cancel(self.lap_after_id)
-                    except:
-                        pass
+                self.countdown.stop()
+                self.ticker.stop("countdown")
+                self.stop_lap_clocks()
                 self.start_blinking()
                 return
-            self.current_seconds -= 1
-            try:
-                self.timer_label.config(text=self.seconds_to_time(self.current_seconds))
-            except Exception:
-                pass
-            self.countdown_after_id = self.root.after(1000, self.countdown_tick)
+            # next run when the shown text changes
+            return self.countdown.next_change_ms(self.timer_digits, now_ns)
         except Exception:
             pass
 
+    def toggle_countdown_pause(self):
+        if self.countdown.running:
+            self.countdown.pause()
+            self.ticker.stop("countdown")
+            self.timer_running = False
+            self.show_timer_text(self.countdown.text(self.timer_digits))
+            self.timer_label.config(fg='#9a9a9a')
+        elif self.countdown.paused:
+            self.countdown.resume()
+            self.timer_running = True
+            self.timer_label.config(fg='white')
+            self.ticker.start("countdown", self.countdown.next_change_ms(self.timer_digits))
+
     def start_blinking(self):
         try:
             self.timer_blink = True
             self.blink_state = False
-            # kickoff blink loop
-            self._blink_step()
+            # blink loop (ticker, every 500 ms)
+            self.ticker.start("blink")
         except Exception:
             pass
 
-    def _blink_step(self):
+    def _blink_step(self, now=None):
         try:
             if not getattr(self, 'timer_blink', False):
+                self.ticker.stop("blink")
                 return
             self.blink_state = not getattr(self, 'blink_state', False)
             if self.blink_state:
                 self.timer_label.config(bg='red', fg='white')
             else:
                 self.timer_label.config(bg='white', fg='red')
-            # schedule next
-            self.blink_after_id = self.root.after(500, self._blink_step)
         except Exception:
             pass
 
     def stop_blinking(self):
         try:
             self.timer_blink = False
-            if getattr(self, 'blink_after_id', None):
-                try:
-                    self.root.after_cancel(self.blink_after_id)
-                except Exception:
-                    pass
-                self.blink_after_id = None
+            self.ticker.stop("blink")
             self.timer_label.config(bg='black', fg='white')
         except Exception:
             pass
@@ -2360,31 +2321,7 @@ class PlayoffApp:
 
     def _auto_resolve_byes(self):
         """Automatic BYE teams"""
-        rounds = self.bracket.rounds
-        last_round_index = len(rounds) - 1  # poslední kolo je Vítěz
-
-        for r_idx in range(len(rounds) - 1):
-            if r_idx == last_round_index:
-                continue
-
-            matches = rounds[r_idx]
-
-            for m_idx, match in enumerate(matches):
-
-                a = match.a.text.strip()
-                b = match.b.text.strip()
-
-                if (a and not b) or (b and not a):
-                    winner = a if a else b
-
-                    next_index = m_idx // 2
-                    next_match = rounds[r_idx + 1][next_index]
-                    side = 'a' if (m_idx % 2 == 0) else 'b'
-
-                    if side == 'a':
-                        next_match.a.text = winner
-                    else:
-                        next_match.b.text = winner
+        self.bracket.resolve_byes()
 
 
     # --- editing title (wide dialog) ---                       
@@ -2430,8 +2367,7 @@ class PlayoffApp:
     def edit_slot_dialog(self, r_idx, m_idx, side):
         if self.lock_edit:
             return
-        m = self.bracket.rounds[r_idx][m_idx]
-        slot = m.a if side == 'a' else m.b
+        index = self.bracket.slot_index(r_idx, m_idx, side)
         # create custom dialog
         dlg = tk.Toplevel(self.root)
         dlg.title('Zadej tým')
@@ -2445,10 +2381,11 @@ class PlayoffApp:
         tk.Label(dlg, text='Zadej číslo nebo název týmu:').pack(anchor='w', padx=10, pady=(10,0))
         ent = tk.Entry(dlg, width=60)
         ent.pack(padx=10, pady=8)
-        ent.insert(0, slot.text)
+        ent.insert(0, self.bracket.slots[index])
         ent.focus_set()
         def on_ok():
-            slot.text = ent.get()
+            changed = self.bracket.set_text(index, ent.get(), auto_bye=(self.odd_behavior == 'auto'))
+            self.update_third_place_from_semifinal(changed)
             dlg.destroy()
             self.redraw()
         def on_cancel():
@@ -2479,13 +2416,10 @@ class PlayoffApp:
             new_val = ent.get().strip()
 
             last_round = len(self.bracket.rounds) - 1
-            winner_match = self.bracket.rounds[last_round][0]
-
-            winner_match.a.text = new_val
-            winner_match.b.text = ""
+            changed = self.bracket.set_text(self.bracket.slot_index(last_round, 0, 'a'), new_val)
 
             self.current_winner = new_val
-            self.update_third_place_from_semifinal()
+            self.update_third_place_from_semifinal(changed)
             dlg.destroy()
             self.redraw()
 
@@ -2504,37 +2438,21 @@ class PlayoffApp:
 
     # --- promote (right-click) ---
     def promote(self, r_idx, m_idx, side):
-        match = self.bracket.rounds[r_idx][m_idx]
-        winner = match.a.text.strip() if side == 'a' else match.b.text.strip()
+        src = self.bracket.slot_index(r_idx, m_idx, side)
+        winner = self.bracket.slots[src].strip()
 
         if not winner:
             messagebox.showwarning('Upozornění', 'Pole je prázdné — nejdřív vyplň tým.')
             return
 
-        if r_idx + 1 < len(self.bracket.rounds):
-            next_index = m_idx // 2
-            next_match = self.bracket.rounds[r_idx + 1][next_index]
-            next_side = 'a' if (m_idx % 2 == 0) else 'b'
-            target = next_match.a if next_side == 'a' else next_match.b
-
-            if target.text:
-                if not messagebox.askyesno('Přepsat?', 'V cílovém poli už něco je. Přepsat?'):
-                    return
-
-            target.text = winner
-            self.update_third_place_from_semifinal()
-            self.redraw()
-            return
-
-        winner_round_index = len(self.bracket.rounds) - 1   
-        winner_match = self.bracket.rounds[winner_round_index][0]
-
-        winner_match.a.text = winner
-        winner_match.b.text = ""  
+        target = self.bracket.parent_slot(src)
+        if target != src and self.bracket.slots[target]:
+            if not messagebox.askyesno('Přepsat?', 'V cílovém poli už něco je. Přepsat?'):
+                return
 
-        self.update_third_place_from_semifinal()
+        changed = self.bracket.promote(src, auto_bye=(self.odd_behavior == 'auto'))
+        self.update_third_place_from_semifinal(changed)
         self.redraw()
-        return
 
     def promote_third_place(self, side):
         val = self.third_place[side].strip()
@@ -2548,6 +2466,51 @@ class PlayoffApp:
         self.third_place["winner"] = val
         self.redraw()    
 
+    def edit_third_place_slot(self, field):
+        if self.lock_edit:
+            return
+
+        dlg = tk.Toplevel(self.root)
+        dlg.title("3. místo")
+
+        ent = tk.Entry(dlg, width=30)
+        ent.pack(padx=10, pady=10)
+        ent.insert(0, self.third_place[field])
+        ent.focus()
+
+        def ok():
+            self.third_place[field] = ent.get()
+            dlg.destroy()
+            self.redraw()
+
+        tk.Button(dlg, text="OK", command=ok).pack(pady=5)
+        dlg.bind("<Return>", lambda e: ok())
+
+    def on_canvas_click(self, event, button):
+        """Left/right click on the bracket, resolved by the layout hit index."""
+        lay = self.drawn_layout
+        if lay is None or self.view_mode == "laps":
+            return
+        target = lay.hit_index().find(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if target is None:
+            return
+
+        kind = target[0]
+        if button == 1:
+            if kind == 'slot':
+                self.edit_slot_dialog(*target[1:])
+            elif kind == 'pre':
+                self.edit_pre_slot(*target[1:])
+            elif kind == 'winner':
+                self.edit_winner_dialog()
+            elif kind == 'tp':
+                self.edit_third_place_slot(target[1])
+        elif button == 3 and not self.lock_edit:
+            if kind == 'slot':
+                self.promote(*target[1:])
+            elif kind == 'tp' and target[1] in ('a', 'b'):
+                self.promote_third_place(target[1])
+
     def edit_third_place_title(self):
         if self.lock_edit:
             return
@@ -2573,10 +2536,7 @@ class PlayoffApp:
         if not self.bracket:
             return
         # --- NORMAL ROUNDS ---
-        for r in self.bracket.rounds:
-            for m in r:
-                m.a.text = ''
-                m.b.text = ''
+        self.bracket.clear_slots()
         # --- PRE ROUND ---
         if self.pre_round_enabled and self.bracket.pre_rounds:
             for r in self.bracket.pre_rounds:
@@ -2593,6 +2553,8 @@ class PlayoffApp:
         # clear everything: remove bracket and background; user must generate again
         self.bracket = None
         self.canvas.delete("all")
+        self.pool.forget()
+        self._laps_key = None
         self.bg_path = None
         self.bg_image = None
         self.bg_tk = None
@@ -2610,7 +2572,7 @@ class PlayoffApp:
         if not path:
             return
         try:
-            img = Image.open(path).convert('RGBA')
+            img = load_background(path, self._bg_max_size())
             self.bg_path = path
             self.bg_image = img
             self.bg_tk = None
@@ -2619,6 +2581,28 @@ class PlayoffApp:
         except Exception as e:
             messagebox.showerror('Chyba', str(e))
 
+    def _update_bg_tk(self, size):
+        img = self.bg_scaler.get(self.bg_image, size)
+        self.bg_tk_size = size
+        if img is not None:
+            self.bg_tk = ImageTk.PhotoImage(img)
+            self.bg_tk_preview = False
+            return
+        # fast preview once per size, full quality when the worker is done
+        self.bg_tk = ImageTk.PhotoImage(self.bg_scaler.preview(self.bg_image, size))
+        self.bg_tk_preview = True
+        self.bg_scaler.request(self.bg_image, size,
+                               lambda: self.usb_bridge.post(self._bg_resampled, size))
+
+    def _bg_resampled(self, size):
+        # Tk thread; an older size finished during a window drag = ignored
+        if self.bg_tk_preview and self.bg_tk_size == size and self.bg_image is not None:
+            self._update_bg_tk(size)
+            self.redraw()
+
+    def _bg_max_size(self):
+        return (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+
     def remove_bg(self):
         self.bg_path = None
         self.bg_image = None
@@ -2655,7 +2639,7 @@ class PlayoffApp:
             "Autor: Martin Pihrt © www.pihrt.com\n\n"
 
             "=== ZÁKLADNÍ OVLÁDÁNÍ ===\n"
-            "- Počet týmů: Nastavení → Počet týmů max 24\n"
+            f"- Počet týmů: Nastavení → Počet týmů max {MAX_TEAMS}\n"
             "- Generovat prázdné týmy: Nastavení → Generovat týmy\n"
             "- Editace týmu: Levé tlačítko myši na buňku\n"
             "- Postup do dalšího kola: Pravé tlačítko myši na tým\n"
@@ -2763,49 +2747,149 @@ class PlayoffApp:
         self.root.attributes('-fullscreen', False)
         self.root.after(50, self.redraw)
 
-    def build_team_lookup_from_round1(self):
-        if not self.bracket or not self.bracket.rounds:
-            return []
+    def current_layout(self, width, height):
+        """Bracket geometry for a width x height canvas (redraw, export_pdf).
+
+        Cached by (bracket, round versions, canvas size, font scale, ...), so
+        a PDF export right after a redraw reuses the same layout.
+        """
+        bracket = self.bracket
+        pre_round = bool(self.pre_round_enabled and bracket.pre_rounds)
+        tp_winner = self.third_place["winner"] if self.third_place_enabled else None
+        key = (
+            bracket, tuple(bracket.round_versions), width, height, self.font_scale,
+            pre_round, len(bracket.pre_rounds[0]) if pre_round else 0,
+            tp_winner, self.current_winner,
+        )
+
+        def compute():
+            cell_font_size, title_font_size = font_sizes(self.font_scale)
+            return compute_layout(
+                bracket, width, height,
+                self.text_measure.font("Arial", cell_font_size), title_font_size,
+                current_winner=self.current_winner,
+                pre_round=pre_round,
+                third_place_winner=tp_winner,
+                round_widths=self.round_widths,
+            )
 
-        round_index = 0
+        return self.layout_cache.get(key, compute)
 
-        ids = []
-        for m in self.bracket.rounds[round_index]:
-            a = m.a.text.strip()
-            b = m.b.text.strip()
-            if a:
-                ids.append(a)
-            if b:
-                ids.append(b)
+    def team_lookup(self):
+        """{team id: description} from team_names, rebuilt only after edits."""
+        if self._team_lookup is None:
+            self._team_lookup = {str(x.get("id", "")).strip(): x.get("desc", "") for x in self.team_names}
+        return self._team_lookup
 
-        lookup = {str(x.get("id", "")).strip(): x.get("desc", "") for x in self.team_names}
+    def build_team_lookup_from_round1(self):
+        if not self.bracket:
+            return []
 
-        result = []
-        for tid in ids:
-            if tid in lookup:
-                result.append((tid, lookup[tid]))
+        # (slot index, id, desc) for every round 1 slot of a named team
+        rows = []
+        for tid, desc in self.team_lookup().items():
+            for i in self.bracket.round_slots(tid, 0):
+                rows.append((i, tid, desc))
 
         def sort_key(x):
             try:
-                return int(x[0])
+                return (int(x[1]), x[0])
             except Exception:
-                return 10**9
+                return (10**9, x[0])
 
-        result.sort(key=sort_key)
-        return result
+        rows.sort(key=sort_key)
+        return [(tid, desc) for _, tid, desc in rows]
+
+    def find_team_dialog(self):
+        if self.view_mode == "laps":
+            self.find_lap_dialog()
+            return
+        if not self.bracket:
+            return
+
+        val = simpledialog.askstring(
+            "Najít tým",
+            "Číslo nebo název týmu (prázdné = zrušit zvýraznění):",
+            initialvalue=self.search_team,
+            parent=self.root
+        )
+        if val is None:
+            return
+
+        self.search_team = val.strip()
+        if self.search_team:
+            r_idx = self.bracket.furthest_round(self.search_team)
+            if r_idx < 0:
+                messagebox.showinfo("Najít tým", f"Tým {self.search_team} v pavoukovi není.")
+                self.search_team = ""
+            else:
+                self.status_var.set(f"Tým {self.search_team}: {self.bracket.titles[r_idx]}")
+                self.status_label.config(fg="black")
+        self.redraw()
 
     # --- playoff mode ---
     def redraw(self):
-        self.canvas.delete("all")
+        """Request a render. Any number of calls within one frame
+        (resize storm, several edits per action) end in one redraw_now()."""
+        self.redraw_stats["requested"] += 1
+        if self._redraw_after_id is not None:
+            return
+        wait = REDRAW_FRAME_MS - int((time.monotonic() - self._last_render) * 1000)
+        self._redraw_after_id = self.root.after(max(0, wait), self._redraw_frame)
+
+    def _redraw_frame(self):
+        self._redraw_after_id = None
+        self.redraw_now()
+
+    def redraw_now(self):
+        """Render immediately (cancels a pending scheduled redraw)."""
+        if self._redraw_after_id is not None:
+            self.root.after_cancel(self._redraw_after_id)
+            self._redraw_after_id = None
+        self._last_render = time.monotonic()
+        self.redraw_stats["executed"] += 1
+
         if self.view_mode == "laps":
-            self.draw_laps()
+            self.drawn_layout = None
+            self.pool.forget()   # draw_laps clears the whole canvas
+            with self.perf.timed("draw_laps"):
+                self.draw_laps()
+            self._perf_after_render("draw_laps")
             return
+        if self._laps_key is not None:
+            # coming from the laps view: its items (tables, SMAZAT buttons
+            # with live tag_binds) are not pool items, pool.end() keeps them
+            self.canvas.delete("all")
+            self.pool.forget()
+            self._laps_key = None
 
         self.rect_items.clear()
         self.text_items.clear()
         self.title_items.clear()
         self.line_items.clear()
 
+        pool = self.pool
+        self.drawn_layout = None
+        start = time.perf_counter_ns()
+        pool.begin()
+        try:
+            self._redraw_playoff(pool)
+        finally:
+            pool.end()
+        self.perf.record_since("redraw", start, **pool.stats)
+        self._perf_after_render("redraw")
+
+    def _text_height(self, text, font, width):
+        # temporary item: Tk wraps the text, bbox gives the height
+        temp_id = self.canvas.create_text(0, 0, text=text, font=font, width=width)
+        bbox = self.canvas.bbox(temp_id)
+        self.canvas.delete(temp_id)
+        return bbox[3] - bbox[1] if bbox else font[1]
+
+    def _redraw_playoff(self, pool):
+        # items are kept between redraws: every item has a stable key, e.g.
+        # ('box', r, m) or ('text', r, m, 'a'); pool.end() removes the rest
+
         # --- BACKGROUND IMAGE ---
         if self.bg_image and PIL_AVAILABLE:
             try:
@@ -2813,10 +2897,10 @@ class PlayoffApp:
                 ch = self.canvas.winfo_height()
 
                 if cw > 1 and ch > 1:
-                    # scale image to canvas size
-                    img = self.bg_image.resize((cw, ch), Image.LANCZOS)
-                    self.bg_tk = ImageTk.PhotoImage(img)
-                    self.canvas.create_image(0, 0, image=self.bg_tk, anchor="nw")
+                    # scale image to canvas size (cached, LANCZOS on worker thread)
+                    if self.bg_tk is None or self.bg_tk_size != (cw, ch):
+                        self._update_bg_tk((cw, ch))
+                    pool.item('bg', 'image', (0, 0), layer='bg', image=self.bg_tk, anchor="nw")
             except Exception as e:
                 self._log("BACKGROUND ERROR:", e)
 
@@ -2825,324 +2909,147 @@ class PlayoffApp:
 
         width = self.root.winfo_screenwidth() if self.projector_mode else max(800, self.canvas.winfo_width())
         height = self.root.winfo_screenheight() if self.projector_mode else max(600, self.canvas.winfo_height())
-        self.canvas.config(width=width, height=height, bg=self.canvas_bg)
+        if self._canvas_config != (width, height, self.canvas_bg):
+            self._canvas_config = (width, height, self.canvas_bg)
+            self.canvas.config(width=width, height=height, bg=self.canvas_bg)
 
+        lay = self.current_layout(width, height)
+        self.drawn_layout = lay       # clicks are resolved against this
         rounds = self.bracket.rounds
-        pre_rounds = self.bracket.pre_rounds if self.pre_round_enabled else []
-        rounds_count = len(rounds)
-        last_round = rounds_count - 1
-        final_real_round = last_round - 1
-
-        # --- font sizes ---
-        if self.font_scale == 'large':
-            cell_font_size = 28
-        elif self.font_scale == 'small':
-            cell_font_size = 12
-        else:
-            cell_font_size = 14
-
-        cell_font = tkfont.Font(family="Arial", size=cell_font_size)
+        box_h = lay.box_h
+        margin_y = MARGIN_Y
 
-        if self.font_scale == 'large':
-            title_font_size = 13
-        elif self.font_scale == 'medium':
-            title_font_size = 11
-        else:
-            title_font_size = 8
+        search_hits = set(self.bracket.positions(self.search_team)) if self.search_team else set()
 
+        cell_font_size, title_font_size = font_sizes(self.font_scale)
         title_font = ("Arial", title_font_size, "bold")
 
-        # --- column widths ---
-        col_widths = []
-        padding = 20
-        min_w = 60
-        max_w = 220
-
-        for r_idx, matches in enumerate(rounds):
-            if r_idx == last_round:
-                winner_match = rounds[last_round][0]
-                winner_text = winner_match.a.text.strip() or winner_match.b.text.strip() or self.current_winner
-                text_px = cell_font.measure(winner_text)
-                col_widths.append(max(min_w, min(max_w, text_px + padding)))
-                continue
-
-            max_px = 0
-            for m in matches:
-                max_px = max(max_px, cell_font.measure(m.a.text.strip()))
-                max_px = max(max_px, cell_font.measure(m.b.text.strip()))
-            col_widths.append(max(min_w, min(max_w, max_px + padding)))
-
-        margin_x = 40
-        margin_y = 40
-        h_gap = 70 
-        v_gap = 10
-
-        box_h = 40
-        per_match_h = box_h * 2 + 8
-        initial_matches = len(rounds[0])
-
-        total_h = initial_matches * per_match_h + (initial_matches - 1) * v_gap + 2 * margin_y
-        if total_h > height:
-            scale = height / total_h
-            scale = max(0.25, scale)
-            box_h = int(box_h * scale)
-            v_gap = max(3, int(v_gap * scale))
-            per_match_h = box_h * 2 + 8
-
-        col_x_positions = []
-        x = margin_x
-
         # --- PRE ROUND COLUMN ---
-        if self.pre_round_enabled and self.bracket.pre_rounds:
-            pre_w = col_widths[0] 
-            col_x_positions.append(x)
-            x += pre_w + h_gap
-
-        # --- NORMAL ROUNDS ---
-        for w in col_widths:
-            col_x_positions.append(x)
-            x += w + h_gap
-
-        final_centers = []
-        semi_losers_centers = []
-
-        if self.pre_round_enabled and self.bracket.pre_rounds:
-
-            pre_matches = self.bracket.pre_rounds[0]
-            col_x = col_x_positions[0]
-            box_w = col_widths[0]
-
-            title_id = self.canvas.create_text(
-                col_x + box_w/2,
-                margin_y - 10,
+        if lay.pre_title:
+            tx, ty, tw = lay.pre_title
+            pool.item(
+                ('pre_title',), 'text',
+                (tx, ty),
+                layer='text',
+                binds={'<Button-1>': lambda e: self.edit_pre_title()},
                 text=self.bracket.pre_titles[0] if self.bracket.pre_titles else "Předkolo",
                 font=title_font,
                 fill=TITLE_COLOR,
-                width=box_w + 60,
+                width=tw,
                 justify="center",
-                anchor="n"                
+                anchor="n"
             )
 
-            if not self.lock_edit:
-                self.canvas.tag_bind(title_id, '<Button-1>',
-                                     lambda e: self.edit_pre_title())
-
-            matches_count = len(pre_matches)
-            total_col_h = matches_count * (box_h * 2 + 8) + (matches_count - 1) * v_gap
-            start_y = max(margin_y + title_font_size + 10,
-                          (height - total_col_h) // 2)
-
-            for m_idx, match in enumerate(pre_matches):
-
-                top_y = start_y + m_idx * ((box_h * 2 + 8) + v_gap)
-
-                x1 = col_x
-                y1 = top_y
-                x2 = x1 + box_w
-                y2 = y1 + box_h * 2 + 8
-
-                self.canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill=BOX_FILL,
-                    outline=BOX_OUTLINE,
-                    width=self.line_width
-                )
-
-                self.canvas.create_line(
-                    x1, y1 + box_h + 4,
-                    x2, y1 + box_h + 4,
-                    fill=BOX_OUTLINE,
-                    width=max(1, self.line_width - 1)
-                )
-
-                if not match.a.text.strip():
-                    self.canvas.create_rectangle(x1, y1, x2, y1 + box_h,
-                                                 fill=WINNER_FILL, outline="", width=0)
+        pre_matches = self.bracket.pre_rounds[0] if lay.pre_matches else []
+        for m_idx, x1, y1, x2, y2 in lay.pre_matches:
+            match = pre_matches[m_idx]
+            box_a, box_b = lay.side_boxes(x1, y1, x2, y2)
 
-                if not match.b.text.strip():
-                    self.canvas.create_rectangle(x1, y1 + box_h + 8, x2, y2,
-                                                 fill=WINNER_FILL, outline="", width=0)
+            pool.item(
+                ('pre_box', m_idx), 'rectangle',
+                (x1, y1, x2, y2),
+                fill=BOX_FILL,
+                outline=BOX_OUTLINE,
+                width=self.line_width
+            )
 
-                self.canvas.create_text(
-                    (x1 + x2)/2,
-                    y1 + box_h/2,
-                    text=match.a.text,
-                    font=("Arial", cell_font_size)
-                )
+            pool.item(
+                ('pre_split', m_idx), 'line',
+                (x1, y1 + box_h + 4, x2, y1 + box_h + 4),
+                layer='mark',
+                fill=BOX_OUTLINE,
+                width=max(1, self.line_width - 1)
+            )
 
-                self.canvas.create_text(
-                    (x1 + x2)/2,
-                    y1 + box_h + 8 + box_h/2,
-                    text=match.b.text,
+            for side, slot, box in (('a', match.a, box_a), ('b', match.b, box_b)):
+                # empty fields are highlighted
+                pool.item(('pre_mark', m_idx, side), 'rectangle', box,
+                          layer='mark', fill=WINNER_FILL, outline="", width=0,
+                          state='hidden' if slot.text.strip() else 'normal')
+
+                pool.item(
+                    ('pre_text', m_idx, side), 'text',
+                    ((box[0] + box[2])/2, (box[1] + box[3])/2),
+                    layer='text',
+                    text=slot.text,
                     font=("Arial", cell_font_size)
                 )
 
-                # HITBOXES
-                hit_a = self.canvas.create_rectangle(x1, y1, x2, y1 + box_h,
-                                                     fill="", outline="")
-                hit_b = self.canvas.create_rectangle(x1, y1 + box_h + 8, x2, y2,
-                                                     fill="", outline="")
-
-                if not self.lock_edit:
-                    self.canvas.tag_bind(hit_a, '<Button-1>',
-                                         lambda e, mm=m_idx: self.edit_pre_slot(mm, 'a'))
-                    self.canvas.tag_bind(hit_b, '<Button-1>',
-                                         lambda e, mm=m_idx: self.edit_pre_slot(mm, 'b'))                
-
-        offset = 1 if (self.pre_round_enabled and self.bracket.pre_rounds) else 0
-        for r_idx, matches in enumerate(rounds):
-            col_x = col_x_positions[r_idx + offset]
-            box_w = col_widths[r_idx]
-
-            title_id = self.canvas.create_text(
-                col_x + box_w/2,
-                margin_y - 10,
+        for r_idx, (tx, ty, tw) in enumerate(lay.titles):
+            pool.item(
+                ('title', r_idx), 'text',
+                (tx, ty),
+                layer='text',
+                binds={'<Button-1>': lambda e, rr=r_idx: self.edit_title(rr)},
                 text=self.bracket.titles[r_idx],
                 font=title_font,
                 fill=TITLE_COLOR,
-                width=box_w + 60,
+                width=tw,
                 justify="center",
                 anchor="n"
             )
-            self.canvas.tag_bind(title_id, '<Button-1>', lambda e, rr=r_idx: self.edit_title(rr))
-
-            matches_count = len(matches)
-            total_col_h = matches_count * (box_h * 2 + 8) + (matches_count - 1) * v_gap
-            start_y = max(margin_y + title_font_size + 10,
-                          (height - total_col_h) // 2)
 
-            finalists = set()
+        for r_idx, m_idx, x1, y1, x2, y2 in lay.matches:
+            match = rounds[r_idx][m_idx]
+            box_a, box_b = lay.side_boxes(x1, y1, x2, y2)
 
-            try:
-                final_match = rounds[final_real_round + 1][0]
-                fa = final_match.a.text.strip()
-                fb = final_match.b.text.strip()
-
-                if fa and fb:
-                    finalists = {fa, fb}
-            except:
-                pass
-
-            for m_idx, match in enumerate(matches):
-
-                if r_idx == last_round and len(matches) == 1:
-                    continue
-
-                top_y = start_y + m_idx * ((box_h * 2 + 8) + v_gap)
+            pool.item(
+                ('box', r_idx, m_idx), 'rectangle',
+                (x1, y1, x2, y2),
+                fill=BOX_FILL, outline=BOX_OUTLINE, width=self.line_width
+            )
 
-                match_x1 = col_x
-                match_y1 = top_y
-                match_x2 = match_x1 + box_w
-                match_y2 = match_y1 + box_h * 2 + 8
+            pool.item(
+                ('split', r_idx, m_idx), 'line',
+                (x1, y1 + box_h + 4, x2, y1 + box_h + 4),
+                layer='mark',
+                fill=BOX_OUTLINE,
+                width=max(1, self.line_width - 1)
+            )
 
-                a_x1, a_y1, a_x2, a_y2 = match_x1, match_y1, match_x2, match_y1 + box_h
-                b_x1, b_y1, b_x2, b_y2 = match_x1, a_y2 + 8, match_x2, match_y2
+            # winner (and empty fields while no winner) = yellow, search hit = blue
+            for side, text, box in (('a', match.a.text, box_a), ('b', match.b.text, box_b)):
+                if (r_idx, m_idx, side) in search_hits:
+                    mark_fill = SEARCH_FILL
+                elif text.strip() == self.current_winner.strip():
+                    mark_fill = WINNER_FILL
+                else:
+                    mark_fill = None
 
-                rect_match = self.canvas.create_rectangle(
-                    match_x1, match_y1, match_x2, match_y2,
-                    fill=BOX_FILL, outline=BOX_OUTLINE, width=self.line_width
-                )
+                pool.item(('mark', r_idx, m_idx, side), 'rectangle', box,
+                          layer='mark', outline="", width=0,
+                          fill=mark_fill or WINNER_FILL,
+                          state='normal' if mark_fill else 'hidden')
 
-                self.canvas.create_line(
-                    a_x1, a_y2 + 4,
-                    a_x2, a_y2 + 4,
-                    fill=BOX_OUTLINE,
-                    width=max(1, self.line_width - 1)
-                )
+                pool.item(('text', r_idx, m_idx, side), 'text',
+                          ((box[0] + box[2])/2, (box[1] + box[3])/2),
+                          layer='text', text=text, font=("Arial", cell_font_size))
 
-                is_winner_a = (match.a.text.strip() == self.current_winner.strip())
-                is_winner_b = (match.b.text.strip() == self.current_winner.strip())
-
-                if is_winner_a:
-                    self.canvas.create_rectangle(a_x1, a_y1, a_x2, a_y2, fill=WINNER_FILL, outline="", width=0)
-                if is_winner_b:
-                    self.canvas.create_rectangle(b_x1, b_y1, b_x2, b_y2, fill=WINNER_FILL, outline="", width=0)
-
-                txt_a = self.canvas.create_text((a_x1+a_x2)/2, (a_y1+a_y2)/2,
-                                                text=match.a.text, font=("Arial", cell_font_size))
-                txt_b = self.canvas.create_text((b_x1+b_x2)/2, (b_y1+b_y2)/2,
-                                                text=match.b.text, font=("Arial", cell_font_size))
-
-                # HITBOXES MUST LAST
-                hit_a = self.canvas.create_rectangle(a_x1, a_y1, a_x2, a_y2, fill="", outline="")
-                hit_b = self.canvas.create_rectangle(b_x1, b_y1, b_x2, b_y2, fill="", outline="")
-
-                if not self.lock_edit:
-                    self.canvas.tag_bind(hit_a, '<Button-1>', lambda e, rr=r_idx, mm=m_idx: self.edit_slot_dialog(rr, mm, 'a'))
-                    self.canvas.tag_bind(hit_b, '<Button-1>', lambda e, rr=r_idx, mm=m_idx: self.edit_slot_dialog(rr, mm, 'b'))
-                    self.canvas.tag_bind(hit_a, '<Button-3>', lambda e, rr=r_idx, mm=m_idx: self.promote(rr, mm, 'a'))
-                    self.canvas.tag_bind(hit_b, '<Button-3>', lambda e, rr=r_idx, mm=m_idx: self.promote(rr, mm, 'b'))
-
-                if r_idx + 1 < rounds_count:
-                    cx = a_x2
-                    cy = (a_y1 + b_y2) / 2
-
-                    next_col_x = col_x_positions[r_idx + 1 + offset]
-                    next_idx = m_idx // 2
-                    nm = len(rounds[r_idx + 1])
-                    total_h_next = nm * (box_h * 2 + 8) + (nm - 1) * v_gap
-                    start_y_next = max(margin_y + title_font_size + 10,
-                                       (height - total_h_next) // 2)
-                    ny = start_y_next + next_idx * ((box_h * 2 + 8) + v_gap) + box_h
-
-                    self.canvas.create_line(cx, cy, next_col_x, ny,
-                                            width=self.line_width, fill=LINE_COLOR, smooth=True)
-
-                if r_idx == final_real_round:
-                    final_centers.append(((a_x2), (a_y1 + b_y2) / 2))
-
-                if r_idx == last_round - 2:
-                    final_match = rounds[last_round - 1][0]
-                    if m_idx == 0:
-                        finalist = final_match.a.text.strip()
-                    else:
-                        finalist = final_match.b.text.strip()
-                    if match.a.text.strip() and match.a.text.strip() != finalist:
-                        semi_losers_centers.append((a_x2, (a_y1 + a_y2) / 2))
-                    if match.b.text.strip() and match.b.text.strip() != finalist:
-                        semi_losers_centers.append((b_x2, (b_y1 + b_y2) / 2))
+        for r_idx, m_idx, x1, y1, x2, y2 in lay.links:
+            pool.item(('link', r_idx, m_idx), 'line', (x1, y1, x2, y2),
+                      layer='link', width=self.line_width, fill=LINE_COLOR, smooth=True)
 
         # --- Winner box ---
-        winner_match = rounds[last_round][0]
-        winner_text = winner_match.a.text.strip() or winner_match.b.text.strip() or self.current_winner
-
-        text_width = cell_font.measure(winner_text) if winner_text else 0
-        win_w = max(text_width + 60, col_widths[last_round] + 40)
-        win_h = box_h * 2
-
-        col_x = col_x_positions[last_round + offset]
-        win_x_center = col_x + col_widths[last_round] / 2
-
-        win_x1 = win_x_center - win_w/2
-        win_x2 = win_x_center + win_w/2
-        win_y1 = (height // 2) - win_h//2
-        win_y2 = win_y1 + win_h
+        win_x1, win_y1, win_x2, win_y2 = lay.winner
 
-        self.canvas.create_rectangle(
-            win_x1, win_y1, win_x2, win_y2,
+        pool.item(
+            ('winner_box',), 'rectangle',
+            lay.winner,
             fill=BOX_FILL, outline=BOX_OUTLINE, width=self.line_width+1
         )
 
-        self.canvas.create_text(
-            (win_x1+win_x2)/2, (win_y1+win_y2)/2,
-            text=winner_text,
+        pool.item(
+            ('winner_text',), 'text',
+            ((win_x1+win_x2)/2, (win_y1+win_y2)/2),
+            layer='text',
+            text=lay.winner_text,
             font=("Arial", cell_font_size*2, "bold")
         )
 
-        # --- HITBOX WINNER ---
-        hit_winner = self.canvas.create_rectangle(
-            win_x1, win_y1, win_x2, win_y2,
-            fill="", outline=""
-        )
-
-        if not self.lock_edit:
-            self.canvas.tag_bind(hit_winner, '<Button-1>',
-                                 lambda e: self.edit_winner_dialog())
-
         # one line between the final and the winner = we will use the AVERAGE of both centers
-        if final_centers:
-            avg_x = sum(p[0] for p in final_centers) / len(final_centers)
-            avg_y = sum(p[1] for p in final_centers) / len(final_centers)
+        if lay.final_centers:
+            avg_x = sum(p[0] for p in lay.final_centers) / len(lay.final_centers)
+            avg_y = sum(p[1] for p in lay.final_centers) / len(lay.final_centers)
             self.line_items.append((avg_x, avg_y, win_x1, (win_y1 + win_y2) / 2, self.line_width, LINE_COLOR))
 
         # === TABLE WITH TEAMS NAMES ===
@@ -3163,20 +3070,24 @@ class PlayoffApp:
                     col1_w = 50
                     col2_w = table_x2 - table_x1 - col1_w - 10
 
-                    self.canvas.create_rectangle(
-                        table_x1, table_y,
-                        table_x2, table_y + row_h,
+                    pool.item(
+                        ('table_head',), 'rectangle',
+                        (table_x1, table_y, table_x2, table_y + row_h),
                         fill="#dddddd", outline=BOX_OUTLINE, width=1
                     )
 
-                    self.canvas.create_text(
-                        table_x1 + col1_w/2, table_y + row_h/2,
+                    pool.item(
+                        ('table_head_id',), 'text',
+                        (table_x1 + col1_w/2, table_y + row_h/2),
+                        layer='text',
                         text="ID", font=("Arial", min(16, table_font_size), "bold")
                     )
 
                     col_title = self.bracket.titles[0] if self.bracket.titles else "Popis"
-                    self.canvas.create_text(
-                        table_x1 + col1_w + col2_w/2 + 5, table_y + row_h/2,
+                    pool.item(
+                        ('table_head_desc',), 'text',
+                        (table_x1 + col1_w + col2_w/2 + 5, table_y + row_h/2),
+                        layer='text',
                         text=col_title, font=("Arial", min(16, table_font_size), "bold")
                     )
 
@@ -3188,48 +3099,44 @@ class PlayoffApp:
                         else:
                             row_fill = "#f2f2f2"
 
-                        temp_id = self.canvas.create_text(
-                            0, 0,
-                            text=name,
-                            font=("Arial", table_font_size),
-                            width=col2_w - 16
+                        # wrapped height measured once per (text, font, width)
+                        text_height = self.text_measure.height(
+                            "Arial", table_font_size, name, col2_w - 16,
+                            lambda: self._text_height(name, ("Arial", table_font_size), col2_w - 16)
                         )
 
-                        bbox = self.canvas.bbox(temp_id)
-                        text_height = bbox[3] - bbox[1] if bbox else table_font_size
-                        self.canvas.delete(temp_id)
-
                         row_h = max(26, text_height + 12)
 
-                        self.canvas.create_rectangle(
-                            table_x1, y,
-                            table_x2, y + row_h,
+                        pool.item(
+                            ('table_row', row_index), 'rectangle',
+                            (table_x1, y, table_x2, y + row_h),
                             fill=row_fill,
                             outline=BOX_OUTLINE,
                             width=1
                         )
 
-                        self.canvas.create_line(
-                            table_x1 + col1_w,
-                            y,
-                            table_x1 + col1_w,
-                            y + row_h,
+                        pool.item(
+                            ('table_sep', row_index), 'line',
+                            (table_x1 + col1_w, y, table_x1 + col1_w, y + row_h),
+                            layer='mark',
                             fill=BOX_OUTLINE,
                             width=1
                         )
 
                         # ID
-                        self.canvas.create_text(
-                            table_x1 + col1_w / 2,
-                            y + row_h / 2,
+                        pool.item(
+                            ('table_id', row_index), 'text',
+                            (table_x1 + col1_w / 2, y + row_h / 2),
+                            layer='text',
                             text=str(tid),
                             font=("Arial", table_font_size)
                         )
 
                         # LABEL
-                        self.canvas.create_text(
-                            table_x1 + col1_w + 8,
-                            y + row_h / 2,
+                        pool.item(
+                            ('table_desc', row_index), 'text',
+                            (table_x1 + col1_w + 8, y + row_h / 2),
+                            layer='text',
                             text=name,
                             font=("Arial", table_font_size),
                             anchor="w",
@@ -3247,175 +3154,79 @@ class PlayoffApp:
             self._log("TEAM TABLE ERROR:", e)
 
         # === 3RD PLACE ===
-        if self.third_place_enabled:
-            semi_col_index = final_real_round + offset
-            semi_col_x = col_x_positions[semi_col_index]
-            base_x = semi_col_x
-
-            third_offset_y = 100
-            base_y = win_y2 + third_offset_y
-
-            # small boxes A/B
-            box_w = col_widths[final_real_round] if col_widths else 120
-            box_h_small = box_h
-            gap = 6
-
-            # --- BIG WINNER BOX ---
-            winner_text_tp = self.third_place["winner"]
-            text_width_tp = cell_font.measure(winner_text_tp) if winner_text_tp else 0
-
-            winner_w = max(text_width_tp + 60, col_widths[last_round] + 40)
-            winner_h = box_h * 2
-
-            win_x = win_x1
+        if lay.third:
+            tp = lay.third
+            box_a, box_b, box_win = tp["a"], tp["b"], tp["winner"]
 
             # TITLE
-            title_id = self.canvas.create_text(
-                base_x + 60,
-                base_y - 25,
+            pool.item(
+                ('tp_title',), 'text',
+                tp["title"],
+                layer='text',
+                binds={"<Button-1>": lambda e: self.edit_third_place_title()},
                 text=self.third_place_title,
                 font=title_font
             )
 
-            if not self.lock_edit:
-                self.canvas.tag_bind(title_id, "<Button-1>", lambda e: self.edit_third_place_title())
-
-            # --- LEFT MATCH ---
-            a_y1 = base_y
-            b_y1 = a_y1 + box_h_small + gap
-
-            # box A
-            self.canvas.create_rectangle(
-                base_x, a_y1, base_x + box_w, a_y1 + box_h_small,
-                fill=BOX_FILL, outline=BOX_OUTLINE, width=self.line_width
-            )
-
-            self.canvas.create_text(
-                base_x + box_w/2,
-                a_y1 + box_h_small/2,
-                text=self.third_place["a"],
-                font=("Arial", cell_font_size)
-            )
+            # --- LEFT MATCH (box A, box B) ---
+            for side, box in (('a', box_a), ('b', box_b)):
+                pool.item(
+                    ('tp_box', side), 'rectangle',
+                    box,
+                    fill=BOX_FILL, outline=BOX_OUTLINE, width=self.line_width
+                )
 
-            # box B
-            self.canvas.create_rectangle(
-                base_x, b_y1, base_x + box_w, b_y1 + box_h_small,
-                fill=BOX_FILL, outline=BOX_OUTLINE, width=self.line_width
-            )
+                pool.item(
+                    ('tp_text', side), 'text',
+                    ((box[0] + box[2])/2, (box[1] + box[3])/2),
+                    layer='text',
+                    text=self.third_place[side],
+                    font=("Arial", cell_font_size)
+                )
 
-            self.canvas.create_text(
-                base_x + box_w/2,
-                b_y1 + box_h_small/2,
-                text=self.third_place["b"],
-                font=("Arial", cell_font_size)
-            )
+                # highlight clear fields
+                pool.item(
+                    ('tp_mark', side), 'rectangle',
+                    box,
+                    layer='mark', fill=WINNER_FILL, outline="", width=0,
+                    state='hidden' if self.third_place[side].strip() else 'normal'
+                )
 
             # --- WINNER BOX ---
-            win_y1 = a_y1
-
-            self.canvas.create_rectangle(
-                win_x, win_y1,
-                win_x + winner_w, win_y1 + winner_h,
+            pool.item(
+                ('tp_box', 'winner'), 'rectangle',
+                box_win,
                 fill=BOX_FILL, outline=BOX_OUTLINE, width=self.line_width
             )
 
-            self.canvas.create_text(
-                win_x + winner_w/2,
-                win_y1 + winner_h/2,
+            pool.item(
+                ('tp_text', 'winner'), 'text',
+                ((box_win[0] + box_win[2])/2, (box_win[1] + box_win[3])/2),
+                layer='text',
                 text=self.third_place["winner"],
                 font=("Arial", cell_font_size*2, "bold")
             )
 
-            # highlight clear fields
-            if not self.third_place["a"].strip():
-                self.canvas.create_rectangle(
-                    base_x, a_y1, base_x + box_w, a_y1 + box_h_small,
-                    fill=WINNER_FILL, outline="", width=0
-                )
-
-            if not self.third_place["b"].strip():
-                self.canvas.create_rectangle(
-                    base_x, b_y1, base_x + box_w, b_y1 + box_h_small,
-                    fill=WINNER_FILL, outline="", width=0
-                )
-
             # --- LINE ---
-            self.canvas.create_line(
-                base_x + box_w,
-                a_y1 + box_h_small,
-                win_x,
-                win_y1 + winner_h/2,
+            pool.item(
+                ('tp_link',), 'line',
+                tp["link"],
+                layer='link',
                 fill=THIRD_PLACE_LINE_COLOR,
                 width=self.line_width
             )
 
             # --- LINES from semifinal to 3. place ---
-            if len(semi_losers_centers) >= 2:
-
-                p1 = semi_losers_centers[0]
-                p2 = semi_losers_centers[1]
-
-                target_x = base_x
-
-                self.canvas.create_line(
-                    p1[0], p1[1],
-                    target_x,
-                    a_y1 + box_h_small / 2,
-                    fill=THIRD_PLACE_LINE_COLOR,
-                    width=self.line_width,
-                    smooth=True
-                )
-
-                self.canvas.create_line(
-                    p2[0], p2[1],
-                    target_x,
-                    b_y1 + box_h_small / 2,
+            for side, coords in zip('ab', tp["semi_links"]):
+                pool.item(
+                    ('tp_semi_link', side), 'line',
+                    coords,
+                    layer='link',
                     fill=THIRD_PLACE_LINE_COLOR,
                     width=self.line_width,
                     smooth=True
                 )
 
-            # --- HITBOXES ---
-            if not self.lock_edit:
-
-                def edit_tp(field):
-                    dlg = tk.Toplevel(self.root)
-                    dlg.title("3. místo")
-
-                    ent = tk.Entry(dlg, width=30)
-                    ent.pack(padx=10, pady=10)
-                    ent.insert(0, self.third_place[field])
-                    ent.focus()
-
-                    def ok():
-                        self.third_place[field] = ent.get()
-                        dlg.destroy()
-                        self.redraw()
-
-                    tk.Button(dlg, text="OK", command=ok).pack(pady=5)
-                    dlg.bind("<Return>", lambda e: ok())
-
-                self.canvas.create_rectangle(
-                    base_x, a_y1, base_x+box_w, a_y1+box_h_small,
-                    fill="", outline="", tags="tp_a"
-                )
-                self.canvas.tag_bind("tp_a", "<Button-1>", lambda e: edit_tp("a"))
-
-                self.canvas.create_rectangle(
-                    base_x, b_y1, base_x+box_w, b_y1+box_h_small,
-                    fill="", outline="", tags="tp_b"
-                )
-                self.canvas.tag_bind("tp_b", "<Button-1>", lambda e: edit_tp("b"))
-
-                self.canvas.create_rectangle(
-                    win_x, win_y1, win_x+winner_w, win_y1+winner_h,
-                    fill="", outline="", tags="tp_w"
-                )
-                self.canvas.tag_bind("tp_w", "<Button-1>", lambda e: edit_tp("winner"))
-
-                self.canvas.tag_bind("tp_a", "<Button-3>", lambda e: self.promote_third_place("a"))
-                self.canvas.tag_bind("tp_b", "<Button-3>", lambda e: self.promote_third_place("b"))         
-
         # --- TIMER OVERLAY ---
         try:
             if self.enable_timer:
@@ -3433,30 +3244,38 @@ class PlayoffApp:
 
                 ty = margin_y + 120                # DOWN
 
-                self.timer_window = self.canvas.create_window(
-                    tx,
-                    ty,
+                self.timer_window = pool.item(
+                    ('timer',), 'window',
+                    (tx, ty),
+                    layer='top',
                     window=self.timer_label,
-                    anchor='center'
+                    anchor='center',
+                    state='normal'
                 )
 
-                self.canvas.itemconfigure(self.timer_window, state='normal')
-
-            else:
-                if self.timer_window:
-                    self.canvas.itemconfigure(self.timer_window, state='hidden')
+            elif self.timer_window:
+                self.timer_window = pool.keep(('timer',), state='hidden')
 
         except Exception as e:
             self._log("TIMER ERROR:", e)
 
     # --- laps mode ---
     def draw_laps(self):
+        # same size/fonts as the last full draw = only the rows are synced
+        key = (self.canvas.winfo_width(), self.canvas.winfo_height(),
+               self.font_scale, self.projector_mode, self.line_width)
+        if key == self._laps_key:
+            self.laps_table_a.sync(self.laps_a)
+            self.laps_table_b.sync(self.laps_b)
+            return
+
         self.canvas.delete("all")
         self.canvas.update_idletasks()
 
         w = self.canvas.winfo_width()
         h = self.canvas.winfo_height()
         mid = w // 2
+        self._laps_key = (w, h, self.font_scale, self.projector_mode, self.line_width)
 
         if self.font_scale == "small":
             title_font = ("Arial", 14, "bold")
@@ -3627,143 +3446,132 @@ class PlayoffApp:
         visible_rows = max(1, int((bottom_y - first_row_y) / row_height) - 1)
 
         # --------------------------------------------------
-        # LEFT TABLE
+        # TABLE ROWS (laps_view.LapsTable)
         # --------------------------------------------------
-        valid_a = [
-            int(r.get("ms", 0))
-            for r in self.laps_a
-            if int(r.get("ms", 0)) >= 10000
-        ]
-
-        best_a = min(valid_a) if valid_a else None
-
-        y = first_row_y
-        for idx, rec in enumerate(self.laps_a[:visible_rows]):
-            row_top = y - row_height // 2
-            row_bottom = row_top + row_height
-            ms = int(rec.get("ms", 0))
-            invalid = ms < 10000
-            best = (best_a is not None and ms == best_a)
-            
-            if invalid:
-                bg = "#ffb3b3"      # red
-            elif best:
-                bg = "#b8ffb8"      # grn
-            elif idx % 2:
-                bg = "#f2f7ff"
-            else:
-                bg = None
-
-            self.canvas.create_rectangle(
-                left_x1 + 1,
-                row_top,
-                left_x2 - 1,
-                row_bottom,
-                fill=bg,
-                outline=""
-            )
-
-            txt = (
-                f"{rec['id']:>3}   "
-                f"{rec['date']}   "
-                f"{rec['time']}   "
-                f"({ms}ms)"
-            )
-
-            self.canvas.create_text(
-                left_x1 + 8,
-                y,
-                anchor="w",
-                text=txt,
-                font=row_font,
-                fill="black"
-            )
-
-            # separator line
-            self.canvas.create_line(
-                left_x1,
-                row_bottom,
-                left_x2,
-                row_bottom,
-                fill="#d8d8d8"
-            )
-
-            y += row_height
-
-        # --------------------------------------------------
-        # RIGHT TABLE
-        # --------------------------------------------------
-        valid_b = [
-            int(r.get("ms", 0))
-            for r in self.laps_b
-            if int(r.get("ms", 0)) >= 10000
-        ]
-
-        best_b = min(valid_b) if valid_b else None
-
-        y = first_row_y
-        for idx, rec in enumerate(self.laps_b[:visible_rows]):
-            row_top = y - row_height // 2
-            row_bottom = row_top + row_height
-            ms = int(rec.get("ms", 0))
-            invalid = ms < 10000
-            best = (best_b is not None and ms == best_b)
-
-            if invalid:
-                bg = "#ffb3b3"      # red
-            elif best:
-                bg = "#b8ffb8"      # grn
-            elif idx % 2:
-                bg = "#f2f7ff"
-            else:
-                bg = None
-
-            self.canvas.create_rectangle(
-                right_x1 + 1,
-                row_top,
-                right_x2 - 1,
-                row_bottom,
-                fill=bg,
-                outline=""
-            )
+        # only the visible window has canvas items, position "1–30 / 4000" in the header
+        info_y = top_y + 5 + header_h / 2
+        self.laps_table_a.place(left_x1, left_x2, first_row_y, row_height, visible_rows, row_font,
+                                info_pos=(left_x2 - 8, info_y, header_font))
+        self.laps_table_a.rebuild(self.laps_a)
+
+        self.laps_table_b.place(right_x1, right_x2, first_row_y, row_height, visible_rows, row_font,
+                                info_pos=(right_x2 - 8, info_y, header_font))
+        self.laps_table_b.rebuild(self.laps_b)
+
+    def on_laps_wheel(self, event, direction):
+        """Scroll the laps table under the mouse pointer."""
+        if self.view_mode != "laps" or self._laps_key is None:
+            return
+        if event.x < self.canvas.winfo_width() // 2:
+            self.laps_table_a.scroll(self.laps_a, direction * LAPS_WHEEL_ROWS)
+        else:
+            self.laps_table_b.scroll(self.laps_b, direction * LAPS_WHEEL_ROWS)
 
-            txt = (
-                f"{rec['id']:>3}   "
-                f"{rec['date']}   "
-                f"{rec['time']}   "
-                f"({ms}ms)"
-            )
+    def find_lap_dialog(self):
+        """Jump to a lap by its ID (záznamy kol nemají tým, hledá se podle ID)."""
+        val = simpledialog.askstring(
+            "Najít kolo",
+            "ID kola (A12, B7, samotné číslo = A):",
+            parent=self.root
+        )
+        if not val or not val.strip():
+            return
+        val = val.strip().upper()
+        table, records, side = self.laps_table_a, self.laps_a, "A"
+        if val[0] in "AB":
+            if val[0] == "B":
+                table, records, side = self.laps_table_b, self.laps_b, "B"
+            val = val[1:].strip()
+        try:
+            lap_id = int(val)
+        except ValueError:
+            messagebox.showerror("Najít kolo", "Neplatné ID kola.")
+            return
+        if self._laps_key is None:
+            self.redraw_now()
+        if not table.jump_to_id(records, lap_id):
+            messagebox.showinfo("Najít kolo", f"Kolo {side}{lap_id} v záznamech není.")
+
+    def show_new_lap(self, table, records):
+        """records[0] was just added: update the laps view in place."""
+        if self.view_mode == "laps" and self._laps_key is not None:
+            with self.perf.timed("laps_insert"):
+                table.insert(records)
+            self._perf_after_render("laps_insert")
+        else:
+            self.redraw()
 
-            self.canvas.create_text(
-                right_x1 + 8,
-                y,
-                anchor="w",
-                text=txt,
-                font=row_font,
-                fill="black"
-            )                
-
-            # separator line
-            self.canvas.create_line(
-                right_x1,
-                row_bottom,
-                right_x2,
-                row_bottom,
-                fill="#d8d8d8"
-            )
+    # --- debug overlay (perf_metrics) ---
+    def toggle_perf_overlay(self, on=None):
+        self.perf_overlay = (not self.perf_overlay) if on is None else on
+        self.perf_overlay_var.set(self.perf_overlay)
+        if self.perf_overlay:
+            self.ticker.start("perf")
+        else:
+            self.ticker.stop("perf")
+            self.canvas.delete("perf_overlay")
 
-            y += row_height
+    def toggle_perf_log(self):
+        if not self.perf_log_var.get():
+            self.perf.stop_log()
+            self.status_var.set("Zápis měření vypnut")
+            return
+        fname = filedialog.asksaveasfilename(
+            defaultextension=".jsonl",
+            initialfile="playoff_metrics.jsonl",
+            filetypes=[("JSON lines", "*.jsonl"), ("Vše", "*.*")]
+        )
+        if not fname:
+            self.perf_log_var.set(False)
+            return
+        try:
+            self.perf.start_log(fname)
+        except OSError as e:
+            self.perf_log_var.set(False)
+            messagebox.showerror("Chyba", str(e))
+            return
+        self.status_var.set(f"Měření se zapisuje do {os.path.basename(fname)}")
+
+    def _perf_after_render(self, name):
+        # canvas item count only when somebody looks at it (find_all is O(n))
+        if self.perf_overlay or self.perf.logging:
+            self.perf.gauge("canvas_items", len(self.canvas.find_all()), after=name)
+        if self.perf_overlay:
+            self.draw_perf_overlay()
+
+    def _perf_tick(self, now=None):
+        self.draw_perf_overlay()
+
+    def draw_perf_overlay(self):
+        """Timings in the top left corner (last / avg / max ms)."""
+        self.canvas.delete("perf_overlay")
+        lines = [f"{'':<12} {'last':>7} {'avg':>7} {'max':>7}"]
+        lines += self.perf.lines()
+        lines.append(f"redraw req/exe {self.redraw_stats['requested']}/{self.redraw_stats['executed']}")
+        if self.usb:
+            tx = self.usb.tx.stats
+            lines.append(f"tx queue max {tx['max_depth']} dropped {tx['dropped']} failed {tx['failed']}")
+        text = self.canvas.create_text(12, 12, anchor="nw", text="\n".join(lines),
+                                       font=("Consolas", 9), fill="#00ff66",
+                                       tags=("perf_overlay",))
+        x1, y1, x2, y2 = self.canvas.bbox(text)
+        bg = self.canvas.create_rectangle(x1 - 6, y1 - 4, x2 + 6, y2 + 4, fill="black",
+                                          outline="", tags=("perf_overlay",))
+        self.canvas.tag_lower(bg, text)
+        self.canvas.tag_raise("perf_overlay")
 
     def clear_laps_a(self):
         if messagebox.askyesno("Potvrzení", "Smazat všechny záznamy A?"):
             self.laps_a.clear()
             self.lap_id_a = 1
+            self.laps_table_a.reset()
             self.redraw()
 
     def clear_laps_b(self):
         if messagebox.askyesno("Potvrzení", "Smazat všechny záznamy B?"):
             self.laps_b.clear()
             self.lap_id_b = 1
+            self.laps_table_b.reset()
             self.redraw()
 
     # --- PDF export ---
@@ -3786,31 +3594,17 @@ class PlayoffApp:
                                              filetypes=[("PDF", "*.pdf")])
         if not fname:
             return
+        export_start = time.perf_counter_ns()
 
-        # --- Geometry as redraw() ---
-        base_rounds = self.bracket.rounds
-        base_titles = self.bracket.titles
-
-        if self.pre_round_enabled and self.bracket.pre_rounds:
-            rounds = self.bracket.pre_rounds + base_rounds
-            titles_list = (
-                self.bracket.pre_titles if self.bracket.pre_titles else ["Předkolo"]
-            ) + base_titles
-            offset = 1
-        else:
-            rounds = base_rounds
-            titles_list = base_titles
-            offset = 0
-
-        rounds_count = len(rounds)
-        last_round = rounds_count - 1
-        final_real_round = last_round - 1
-
-        # canvas size
+        # --- Geometry as redraw() (same cached layout) ---
         canvas_w = self.root.winfo_screenwidth() if self.projector_mode else max(800, self.canvas.winfo_width())
         canvas_h = self.root.winfo_screenheight() if self.projector_mode else max(600, self.canvas.winfo_height())
 
-        # font size
+        lay = self.current_layout(canvas_w, canvas_h)
+        rounds = self.bracket.rounds
+        final_real_round = len(rounds) - 2
+
+        # font size (PDF text only, geometry comes from the layout)
         if self.font_scale == 'large':
             cell_font_size = 28
         elif self.font_scale == 'small':
@@ -3818,256 +3612,72 @@ class PlayoffApp:
         else:
             cell_font_size = 14
 
-        cell_font = tkfont.Font(family="Arial", size=cell_font_size)
-
         title_font_size = (
             33 if self.projector_mode or self.font_scale == 'large'
             else 20 if self.font_scale == 'medium'
             else 12
         )
 
-        # --- column widths ---
-        col_widths = []
-        padding = 20
-        min_w = 60
-        max_w = 220
-
-        for r_idx, matches in enumerate(rounds):
-            if r_idx == last_round:
-                winner_match = rounds[last_round][0]
-                winner_text = winner_match.a.text.strip() or winner_match.b.text.strip() or self.current_winner
-                text_px = cell_font.measure(winner_text)
-                col_widths.append(max(min_w, min(max_w, text_px + padding)))
-                continue
-
-            max_px = 0
-            for m in matches:
-                max_px = max(max_px, cell_font.measure(m.a.text.strip()))
-                max_px = max(max_px, cell_font.measure(m.b.text.strip()))
-            col_widths.append(max(min_w, min(max_w, max_px + padding)))
-
-        # --- indents and spaces ---
-        margin_x = 40
-        margin_y = 40
-        h_gap = 130 # 180
-        v_gap = 10
-
-        # --- wheel height ---
-        box_h = 40
-        per_match_h = box_h * 2 + 8
-        initial_matches = len(rounds[0])
-
-        total_h = initial_matches * per_match_h + (initial_matches - 1) * v_gap + 2 * margin_y
-        if total_h > canvas_h:
-            scale_local = canvas_h / total_h
-            scale_local = max(0.25, scale_local)
-            box_h = int(box_h * scale_local)
-            v_gap = max(3, int(v_gap * scale_local))
-            per_match_h = box_h * 2 + 8
-
-        # --- X column positions ---
-        col_x_positions = []
-        x = margin_x
-        for w in col_widths:
-            col_x_positions.append(x)
-            x += w + h_gap
-
         # --- Geometry for PDF ---
         rects = []
         lines = []
         titles = []
-        semi_losers_centers = []        
-
-        # We will save the ONLY point of the final
-        final_center_x = None
-        final_center_y = None
-
-        # --- Wheel scanning ---
-        for r_idx, matches in enumerate(rounds):
-            col_x = col_x_positions[r_idx]
-            box_w = col_widths[r_idx]
-
-            # titles
-            titles.append((col_x + box_w / 2, margin_y - 10,
-                           titles_list[r_idx], title_font_size))
-
-            matches_count = len(matches)
-            total_col_h = matches_count * (box_h * 2 + 8) + (matches_count - 1) * v_gap
-            start_y = max(margin_y + title_font_size + 10,
-                          (canvas_h - total_col_h) // 2)
-
-            for m_idx, match in enumerate(matches):
-
-                # skip the WINNERS round (to be drawn later)
-                if r_idx == last_round and len(matches) == 1:
-                    continue
 
-                top_y = start_y + m_idx * ((box_h * 2 + 8) + v_gap)
-
-                # A box
-                a_x1 = col_x
-                a_y1 = top_y
-                a_x2 = a_x1 + box_w
-                a_y2 = a_y1 + box_h
-
-                # B box
-                b_x1 = col_x
-                b_y1 = a_y2 + 8
-                b_x2 = b_x1 + box_w
-                b_y2 = b_y1 + box_h
-
-                # winner/highlight
-                is_winner_a = (match.a.text.strip() == self.current_winner.strip())
-                is_winner_b = (match.b.text.strip() == self.current_winner.strip())
-
-                fill_a = WINNER_FILL if is_winner_a else BOX_FILL
-                fill_b = WINNER_FILL if is_winner_b else BOX_FILL
-                outline_a = WINNER_OUTLINE if is_winner_a else BOX_OUTLINE
-                outline_b = WINNER_OUTLINE if is_winner_b else BOX_OUTLINE
-
-                rects.append((a_x1, a_y1, a_x2, a_y2,
-                              self.line_width, fill_a, outline_a,
-                              match.a.text, cell_font_size, False))
-                rects.append((b_x1, b_y1, b_x2, b_y2,
-                              self.line_width, fill_b, outline_b,
-                              match.b.text, cell_font_size, False))
-
-                # connection to the next round
-                if (r_idx + 1 < rounds_count) and (r_idx != final_real_round) and (r_idx >= offset):                   
-                    cx = a_x2
-                    cy = (a_y1 + b_y2) / 2
-
-                    next_col_x = col_x_positions[r_idx + 1]
-                    next_idx = m_idx // 2
-                    nm = len(rounds[r_idx + 1])
-                    total_h_next = nm * (box_h * 2 + 8) + (nm - 1) * v_gap
-                    start_y_next = max(margin_y + title_font_size + 10,
-                                       (canvas_h - total_h_next) // 2)
-                    ny = start_y_next + next_idx * ((box_h * 2 + 8) + v_gap) + box_h
-
-                    lines.append((cx, cy, next_col_x, ny,
-                                  self.line_width, LINE_COLOR))
-
-                # --- THE ONLY center of the finals ---
-                if r_idx == final_real_round and final_center_x is None:
-                    final_center_x = a_x2
-                    final_center_y = (a_y1 + b_y2) / 2
-
-                if r_idx == last_round - 2:
-                    final_match = rounds[last_round - 1][0]
-
-                    if m_idx == 0:
-                        finalist = final_match.a.text.strip()
-                    else:
-                        finalist = final_match.b.text.strip()
-
-                    # A slot
-                    if match.a.text.strip() and match.a.text.strip() != finalist:
-                        semi_losers_centers.append((
-                            a_x2,
-                            (a_y1 + a_y2) / 2
-                        ))
-
-                    # B slot
-                    if match.b.text.strip() and match.b.text.strip() != finalist:
-                        semi_losers_centers.append((
-                            b_x2,
-                            (b_y1 + b_y2) / 2
-                        ))
+        def add_match(match, x1, y1, x2, y2):
+            # winner/highlight
+            for slot, (bx1, by1, bx2, by2) in zip((match.a, match.b), lay.side_boxes(x1, y1, x2, y2)):
+                is_winner = (slot.text.strip() == self.current_winner.strip())
+                rects.append((bx1, by1, bx2, by2,
+                              self.line_width,
+                              WINNER_FILL if is_winner else BOX_FILL,
+                              WINNER_OUTLINE if is_winner else BOX_OUTLINE,
+                              slot.text, cell_font_size, False))
+
+        # pre round
+        if lay.pre_title:
+            tx, ty, _ = lay.pre_title
+            pre_title = self.bracket.pre_titles[0] if self.bracket.pre_titles else "Předkolo"
+            titles.append((tx, ty, pre_title, title_font_size))
+            for m_idx, x1, y1, x2, y2 in lay.pre_matches:
+                add_match(self.bracket.pre_rounds[0][m_idx], x1, y1, x2, y2)
+
+        for r_idx, (tx, ty, _) in enumerate(lay.titles):
+            titles.append((tx, ty, self.bracket.titles[r_idx], title_font_size))
+
+        for r_idx, m_idx, x1, y1, x2, y2 in lay.matches:
+            add_match(rounds[r_idx][m_idx], x1, y1, x2, y2)
+
+        # connection to the next round (the final has its own line to the winner)
+        for r_idx, m_idx, x1, y1, x2, y2 in lay.links:
+            if r_idx != final_real_round:
+                lines.append((x1, y1, x2, y2, self.line_width, LINE_COLOR))
 
         # --- Drawing of the winner ---
-        winner_match = rounds[last_round][0]
-        winner_text = (winner_match.a.text.strip()
-                       or winner_match.b.text.strip()
-                       or self.current_winner)
-
-        text_width = cell_font.measure(winner_text)
-        win_w = max(text_width + 60, col_widths[last_round] + 40)
-        win_h = box_h * 2
-
-        col_x = col_x_positions[last_round]
-        win_x_center = col_x + col_widths[last_round] / 2
-
-        win_x1 = win_x_center - win_w / 2
-        win_x2 = win_x_center + win_w / 2
-        win_y1 = (canvas_h // 2) - win_h // 2
-        win_y2 = win_y1 + win_h
-
+        win_x1, win_y1, win_x2, win_y2 = lay.winner
         rects.append((win_x1, win_y1, win_x2, win_y2,
                       self.line_width + 1, BOX_FILL, BOX_OUTLINE,
-                      winner_text, cell_font_size * 2, True))
+                      lay.winner_text, cell_font_size * 2, True))
 
         # --- ONE line from the final → winner ---
-        if final_center_x is not None:
+        if lay.final_centers:
+            final_center_x, final_center_y = lay.final_centers[0]
             lines.append((final_center_x, final_center_y,
                           win_x1, (win_y1 + win_y2) / 2,
                           self.line_width, LINE_COLOR))
 
         # 3. place winner
-        if self.third_place_enabled:
-
-            semi_col_index = final_real_round
-            base_x = col_x_positions[semi_col_index]
-
-            third_offset_y = 100
-            base_y = win_y2 + third_offset_y
-
-            box_w = col_widths[final_real_round]
-            box_h_small = box_h
-            gap = 6
-
-            a_y1 = base_y
-            b_y1 = a_y1 + box_h_small + gap
-
-            rects.append((base_x, a_y1, base_x + box_w, a_y1 + box_h_small,
-                          self.line_width, BOX_FILL, BOX_OUTLINE,
+        if lay.third:
+            tp = lay.third
+            rects.append((*tp["a"], self.line_width, BOX_FILL, BOX_OUTLINE,
                           self.third_place["a"], cell_font_size, False))
-
-            rects.append((base_x, b_y1, base_x + box_w, b_y1 + box_h_small,
-                          self.line_width, BOX_FILL, BOX_OUTLINE,
+            rects.append((*tp["b"], self.line_width, BOX_FILL, BOX_OUTLINE,
                           self.third_place["b"], cell_font_size, False))
+            rects.append((*tp["winner"], self.line_width, BOX_FILL, BOX_OUTLINE,
+                          self.third_place["winner"], cell_font_size * 2, True))
 
-            winner_tp = self.third_place["winner"]
-            text_width_tp = cell_font.measure(winner_tp) if winner_tp else 0
-
-            winner_w = max(text_width_tp + 60, col_widths[last_round] + 40)
-            winner_h = box_h * 2
-
-            win3_x = win_x1
-            win3_y = a_y1
-
-            rects.append((win3_x, win3_y, win3_x + winner_w, win3_y + winner_h,
-                          self.line_width, BOX_FILL, BOX_OUTLINE,
-                          winner_tp, cell_font_size * 2, True))
-
-            lines.append((
-                base_x + box_w,
-                a_y1 + box_h_small,
-                win3_x,
-                win3_y + winner_h / 2,
-                self.line_width,
-                THIRD_PLACE_LINE_COLOR
-            ))
-
-            if len(semi_losers_centers) >= 2:
-                p1 = semi_losers_centers[0]
-                p2 = semi_losers_centers[1]
-
-                lines.append((
-                    p1[0], p1[1],
-                    base_x,
-                    a_y1 + box_h_small / 2,
-                    self.line_width,
-                    THIRD_PLACE_LINE_COLOR
-                ))
-
-                lines.append((
-                    p2[0], p2[1],
-                    base_x,
-                    b_y1 + box_h_small / 2,
-                    self.line_width,
-                    THIRD_PLACE_LINE_COLOR
-                ))            
+            lines.append((*tp["link"], self.line_width, THIRD_PLACE_LINE_COLOR))
+            for coords in tp["semi_links"]:
+                lines.append((*coords, self.line_width, THIRD_PLACE_LINE_COLOR))
 
         # --- Bounding box calculation ---
         minx, miny = float('inf'), float('inf')
@@ -4245,6 +3855,7 @@ class PlayoffApp:
         # --- Save PDF ---
         try:
             pdf.save()
+            self.perf.record_since("export_pdf", export_start)
             messagebox.showinfo("Hotovo", f"PDF uložen: {fname}")
         except Exception as e:
             messagebox.showerror("Chyba", str(e))
@@ -15,6 +15,17 @@ a = Analysis(
         ('playoff.ico', '.'),     # IKONA aplikace
         ('settings.ico', '.'),    # IKONA nastavení
         ('usb_module.py', '.'),   # USB modul
+        ('bracket_core.py', '.'), # pavouk (data)
+        ('canvas_pool.py', '.'),  # canvas (kreslení)
+        ('background.py', '.'),   # pozadí (cache)
+        ('text_measure.py', '.'), # šířky textu (cache)
+        ('bracket_layout.py', '.'), # geometrie pavouka
+        ('laps_view.py', '.'),    # tabulka kol
+        ('perf_metrics.py', '.'), # měření výkonu (F12)
+        ('lap_clock.py', '.'),    # čas kola (monotónní)
+        ('ticker.py', '.'),       # jeden after() pro všechny hodiny
+        ('countdown.py', '.'),    # odpočet (deadline)
+        ('serial_loop.py', '.'),  # asyncio smyčka pro USB porty
         ('DejaVuSans.ttf', '.'),   # PDF font
     ],
     hiddenimports=['PIL', 'PIL.Image', 'serial'],
@@ -0,0 +1,444 @@
+#!/usr/bin/env python
+# serial_loop.py
+# -*- coding: utf-8 -*-
+# One asyncio event loop on one background thread for all serial ports
+# (gate, LED panels A/B, future lanes). Readers and writers are coroutines
+# on that loop, so a command is a task, not a new thread, and the writes to
+# a port are serialized by the loop instead of a lock. WriteQueue is the
+# bounded priority queue for all port writes, TkBridge brings results back
+# to the Tk thread. No Tk import, the root is passed in.
+# test: python test_serial_loop.py
+__author__ = 'Martin Pihrt'
+
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from queue import Empty, SimpleQueue
+
+TK_READABLE = 2         # tkinter.READABLE (createfilehandler mask)
+
+# WriteQueue priorities, lower = written first
+PRIO_START = 0          # start / finish: the race clock
+PRIO_COMMAND = 1        # mode_laps, ts_on, ...
+PRIO_DISPLAY = 2        # LED panel text
+PRIO_NAMES = {PRIO_START: "start", PRIO_COMMAND: "command", PRIO_DISPLAY: "display"}
+QUEUE_SIZE = 64
+
+
+class SerialLoop:
+    """Background thread running one asyncio loop.
+
+        io = SerialLoop(); io.start()
+        fut = io.submit(coro)       # concurrent.futures.Future, any thread
+        io.call(func, arg)          # plain function on the loop thread
+        io.stop()
+    """
+
+    def __init__(self, name="serial-loop"):
+        self.name = name
+        self.loop = None
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.loop is not None and self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self.loop = loop
+            ready.set()
+            try:
+                loop.run_forever()
+                # stop(): cancel readers / writers still waiting
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                if tasks:
+                    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            finally:
+                loop.close()
+
+        self.thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self.thread.start()
+        ready.wait()
+
+    def in_loop(self):
+        return threading.current_thread() is self.thread
+
+    def submit(self, coro):
+        """Run coro on the loop, returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, func, *args):
+        self.loop.call_soon_threadsafe(func, *args)
+
+    def stop(self, timeout=2.0):
+        loop, thread = self.loop, self.thread
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(loop.stop)
+        except RuntimeError:
+            pass                        # already closed
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.loop = None
+        self.thread = None
+
+
+def port_fileno(ser):
+    """Descriptor of a pyserial port for loop.add_reader(), None = not usable.
+
+    POSIX ports (Linux, macOS) have one; Windows ports and test fakes do
+    not, they are read with a blocking read() in the loop's executor.
+    """
+    if os.name != "posix":
+        return None
+    try:
+        fd = ser.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+    return fd if isinstance(fd, int) and fd >= 0 else None
+
+
+async def watch_port(ser, on_chunk):
+    """Call on_chunk(bytes, rx_ns) for data from ser until cancelled.
+
+    fd based (select/epoll via loop.add_reader) where possible, so no
+    thread waits for the port; rx_ns = perf_counter_ns() on arrival.
+    Read errors (port unplugged) are raised to the caller.
+    """
+    loop = asyncio.get_running_loop()
+    fd = port_fileno(ser)
+    if fd is not None:
+        failed = loop.create_future()
+
+        def on_readable():
+            rx_ns = time.perf_counter_ns()
+            try:
+                chunk = ser.read(ser.in_waiting or 1)
+            except Exception as e:
+                loop.remove_reader(fd)
+                if not failed.done():
+                    failed.set_exception(e)
+                return
+            if chunk:
+                on_chunk(chunk, rx_ns)
+
+        try:
+            loop.add_reader(fd, on_readable)
+        except NotImplementedError:
+            fd = None                   # loop without add_reader
+        else:
+            try:
+                await failed
+            finally:
+                loop.remove_reader(fd)
+            return
+
+    # blocking read with the port timeout in the default executor
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, ser.read, 1)
+            if not chunk:
+                continue
+            rx_ns = time.perf_counter_ns()
+            waiting = ser.in_waiting
+            if waiting:
+                chunk += ser.read(waiting)
+            on_chunk(chunk, rx_ns)
+    finally:
+        try:
+            ser.cancel_read()           # free the executor thread
+        except Exception:
+            pass
+
+
+class WriteQueue:
+    """Bounded priority queue of port writes, serviced by one writer task.
+
+        tx = WriteQueue(io)
+        tx.add_port("gate", get_port, connect)
+        tx.add_port(1, get_panel, connect_panel, coalesce=True, pace=pace)
+        fut = tx.put("gate", b"start\n", PRIO_START)   # any thread
+
+    put() never blocks the caller; the Future is True once the bytes are
+    handed to the port (no flush(), tcdrain would stop the loop), or
+    fails with RuntimeError (queue full, port not connected) or the
+    write error. Equal priorities are written in put() order.
+
+    A port that is not open is connected by connect() (a coroutine
+    function returning the port or None) in its own task; its writes
+    wait for it without holding up the other ports. When the queue is
+    full the lowest priority newest write is dropped, so display text
+    never pushes out a start.
+
+    coalesce=True (latest value wins, LED panels): a port keeps at most
+    one pending write, a newer put() replaces it and the replaced Future
+    is False; a put() equal to what was last written to the same port
+    object is True at once, nothing is sent. pace(payload) -> seconds
+    the device needs for a write; the next one waits for it, so with
+    coalescing a panel is at most one message behind.
+
+    stats: queued / written / dropped / failed / coalesced / unchanged
+    counts, depth, max_depth; with perf (PerfMetrics) also the
+    "tx_queue" depth gauge and the put -> written latency per priority
+    ("tx_start", "tx_display", ...).
+    """
+
+    def __init__(self, io, maxsize=QUEUE_SIZE, perf=None, clock=time.perf_counter_ns):
+        self.io = io
+        self.maxsize = maxsize
+        self.perf = perf
+        self.clock = clock
+        self.ports = {}             # key -> (get_port, connect, on_error, coalesce, pace)
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0,
+                      "coalesced": 0, "unchanged": 0, "depth": 0, "max_depth": 0}
+        self._seq = itertools.count()
+        self._heap = []             # (prio, seq, key, payload, future, put_ns)
+        self._parked = {}           # key -> writes waiting for connect() / pace
+        self._last = {}             # key -> (port, payload) last written, coalesce
+        self._busy_until = {}       # key -> loop.time() the device is free, pace
+        self._ready = None          # asyncio.Event, created on the loop
+        self._writer = None
+
+    def add_port(self, key, get_port, connect, on_error=None, coalesce=False, pace=None):
+        """get_port() -> open port or None; on_error(key, exc) after a failed write."""
+        self.ports[key] = (get_port, connect, on_error, coalesce, pace)
+
+    def put(self, key, payload, prio=PRIO_DISPLAY):
+        fut = concurrent.futures.Future()
+        item = (prio, next(self._seq), key, payload, fut, self.clock())
+        self.io.start()
+        self.io.call(self._enqueue, item)
+        return fut
+
+    # --- loop thread ---
+    def _items(self):
+        return self._heap + [i for p in self._parked.values() for i in p]
+
+    def _depth(self):
+        return len(self._heap) + sum(len(p) for p in self._parked.values())
+
+    def _remove(self, item):
+        parked = self._parked.get(item[2], ())
+        if item in parked:
+            parked.remove(item)
+        else:
+            self._heap.remove(item)
+            heapq.heapify(self._heap)
+
+    def _enqueue(self, item):
+        key, payload = item[2], item[3]
+        get_port, _, _, coalesce, _ = self.ports[key]
+        if coalesce:
+            pending = [i for i in self._items() if i[2] == key]
+            for old in pending:
+                self._remove(old)
+                self._done(old, False, "coalesced")
+            if not pending and self._last.get(key) == (get_port(), payload):
+                self._done(item, True, "unchanged")
+                return
+        if self._depth() >= self.maxsize:
+            worst = max(self._items())
+            if worst[:2] < item[:2]:
+                self._fail(item, RuntimeError("write queue full"), "dropped")
+                return
+            self._remove(worst)
+            self._fail(worst, RuntimeError("write queue full"), "dropped")
+        heapq.heappush(self._heap, item)
+        self.stats["queued"] += 1
+        self._gauge()
+        if self._writer is None or self._writer.done():
+            self._ready = asyncio.Event()
+            self._writer = asyncio.get_running_loop().create_task(self._run())
+        self._ready.set()
+
+    def _gauge(self):
+        depth = self.stats["depth"] = self._depth()
+        if depth > self.stats["max_depth"]:
+            self.stats["max_depth"] = depth
+        if self.perf is not None:
+            self.perf.gauge("tx_queue", depth)
+
+    def _done(self, item, result, stat):
+        self.stats[stat] += 1
+        fut = item[4]
+        if fut.set_running_or_notify_cancel():
+            fut.set_result(result)
+
+    def _fail(self, item, exc, stat="failed"):
+        self.stats[stat] += 1
+        fut = item[4]
+        if fut.set_running_or_notify_cancel():
+            fut.set_exception(exc)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._heap:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            item = heapq.heappop(self._heap)
+            prio, _, key, payload, fut, put_ns = item
+            get_port, connect, on_error, coalesce, pace = self.ports[key]
+            ser = get_port()
+            if ser is None or not ser.is_open:
+                self._park(item, lambda: loop.create_task(self._connect(key, connect)))
+                continue
+            until = self._busy_until.get(key, 0.0)
+            if pace is not None and until > loop.time():
+                # the device is still busy with the previous write
+                self._park(item, lambda: loop.call_at(until, self._unpark, key))
+                continue
+            if not fut.set_running_or_notify_cancel():
+                self._gauge()               # cancelled by the caller
+                continue
+            try:
+                ser.write(payload)
+            except Exception as e:
+                self.stats["failed"] += 1
+                self._last.pop(key, None)
+                fut.set_exception(e)
+                if on_error is not None:
+                    on_error(key, e)
+            else:
+                self.stats["written"] += 1
+                if coalesce:
+                    self._last[key] = (ser, payload)
+                if pace is not None:
+                    self._busy_until[key] = loop.time() + pace(payload)
+                if self.perf is not None:
+                    self.perf.record(f"tx_{PRIO_NAMES.get(prio, prio)}",
+                                     (self.clock() - put_ns) / 1e6, port=str(key))
+                fut.set_result(True)
+            self._gauge()
+            await asyncio.sleep(0)          # the readers run between writes
+
+    def _park(self, item, release):
+        # wait for release() (connect task / pace timer) to _unpark the key
+        key = item[2]
+        parked = self._parked.get(key)
+        if parked is not None:
+            parked.append(item)             # release already pending
+            return
+        self._parked[key] = [item]
+        release()
+
+    def _unpark(self, key):
+        for item in self._parked.pop(key, []):
+            heapq.heappush(self._heap, item)
+        if self._ready is not None:
+            self._ready.set()
+
+    async def _connect(self, key, connect):
+        error = None
+        try:
+            ser = await connect()
+        except Exception as e:
+            ser, error = None, e
+        if ser is None or not ser.is_open:
+            error = error or RuntimeError(f"port {key} not connected")
+            for item in self._parked.pop(key, []):
+                self._fail(item, error)
+            self._gauge()
+            return
+        self._unpark(key)
+
+    def fail_pending(self, exc):
+        """Fail every queued write (ports closing); loop thread."""
+        items = self._items()
+        self._heap = []
+        self._parked.clear()
+        self._last.clear()
+        for item in items:
+            self._fail(item, exc)
+        self._gauge()
+
+
+class TkBridge:
+    """Queue of calls from other threads, run on the Tk thread.
+
+    post() never calls Tk from the calling thread when a pipe +
+    createfilehandler wake-up is available (Linux, macOS); otherwise one
+    root.after(0) per batch wakes the Tk loop. All queued calls run in
+    one batch, in order.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.queue = SimpleQueue()
+        self._lock = threading.Lock()
+        self._pending = False           # wake-up sent, batch not run yet
+        self._wake_r = self._wake_w = None
+        self.stats = {"posted": 0, "batches": 0}
+        try:
+            r, w = os.pipe()
+            os.set_blocking(r, False)
+            os.set_blocking(w, False)
+            root.tk.createfilehandler(r, TK_READABLE, self._on_pipe)
+            self._wake_r, self._wake_w = r, w
+        except (AttributeError, OSError):
+            pass                        # Windows Tk: no file handlers
+
+    def post(self, func, *args):
+        self.queue.put((func, args))
+        self.stats["posted"] += 1
+        with self._lock:
+            if self._pending:
+                return
+            self._pending = True
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+                return
+            except OSError:
+                pass
+        self.root.after(0, self.run_pending)
+
+    def _on_pipe(self, fd, mask):
+        try:
+            os.read(fd, 512)
+        except OSError:
+            pass
+        self.run_pending()
+
+    def run_pending(self):
+        with self._lock:
+            self._pending = False
+        self.stats["batches"] += 1
+        while True:
+            try:
+                func, args = self.queue.get_nowait()
+            except Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"[serial_loop] Tk call error {e!r}", file=sys.stderr)
+
+    def close(self):
+        if self._wake_r is None:
+            return
+        try:
+            self.root.tk.deletefilehandler(self._wake_r)
+        except Exception:
+            pass
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._wake_r = self._wake_w = None
@@ -0,0 +1,107 @@
+# test_background.py – testy pro background (zmenšené načtení, cache pozadí)
+# run: python test_background.py  (nebo pytest), potřebuje Pillow
+import os
+import tempfile
+import threading
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from background import BackgroundScaler, load_background
+
+
+def make_file(size, fmt, suffix):
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    Image.new('RGB', size, (200, 40, 40)).save(path, fmt)
+    return path
+
+
+def test_load_reduces_large_jpeg_and_png():
+    for fmt, suffix in (('JPEG', '.jpg'), ('PNG', '.png')):
+        path = make_file((3840, 2160), fmt, suffix)
+        try:
+            img = load_background(path, (1280, 720))
+        finally:
+            os.remove(path)
+        assert img.mode == 'RGBA'
+        assert img.size[0] >= 1280 and img.size[1] >= 720
+        assert img.size[0] < 3840
+
+
+def test_small_image_kept():
+    path = make_file((320, 200), 'PNG', '.png')
+    try:
+        assert load_background(path, (1920, 1080)).size == (320, 200)
+    finally:
+        os.remove(path)
+
+
+def test_cache_per_size():
+    src = Image.new('RGBA', (800, 600))
+    scaler = BackgroundScaler()
+    done = threading.Event()
+
+    assert scaler.get(src, (400, 300)) is None
+    assert scaler.preview(src, (400, 300)).size == (400, 300)
+    scaler.request(src, (400, 300), done.set)
+    assert done.wait(5)
+    scaler.wait(5)
+
+    img = scaler.get(src, (400, 300))
+    assert img is not None and img.size == (400, 300)
+    assert scaler.get(src, (400, 300)) is img
+    assert scaler.stats["resampled"] == 1
+
+    # new source image drops the cache
+    assert scaler.get(Image.new('RGBA', (800, 600)), (400, 300)) is None
+
+
+def test_same_size_resampled_once():
+    src = Image.new('RGBA', (1600, 1200))
+    scaler = BackgroundScaler()
+    done = []
+    # redraws while the worker is busy ask for the same size again
+    for _ in range(5):
+        scaler.request(src, (800, 600), lambda: done.append(1))
+    scaler.wait(5)
+    scaler.request(src, (800, 600), lambda: done.append(2))     # cached
+    scaler.wait(5)
+    assert scaler.stats["resampled"] == 1
+    assert done == [1]
+
+
+def test_on_done_error_keeps_worker_alive():
+    src = Image.new('RGBA', (200, 100))
+    scaler = BackgroundScaler()
+
+    def fail():
+        raise RuntimeError("Tk gone")
+    scaler.request(src, (100, 50), fail)
+    scaler.wait(5)
+    assert scaler.worker is None
+    done = threading.Event()
+    scaler.request(src, (150, 75), done.set)
+    assert done.wait(5)
+    assert scaler.get(src, (150, 75)) is not None
+
+
+def test_cache_limit():
+    src = Image.new('RGBA', (200, 100))
+    scaler = BackgroundScaler(cache_sizes=2)
+    for w in (50, 60, 70):
+        scaler.request(src, (w, 40))
+        scaler.wait(5)
+    assert scaler.get(src, (50, 40)) is None
+    assert scaler.get(src, (70, 40)) is not None
+
+
+if __name__ == "__main__":
+    test_load_reduces_large_jpeg_and_png()
+    test_small_image_kept()
+    test_cache_per_size()
+    test_same_size_resampled_once()
+    test_on_done_error_keeps_worker_alive()
+    test_cache_limit()
+    print("OK")
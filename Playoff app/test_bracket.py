@@ -0,0 +1,167 @@
+# test_bracket.py – testy pro bracket_core (BYE, index týmů, setup soubor)
+# run: python test_bracket.py  (nebo pytest)
+import random
+
+from bracket_core import Bracket, bracket_to_setup, bracket_from_setup
+
+
+def random_bracket(rng, n):
+    teams = [str(i + 1) if rng.random() < 0.7 else "" for i in range(n)]
+    return Bracket(teams, [])
+
+
+def oracle_byes(slots, team_count):
+    """Reference BYE scan written from the definition, not from Bracket:
+    a match exists when one of its sides can get a team, a team whose
+    opponent side can never get one goes on."""
+    first = len(slots) // 2
+    slots = list(slots)
+
+    def exists(index):
+        if index >= first:
+            return index - first < team_count
+        return exists(2 * index) or exists(2 * index + 1)
+
+    for h in range(first - 1, 0, -1):
+        a, b = slots[2 * h].strip(), slots[2 * h + 1].strip()
+        if a and not b and not exists(2 * h + 1):
+            slots[h] = a
+        elif b and not a and not exists(2 * h):
+            slots[h] = b
+    return slots
+
+
+def test_propagate_matches_full_scan():
+    rng = random.Random(1234)
+    for _ in range(200):
+        n = rng.randint(1, 80)
+        b = random_bracket(rng, n)
+        b.resolve_byes()
+
+        for _ in range(20):
+            # random edit anywhere in the real bracket (incl. later rounds)
+            r = rng.randrange(b.depth)
+            m = rng.randrange(b.match_counts[r])
+            side = rng.choice("ab")
+            text = rng.choice(["", "", str(rng.randint(1, 99)), " x "])
+            index = b.slot_index(r, m, side)
+
+            ref = list(b.slots)
+            ref[index] = text
+
+            b.set_text(index, text, auto_bye=True)
+            assert b.slots == oracle_byes(ref, n), (n, r, m, side, text)
+
+
+def test_resolve_byes_matches_oracle():
+    rng = random.Random(5)
+    for _ in range(200):
+        n = rng.randint(1, 80)
+        b = random_bracket(rng, n)
+        expected = oracle_byes(b.slots, n)
+        b.resolve_byes()
+        assert b.slots == expected, n
+
+
+def test_propagate_touches_only_path():
+    b = Bracket([str(i + 1) for i in range(1024)], [])
+    b.resolve_byes()
+    index = b.slot_index(0, 5, 'b')
+    changed = b.set_text(index, "", auto_bye=True)
+    # the edited slot plus at most one slot per round above it
+    assert changed[0] == index
+    assert len(changed) <= b.depth + 1
+    # "11" waits for its opponent, no BYE up to the winner box
+    assert b.rounds[1][2].b.text == ""
+    assert b.rounds[b.depth - 1][0].a.text == b.rounds[b.depth - 1][0].b.text == ""
+    assert b.slots[1] == ""
+
+
+def test_no_bye_against_unplayed_match():
+    b = Bracket([str(i + 1) for i in range(8)], [])
+    changed = b.promote(b.slot_index(0, 0, 'a'), auto_bye=True)
+    assert changed == [b.slot_index(1, 0, 'a')]
+    assert b.slots[1] == ""
+
+
+def test_bye_against_padding():
+    # 7 teams: team 7 has no opponent, goes to round 2 and waits there
+    b = Bracket([str(i + 1) for i in range(6)] + [""], [])
+    index = b.slot_index(0, 3, 'a')
+    assert b.is_padding(b.slot_index(0, 3, 'b'))
+    changed = b.set_text(index, "7", auto_bye=True)
+    assert changed == [index, b.slot_index(1, 1, 'b')]
+    # 5 teams: match 2 of round 2 has no second side, its team goes to the final
+    b = Bracket([str(i + 1) for i in range(5)], [])
+    assert b.match_counts == [3, 2, 1]
+    b.promote(b.slot_index(0, 2, 'a'), auto_bye=True)
+    assert b.rounds[2][0].b.text == "5"
+    assert b.slots[1] == ""
+
+
+def test_team_index_matches_scan():
+    rng = random.Random(99)
+    b = random_bracket(rng, 300)
+    b.resolve_byes()
+    for _ in range(500):
+        r = rng.randrange(b.depth)
+        m = rng.randrange(b.match_counts[r])
+        b.set_text(b.slot_index(r, m, rng.choice("ab")), str(rng.randint(1, 40)), auto_bye=True)
+
+    for team in map(str, range(1, 41)):
+        expected = [
+            (r, m, side)
+            for r, matches in enumerate(b.rounds)
+            for m, match in enumerate(matches)
+            for side, slot in (('a', match.a), ('b', match.b))
+            if slot.text.strip() == team
+        ]
+        assert sorted(b.positions(team)) == sorted(expected)
+        assert b.furthest_round(team) == max((p[0] for p in expected), default=-1)
+
+
+def test_round_versions_track_writes():
+    b = Bracket([str(i) for i in range(1, 20)], [])
+    for i in range(len(b.slots)):
+        assert b.slot_round(i) == b.slot_position(i)[0]
+
+    before = list(b.round_versions)
+    index = b.slot_index(1, 2, 'b')
+    b.set_text(index, "7")
+    changed = [r for r, (old, new) in enumerate(zip(before, b.round_versions)) if old != new]
+    assert changed == [1]
+
+    b.set_text(index, "7")   # same text, no write
+    assert b.round_versions[1] == before[1] + 1
+
+
+def test_setup_round_trip():
+    rng = random.Random(7)
+    b = random_bracket(rng, 37)
+    b.resolve_byes()
+    b.promote(b.slot_index(b.depth - 1, 0, 'a'))
+    b.titles[0] = "Kvalifikace"
+    b.pre_rounds = []
+    b._build_pre([""] * 37)
+    b.pre_rounds[0][3].b.text = "P7"
+
+    data = bracket_to_setup(b)
+    loaded = bracket_from_setup(data)
+
+    assert loaded.slots == b.slots
+    assert loaded.titles == b.titles
+    assert loaded.pre_rounds[0][3].b.text == "P7"
+    assert loaded.positions(b.slots[1]) == b.positions(b.slots[1])
+    assert bracket_to_setup(loaded) == data
+
+
+if __name__ == "__main__":
+    test_propagate_matches_full_scan()
+    test_resolve_byes_matches_oracle()
+    test_propagate_touches_only_path()
+    test_no_bye_against_unplayed_match()
+    test_bye_against_padding()
+    test_team_index_matches_scan()
+    test_round_versions_track_writes()
+    test_setup_round_trip()
+    print("OK")
@@ -0,0 +1,134 @@
+# test_bracket_layout.py – testy pro bracket_layout (geometrie pavouka, bez Tk)
+# run: python test_bracket_layout.py  (nebo pytest)
+from bracket_core import Bracket
+from bracket_layout import (compute_layout, column_widths, LayoutCache,
+                            BOX_H, COL_MIN_W, COL_MAX_W, H_GAP, MARGIN_X)
+from text_measure import TextMeasure, RoundWidths
+
+
+class FakeFont:
+    def __init__(self, family, size):
+        self.size = size
+
+    def measure(self, text):
+        return len(text) * self.size // 2
+
+
+def font(size=14):
+    return TextMeasure(FakeFont).font("Arial", size)
+
+
+def teams(n):
+    return [f"Team {i + 1}" for i in range(n)]
+
+
+def test_boxes_and_links():
+    b = Bracket(teams(13), [])
+    lay = compute_layout(b, 1920, 1080, font(), 11)
+
+    assert len(lay.matches) == sum(b.match_counts)
+    assert len(lay.links) == len(lay.matches)       # final links to Vítěz column
+    assert len(lay.titles) == b.rounds_count()
+    boxes = {(r, m): (x1, y1, x2, y2) for r, m, x1, y1, x2, y2 in lay.matches}
+
+    for r, m, x1, y1, x2, y2 in lay.links:
+        assert (x1, y1) == (boxes[r, m][2], (boxes[r, m][1] + boxes[r, m][3]) / 2)
+        if (r + 1, m // 2) in boxes:
+            parent = boxes[r + 1, m // 2]
+            assert x2 == parent[0]
+            assert y2 == parent[1] + lay.box_h      # middle of the parent match
+
+    # columns left to right, widths in limits
+    for w in lay.col_widths:
+        assert COL_MIN_W <= w <= COL_MAX_W
+    assert lay.col_x[0] == MARGIN_X
+    assert lay.col_x[1] == MARGIN_X + lay.col_widths[0] + H_GAP
+
+
+def test_scale_clamped_for_large_bracket():
+    b = Bracket(teams(512), [])
+    lay = compute_layout(b, 1920, 600, font(), 11)
+    assert lay.box_h == int(BOX_H * 0.25)
+    assert lay.v_gap == 3
+
+
+def test_pre_round_column_and_third_place():
+    b = Bracket(teams(8), [""] * 6, use_pre_round=True)
+    # play semifinals: 1 and 5 into the final, 3 and 7 lose
+    for src in (b.slot_index(0, 0, 'a'), b.slot_index(0, 1, 'a'),
+                b.slot_index(0, 2, 'a'), b.slot_index(0, 3, 'a'),
+                b.slot_index(1, 0, 'a'), b.slot_index(1, 1, 'a')):
+        b.promote(src)
+
+    lay = compute_layout(b, 1920, 1080, font(), 11, pre_round=True, third_place_winner="")
+    assert lay.offset == 1
+    assert len(lay.pre_matches) == 3
+    assert lay.col_x[1] == MARGIN_X + lay.col_widths[0] + H_GAP
+    assert len(lay.semi_losers_centers) == 2
+    assert len(lay.third["semi_links"]) == 2
+    assert lay.third["winner"][0] == lay.winner[0]
+
+    plain = compute_layout(b, 1920, 1080, font(), 11)
+    assert plain.offset == 0 and plain.third is None
+
+
+def test_round_widths_only_changed_rounds():
+    b = Bracket(teams(16), [])
+    f = font()
+    rw = RoundWidths()
+    column_widths(b, f, round_widths=rw)
+    assert rw.stats["computed"] == b.rounds_count()
+
+    b.set_text(b.slot_index(1, 0, 'a'), "Very long team name")
+    column_widths(b, f, round_widths=rw)
+    assert rw.stats["computed"] == b.rounds_count() + 1
+
+
+def test_hit_index_finds_every_slot():
+    b = Bracket(teams(37), [""] * 10, use_pre_round=True)
+    lay = compute_layout(b, 1920, 1080, font(), 11, pre_round=True, third_place_winner="")
+    hits = lay.hit_index()
+    assert lay.hit_index() is hits
+
+    for r, m, x1, y1, x2, y2 in lay.matches:
+        box_a, box_b = lay.side_boxes(x1, y1, x2, y2)
+        for side, box in (('a', box_a), ('b', box_b)):
+            cx, cy = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+            assert hits.find(cx, cy) == ('slot', r, m, side)
+            assert hits.find(box[0], box[1]) == ('slot', r, m, side)
+        # gap between a and b, gap right of the column
+        assert hits.find(x1 + 1, box_a[3] + 4) is None
+        assert hits.find(x2 + 5, y1 + 1) is None
+
+    for m, x1, y1, x2, y2 in lay.pre_matches:
+        assert hits.find(x1 + 1, y1 + 1) == ('pre', m, 'a')
+        assert hits.find(x2 - 1, y2 - 1) == ('pre', m, 'b')
+
+    wx1, wy1, wx2, wy2 = lay.winner
+    assert hits.find((wx1 + wx2) / 2, (wy1 + wy2) / 2) == ('winner',)
+    tx1, ty1, tx2, ty2 = lay.third["b"]
+    assert hits.find(tx1 + 1, ty2 - 1) == ('tp', 'b')
+    assert hits.find(0, 0) is None
+
+
+def test_layout_cache():
+    b = Bracket(teams(16), [])
+    cache = LayoutCache()
+    key = (b, tuple(b.round_versions), 1920, 1080)
+    first = cache.get(key, lambda: compute_layout(b, 1920, 1080, font(), 11))
+    assert cache.get(key, lambda: None) is first
+    assert cache.stats == {"hits": 1, "computed": 1}
+
+    b.set_text(b.slot_index(0, 0, 'a'), "x")
+    key = (b, tuple(b.round_versions), 1920, 1080)
+    assert cache.get(key, lambda: compute_layout(b, 1920, 1080, font(), 11)) is not first
+
+
+if __name__ == "__main__":
+    test_boxes_and_links()
+    test_scale_clamped_for_large_bracket()
+    test_pre_round_column_and_third_place()
+    test_round_widths_only_changed_rounds()
+    test_hit_index_finds_every_slot()
+    test_layout_cache()
+    print("OK")
@@ -0,0 +1,116 @@
+# test_canvas_pool.py – testy pro canvas_pool (bez Tk, falešný canvas)
+# run: python test_canvas_pool.py  (nebo pytest)
+from canvas_pool import CanvasPool, LAYERS
+
+
+class FakeCanvas:
+    """Records the Tk calls the pool makes."""
+
+    def __init__(self):
+        self.next_id = 1
+        self.items = {}
+        self.calls = []
+
+    def _create(self, kind, *coords, **opts):
+        item_id = self.next_id
+        self.next_id += 1
+        self.items[item_id] = (kind, coords, opts)
+        self.calls.append(("create", kind))
+        return item_id
+
+    def create_rectangle(self, *coords, **opts):
+        return self._create("rectangle", *coords, **opts)
+
+    def create_text(self, *coords, **opts):
+        return self._create("text", *coords, **opts)
+
+    def coords(self, item_id, *coords):
+        self.calls.append(("coords", item_id))
+
+    def itemconfigure(self, item_id, **opts):
+        self.calls.append(("itemconfigure", item_id, tuple(sorted(opts))))
+
+    def tag_bind(self, item_id, seq, func):
+        self.calls.append(("bind", item_id, seq))
+
+    def tag_raise(self, tag):
+        self.calls.append(("raise", tag))
+
+    def delete(self, item_id):
+        self.items.pop(item_id, None)
+        self.calls.append(("delete", item_id))
+
+
+def frame(pool, texts, y=0):
+    pool.begin()
+    for i, text in enumerate(texts):
+        pool.item(("box", i), "rectangle", (0, y + i * 10, 50, y + i * 10 + 8),
+                  fill="white", binds={"<Button-1>": lambda e: None})
+        pool.item(("text", i), "text", (25, y + i * 10 + 4), layer="text", text=text)
+    pool.end()
+
+
+def test_unchanged_frame_makes_no_tk_calls():
+    canvas = FakeCanvas()
+    pool = CanvasPool(canvas)
+    frame(pool, ["1", "2", "3"])
+    assert pool.stats["created"] == 6
+    assert ("raise", LAYERS[0]) in canvas.calls
+
+    canvas.calls.clear()
+    frame(pool, ["1", "2", "3"])
+    assert canvas.calls == []
+    assert pool.stats == {"created": 0, "moved": 0, "configured": 0, "deleted": 0}
+
+
+def test_only_changes_are_sent():
+    canvas = FakeCanvas()
+    pool = CanvasPool(canvas)
+    frame(pool, ["1", "2", "3"])
+    text_id = pool.get(("text", 1))
+
+    canvas.calls.clear()
+    frame(pool, ["1", "x", "3"])
+    assert canvas.calls == [("itemconfigure", text_id, ("text",))]
+
+    canvas.calls.clear()
+    frame(pool, ["1", "x", "3"], y=5)
+    assert pool.stats["moved"] == 6
+    assert not [c for c in canvas.calls if c[0] in ("create", "bind", "itemconfigure")]
+
+
+def test_stale_items_deleted_and_binds_once():
+    canvas = FakeCanvas()
+    pool = CanvasPool(canvas)
+    frame(pool, ["1", "2", "3"])
+    frame(pool, ["1"])
+    assert len(pool) == 2
+    assert pool.stats["deleted"] == 4
+    assert len(canvas.items) == 2
+    assert sum(1 for c in canvas.calls if c[0] == "bind") == 3
+
+    pool.clear()
+    assert len(pool) == 0 and canvas.items == {}
+
+
+def test_keep_hides_without_coords():
+    canvas = FakeCanvas()
+    pool = CanvasPool(canvas)
+    pool.begin()
+    item_id = pool.item(("timer",), "text", (10, 10), layer="top", state="normal")
+    pool.end()
+
+    pool.begin()
+    assert pool.keep(("timer",), state="hidden") == item_id
+    assert pool.keep(("missing",)) is None
+    pool.end()
+    assert len(pool) == 1
+    assert canvas.calls[-1] == ("itemconfigure", item_id, ("state",))
+
+
+if __name__ == "__main__":
+    test_unchanged_frame_makes_no_tk_calls()
+    test_only_changes_are_sent()
+    test_stale_items_deleted_and_binds_once()
+    test_keep_hides_without_coords()
+    print("OK")
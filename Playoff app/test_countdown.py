@@ -0,0 +1,115 @@
+# test_countdown.py – testy pro countdown (odpočet z monotónního deadline)
+# run: python test_countdown.py  (nebo pytest)
+import random
+
+from countdown import Countdown, format_remaining, NS_PER_MS
+
+
+class FakeClock:
+    def __init__(self):
+        self.ns = 0
+
+    def __call__(self):
+        return self.ns
+
+
+def old_countdown(seconds, tick_delays_ms):
+    """Previous countdown_tick: -1 s per after(1000) + callback delay.
+
+    Returns the real time in ms at which 00:00 was shown.
+    """
+    t = 0
+    for delay in tick_delays_ms[:seconds]:
+        t += 1000 + delay
+    return t
+
+
+def test_format_remaining():
+    assert format_remaining(300_000) == "05:00"
+    assert format_remaining(299_001) == "05:00"        # rounded up
+    assert format_remaining(299_000) == "04:59"
+    assert format_remaining(1) == "00:01"
+    assert format_remaining(0) == "00:00"
+    assert format_remaining(-5) == "00:00"
+    assert format_remaining(59_901, 1) == "01:00.0"
+    assert format_remaining(59_900, 1) == "00:59.9"
+    assert format_remaining(1_234, 2) == "00:01.24"
+    assert format_remaining(3_600_000) == "60:00"
+
+
+def test_delayed_ticks_do_not_drift():
+    clock = FakeClock()
+    cd = Countdown(clock)
+    cd.start(300_000)
+    rnd = random.Random(3)
+    delays = []
+    shown = []
+    while True:
+        wait = cd.next_change_ms()
+        # every tick comes late (redraw, dialog), sometimes a lot
+        delay = rnd.choice([rnd.uniform(0, 40), rnd.uniform(0, 40), rnd.uniform(100, 900)])
+        delays.append(delay)
+        clock.ns += int((wait + delay) * NS_PER_MS)
+        shown.append((clock.ns, cd.text()))
+        if cd.expired:
+            break
+    end_ms = clock.ns / NS_PER_MS
+    # 00:00 shown no later than one tick delay after the real 5 minutes
+    assert 300_000 <= end_ms <= 300_000 + max(delays) + 1
+    # every shown text equals the real remaining time rounded up
+    for t, text in shown:
+        assert text == format_remaining(300_000 - t // NS_PER_MS)
+    # the old decrement loop summed all the delays
+    assert old_countdown(300, delays) - 300_000 > 30_000
+
+
+def test_blocked_loop_skips_to_real_time():
+    clock = FakeClock()
+    cd = Countdown(clock)
+    cd.start(60_000)
+    clock.ns = 12_300 * NS_PER_MS       # GUI blocked for 12.3 s
+    assert cd.text() == "00:48"
+    assert cd.next_change_ms() == 700
+    assert cd.text(1) == "00:47.7"
+    assert cd.next_change_ms(1) == 100
+
+
+def test_pause_resume():
+    clock = FakeClock()
+    cd = Countdown(clock)
+    cd.start(10_000)
+    clock.ns = 4_250 * NS_PER_MS
+    assert cd.pause()
+    assert cd.paused and not cd.running
+    assert not cd.pause()
+    clock.ns += 60_000 * NS_PER_MS      # paused for a minute
+    assert cd.remaining_ms() == 5_750
+    assert not cd.expired
+    assert cd.resume()
+    assert not cd.resume()
+    clock.ns += 5_749 * NS_PER_MS
+    assert cd.text(2) == "00:00.01"
+    assert not cd.expired
+    clock.ns += NS_PER_MS
+    assert cd.expired
+    assert cd.text() == "00:00"
+
+
+def test_stop():
+    clock = FakeClock()
+    cd = Countdown(clock)
+    assert not cd.running and not cd.expired
+    assert not cd.pause()
+    cd.start(1_000)
+    cd.stop()
+    assert not cd.running and not cd.paused
+    assert cd.remaining_ms() == 0
+
+
+if __name__ == "__main__":
+    test_format_remaining()
+    test_delayed_ticks_do_not_drift()
+    test_blocked_loop_skips_to_real_time()
+    test_pause_resume()
+    test_stop()
+    print("OK")
@@ -0,0 +1,112 @@
+# test_device_clock.py – testy časových značek brány (fw1.6) a odhadu hodin
+# run: python test_device_clock.py  (nebo pytest)
+import time
+
+from gate_simulator import GateSimulator, NS_PER_MS
+from usb_module import DeviceClock, SerialHandler, split_timestamp
+
+
+class FakeClock:
+    def __init__(self, ns=10**12):
+        self.ns = ns
+
+    def __call__(self):
+        return self.ns
+
+
+def run(sim, clock, events, until_s, step_ms=1):
+    """Poll the simulated port like the reader; events {name: host_ns}."""
+    for name, at in events.items():
+        sim._schedule(at, name)
+    dev = DeviceClock()
+    got = {}
+    end = clock.ns + until_s * 10**9
+    while clock.ns < end:
+        clock.ns += step_ms * NS_PER_MS
+        if not sim.in_waiting:
+            continue
+        rx_ns = clock()
+        for raw in sim.read(sim.in_waiting).split(b"\n"):
+            text, dev_us = split_timestamp(raw.decode().strip())
+            if dev_us is None:
+                continue
+            dev_ns = dev.add(dev_us, rx_ns)
+            if text != "sync":
+                got[text] = (dev.to_host_ns(dev_ns), rx_ns)
+    return dev, got
+
+
+def lap_errors(drift_ppm, micros_start=0, seed=1):
+    clock = FakeClock()
+    sim = GateSimulator(clock=clock, drift_ppm=drift_ppm, latency_ms=(1, 16),
+                        micros_start=micros_start, seed=seed)
+    sim.write(b"ts_on\n")
+    t0 = clock.ns
+    # 2 min of sync lines (app running before the first lap), 30 s lap
+    start, stop = t0 + 120_000 * NS_PER_MS, t0 + 150_123 * NS_PER_MS
+    dev, got = run(sim, clock, {"start_a": start, "stop_a": stop}, 160)
+    true_lap = stop - start
+    est_lap = got["stop_a"][0] - got["start_a"][0]
+    rx_lap = got["stop_a"][1] - got["start_a"][1]
+    return dev, abs(est_lap - true_lap) / NS_PER_MS, abs(rx_lap - true_lap) / NS_PER_MS
+
+
+def test_device_time_removes_latency_jitter():
+    worst_rx = 0
+    for seed in range(5):
+        dev, est_err, rx_err = lap_errors(drift_ppm=80, seed=seed)
+        assert est_err < 0.5                        # ms
+        worst_rx = max(worst_rx, rx_err)
+        assert abs(dev.drift * 1e6 + 80) < 20       # host - device offset shrinks
+    assert worst_rx > 2                             # host receive time jitters
+
+
+def test_micros_wrap():
+    # micros() overflows during the lap
+    dev, est_err, _ = lap_errors(drift_ppm=0, micros_start=(1 << 32) - 130_000_000)
+    assert est_err < 0.5
+    assert dev._wraps == 1
+
+
+def test_split_and_restart():
+    assert split_timestamp("stop_a @123") == ("stop_a", 123)
+    assert split_timestamp("stop_a") == ("stop_a", None)
+    assert split_timestamp("name @x") == ("name @x", None)
+
+    dev = DeviceClock()
+    dev.add(5_000_000, 10**9)
+    dev.add(6_000_000, 10**9 + 1_000_000_000)
+    dev.add(1_000, 10**9 + 2_000_000_000)          # gate rebooted
+    assert len(dev.samples) == 1 and dev._wraps == 0
+
+
+def test_reader_uses_device_time():
+    handler = SerialHandler()
+    handler.ser = GateSimulator(latency_ms=(1, 5), seed=3, timeout=1.0)
+    got = []
+    handler.start_reader(lambda text, ns: got.append((text, ns, time.perf_counter_ns())))
+    try:
+        handler.set_device_timestamps(True)
+        time.sleep(0.6)                             # a few sync lines
+        # the beam was broken 80 ms ago, the line arrives only now
+        t = time.perf_counter_ns() - 80 * NS_PER_MS
+        handler.ser.event("stop_a", t)
+        end = time.monotonic() + 2
+        while not got and time.monotonic() < end:
+            time.sleep(0.01)
+    finally:
+        handler.stop_reader()
+
+    assert [text for text, _, _ in got] == ["stop_a"]   # sync lines are internal
+    text, event_ns, seen_ns = got[0]
+    assert seen_ns - t >= 80 * NS_PER_MS
+    # device time mapped back: event time + min latency, not arrival
+    assert abs(event_ns - t) < 30 * NS_PER_MS
+
+
+if __name__ == "__main__":
+    test_device_time_removes_latency_jitter()
+    test_micros_wrap()
+    test_split_and_restart()
+    test_reader_uses_device_time()
+    print("OK")
@@ -0,0 +1,95 @@
+# test_handshake.py – testy pro wait_ready (připravenost brány / panelu po otevření portu)
+# run: python test_handshake.py  (nebo pytest)
+import time
+
+from gate_simulator import GateSimulator
+from usb_module import BOOTLOADER_S, wait_ready
+
+
+class SilentPort:
+    """fw1.5 and older: no banner, no answer to ping."""
+
+    def __init__(self):
+        self.timeout = 5.0
+        self.written = []
+
+    @property
+    def in_waiting(self):
+        return 0
+
+    def write(self, data):
+        self.written.append(data)
+
+    def read(self, n):
+        time.sleep(self.timeout)
+        return b""
+
+
+class PanelPort(SilentPort):
+    """7 segment panel fw1.0: "ERR" to an unknown command."""
+
+    def __init__(self):
+        super().__init__()
+        self.out = b""
+
+    def write(self, data):
+        super().write(data)
+        self.out += b"ERR\r\n"
+
+    @property
+    def in_waiting(self):
+        return len(self.out)
+
+    def read(self, n):
+        data, self.out = self.out[:n], self.out[n:]
+        return data
+
+
+def test_running_gate_answers_at_once():
+    gate = GateSimulator(latency_ms=(1, 3), timeout=5.0)
+    waited = wait_ready(gate, reset=False)
+    assert waited is not None and waited < 0.05
+    assert gate.timeout == 5.0                  # restored
+
+
+def test_reset_gate_boot_banner():
+    gate = GateSimulator(latency_ms=(1, 3), boot_ms=700, timeout=5.0)
+    sent = []
+    write = gate.write
+    gate.write = lambda data: sent.append(data) or write(data)
+    waited = wait_ready(gate, reset=True)
+    # banner at 0.7 s, no pings sent into the bootloader before
+    assert 0.69 < waited < 0.8
+    assert sent == []
+
+
+def test_reset_gate_late_boot_pong():
+    # gate without the banner (lost while the port opened): ping after the bootloader
+    gate = GateSimulator(latency_ms=(1, 3), boot_ms=900, timeout=5.0)
+    gate.pending.clear()
+    waited = wait_ready(gate, reset=True)
+    assert BOOTLOADER_S <= waited < BOOTLOADER_S + 0.1
+
+
+def test_old_firmware_times_out():
+    port = SilentPort()
+    start = time.monotonic()
+    assert wait_ready(port, reset=False, timeout=0.3) is None
+    assert 0.3 <= time.monotonic() - start < 0.5
+    assert port.written and port.timeout == 5.0
+
+
+def test_panel_any_answer():
+    port = PanelPort()
+    waited = wait_ready(port, probe=b"PING\n", ready=bool, timeout=1.0, reset=False)
+    assert waited is not None and waited < 0.05
+    assert port.written == [b"PING\n"]
+
+
+if __name__ == "__main__":
+    test_running_gate_answers_at_once()
+    test_reset_gate_boot_banner()
+    test_reset_gate_late_boot_pong()
+    test_old_firmware_times_out()
+    test_panel_any_answer()
+    print("OK")
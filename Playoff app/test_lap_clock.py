@@ -0,0 +1,93 @@
+# test_lap_clock.py – testy pro lap_clock (čas kola z monotónních značek)
+# run: python test_lap_clock.py  (nebo pytest)
+import random
+
+from lap_clock import LapClock, NS_PER_MS
+
+
+class FakeClock:
+    def __init__(self):
+        self.ns = 0
+
+    def __call__(self):
+        return self.ns
+
+
+def old_loop_ms(ticks_ns):
+    """Previous lap_loop: sum of int(delta * 1000) per 50 ms tick."""
+    total = 0
+    for prev, now in zip(ticks_ns, ticks_ns[1:]):
+        total += int((now - prev) / 1e9 * 1000)
+    return total
+
+
+def simulate(seed, lap_s):
+    """Start/stop events with a jittery 50 ms display loop in between."""
+    rnd = random.Random(seed)
+    clock = FakeClock()
+    lap = LapClock(clock)
+    clock.ns = rnd.randrange(10**12)
+    start = clock.ns
+    lap.start()
+
+    ticks = [start]
+    shown = []
+    stop = start + int(lap_s * 1e9) + rnd.randrange(NS_PER_MS)
+    while True:
+        # after(50) runs 50-80 ms later, sometimes a 300 ms GUI stall
+        step = rnd.randrange(50, 80) * NS_PER_MS + rnd.randrange(NS_PER_MS)
+        if rnd.random() < 0.02:
+            step += 300 * NS_PER_MS
+        if clock.ns + step >= stop:
+            break
+        clock.ns += step
+        ticks.append(clock.ns)
+        shown.append(lap.elapsed_ms())
+
+    clock.ns = stop
+    ticks.append(stop)
+    ms = lap.stop()
+    true_ms = (stop - start) / NS_PER_MS
+    return ms, true_ms, shown, old_loop_ms(ticks)
+
+
+def test_error_below_one_ms():
+    for seed in range(50):
+        lap_s = 10 + seed * 7.3
+        ms, true_ms, shown, old_ms = simulate(seed, lap_s)
+        assert 0 <= true_ms - ms < 1                    # floor of the exact time
+        assert shown == sorted(shown)                   # display never goes back
+        assert all(v <= ms for v in shown)
+        # the old accumulation loses up to 1 ms per tick
+        assert 0 <= true_ms - old_ms < len(shown) + 2
+
+
+def test_old_loop_drifts_new_does_not():
+    ms, true_ms, shown, old_ms = simulate(1, 600)       # 10 min lap
+    assert true_ms - ms < 1
+    assert true_ms - old_ms > 100                       # ~0.5 ms per tick
+
+
+def test_stop_and_reset():
+    clock = FakeClock()
+    lap = LapClock(clock)
+    assert lap.elapsed_ms() == 0 and not lap.running
+    assert lap.stop() == 0                              # stop without start
+
+    lap.start(5 * NS_PER_MS)                            # event timestamp
+    clock.ns = 20 * NS_PER_MS
+    assert lap.running and lap.elapsed_ms() == 15
+    assert lap.stop(17_999_999) == 12
+    clock.ns = 99 * NS_PER_MS
+    assert lap.stop() == 12 and lap.elapsed_ms() == 12  # frozen
+    assert lap.stop(0) == 12
+
+    lap.reset()
+    assert lap.elapsed_ms() == 0 and not lap.running
+
+
+if __name__ == "__main__":
+    test_error_below_one_ms()
+    test_old_loop_drifts_new_does_not()
+    test_stop_and_reset()
+    print("OK")
@@ -0,0 +1,204 @@
+# test_laps_view.py – testy pro laps_view (řádky tabulky kol, bez Tk)
+# run: python test_laps_view.py  (nebo pytest)
+from laps_view import LapsTable, BEST_FILL, INVALID_FILL, MARK_OUTLINE, best_lap, find_lap
+
+
+class FakeCanvas:
+    """Minimal canvas: items with coords, options and tags."""
+
+    def __init__(self):
+        self.next_id = 1
+        self.items = {}         # id -> [kind, coords, opts, tags]
+        self.calls = []
+
+    def _create(self, kind, coords, opts):
+        item_id = self.next_id
+        self.next_id += 1
+        tags = opts.pop("tags", ())
+        self.items[item_id] = [kind, list(coords), opts, tags]
+        self.calls.append("create")
+        return item_id
+
+    def create_rectangle(self, *coords, **opts):
+        return self._create("rectangle", coords, opts)
+
+    def create_text(self, *coords, **opts):
+        return self._create("text", coords, opts)
+
+    def create_line(self, *coords, **opts):
+        return self._create("line", coords, opts)
+
+    def _ids(self, tag_or_id):
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        return [i for i, item in self.items.items() if tag_or_id in item[3]]
+
+    def move(self, tag, dx, dy):
+        self.calls.append("move")
+        for i in self._ids(tag):
+            c = self.items[i][1]
+            self.items[i][1] = [v + (dy if n % 2 else dx) for n, v in enumerate(c)]
+
+    def delete(self, tag_or_id):
+        self.calls.append("delete")
+        for i in self._ids(tag_or_id):
+            del self.items[i]
+
+    def itemconfigure(self, item_id, **opts):
+        self.calls.append("itemconfigure")
+        self.items[item_id][2].update(opts)
+
+    def texts(self):
+        """Row texts top to bottom."""
+        rows = [item for item in self.items.values() if item[0] == "text"]
+        return [item[2]["text"] for item in sorted(rows, key=lambda item: item[1][1])]
+
+
+def lap(i, ms):
+    return {"id": i, "date": "01.01.2026 10:00:00", "time": f"{ms / 1000:.3f}", "ms": ms}
+
+
+def make(visible_rows=3):
+    canvas = FakeCanvas()
+    table = LapsTable(canvas, "rows_a")
+    table.place(10, 400, 100, 20, visible_rows, ("Consolas", 12))
+    return canvas, table
+
+
+def test_insert_shifts_rows_without_rebuild():
+    canvas, table = make()
+    records = []
+    table.rebuild(records)
+    for i, ms in enumerate([15000, 12000, 13000, 11000], start=1):
+        records.insert(0, lap(i, ms))
+        canvas.calls.clear()
+        table.insert(records)
+        # one move, one new row (3 items), maybe one row deleted
+        assert canvas.calls.count("move") == 1
+        assert canvas.calls.count("create") == 3
+
+    assert table.stats["rebuilt"] == 1
+    assert len(table.rows) == 3
+    assert [t.split()[0] for t in canvas.texts()] == ["4", "3", "2"]
+
+    fills = {row[0]["id"]: canvas.items[row[1]][2]["fill"] for row in table.rows}
+    assert fills[4] == BEST_FILL
+    assert fills[2] != BEST_FILL    # old best recoloured
+    assert table.best == best_lap(records) == 11000
+
+
+def test_invalid_lap_and_sync():
+    canvas, table = make()
+    records = [lap(1, 15000)]
+    table.rebuild(records)
+    records.insert(0, lap(2, 900))
+    table.insert(records)
+    assert canvas.items[table.rows[0][1]][2]["fill"] == INVALID_FILL
+    assert table.best == 15000
+
+    canvas.calls.clear()
+    table.sync(records)             # nothing changed
+    assert canvas.calls == []
+
+    records.clear()
+    table.reset()                   # cleared list (clear_laps_a)
+    table.sync(records)
+    assert len(table.rows) == 0 and canvas.items == {}
+    assert table.best is None
+
+
+class CountingList(list):
+    """Records that remember how many items were copied or scanned."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.touched = 0
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.touched += len(value) if isinstance(key, slice) else 1
+        return value
+
+    def __iter__(self):
+        self.touched += len(self)
+        return super().__iter__()
+
+
+def test_new_lap_cost_does_not_grow():
+    canvas, table = make(visible_rows=5)
+    records = CountingList(lap(i, 20000 + i) for i in range(10000, 0, -1))
+    table.rebuild(records)
+    records.insert(0, lap(10001, 12000))
+    records.touched = 0
+    table.insert(records)
+    table.sync(records)             # redraw right after the lap
+    # only the visible window is looked at, not 10000 laps
+    assert records.touched <= 4 * 5
+    assert table.best == 12000
+
+
+def many(n):
+    return [lap(i, 10000 + i) for i in range(n, 0, -1)]     # newest first
+
+
+def test_scroll_reuses_rows():
+    canvas, table = make(visible_rows=5)
+    records = many(5000)
+    table.rebuild(records)
+    assert len(canvas.items) == 15          # 5 rows x 3 items, no matter how many laps
+
+    canvas.calls.clear()
+    table.scroll(records, 3)
+    assert "create" not in canvas.calls and "delete" not in canvas.calls
+    assert [t.split()[0] for t in canvas.texts()] == ["4997", "4996", "4995", "4994", "4993"]
+
+    table.scroll(records, 100000)           # clamped to the oldest laps
+    assert table.offset == 4995
+    assert canvas.texts()[-1].split()[0] == "1"
+    table.scroll(records, -100000)
+    assert table.offset == 0 and canvas.texts()[0].split()[0] == "5000"
+    assert len(canvas.items) == 15
+
+
+def test_insert_while_scrolled_keeps_view():
+    canvas, table = make(visible_rows=3)
+    records = many(10)
+    table.rebuild(records)
+    table.scroll(records, 4)
+    before = canvas.texts()
+
+    records.insert(0, lap(11, 20000))
+    canvas.calls.clear()
+    table.insert(records)
+    assert canvas.texts() == before
+    assert "move" not in canvas.calls and "create" not in canvas.calls
+    assert table.offset == 5
+
+
+def test_jump_to_id():
+    canvas, table = make(visible_rows=4)
+    records = many(300)
+    table.rebuild(records)
+    assert find_lap(records, 300) == 0 and find_lap(records, 1) == 299
+    assert find_lap(records, 301) is None
+
+    assert table.jump_to_id(records, 120)
+    assert canvas.texts()[0].split()[0] == "120"
+    assert canvas.items[table.rows[0][1]][2]["outline"] == MARK_OUTLINE
+    assert not table.jump_to_id(records, 999)
+
+    table.jump_to_id(records, 2)            # near the end: window clamped
+    assert [t.split()[0] for t in canvas.texts()] == ["4", "3", "2", "1"]
+    marked = [row[0]["id"] for row in table.rows
+              if canvas.items[row[1]][2]["outline"] == MARK_OUTLINE]
+    assert marked == [2]
+
+
+if __name__ == "__main__":
+    test_insert_shifts_rows_without_rebuild()
+    test_invalid_lap_and_sync()
+    test_new_lap_cost_does_not_grow()
+    test_scroll_reuses_rows()
+    test_insert_while_scrolled_keeps_view()
+    test_jump_to_id()
+    print("OK")
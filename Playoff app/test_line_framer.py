@@ -0,0 +1,113 @@
+# test_line_framer.py – testy pro LineFramer (řádky z bajtů sériové linky)
+# run: python test_line_framer.py  (nebo pytest)
+# benchmark: python test_line_framer.py bench
+import random
+import sys
+import time
+
+from usb_module import LineFramer
+
+
+def old_split(chunks):
+    """Previous reader: bytes buffer + split per line."""
+    buffer = b""
+    lines = []
+    for chunk in chunks:
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            lines.append(line.rstrip(b"\r"))
+    return lines
+
+
+def feed_all(framer, chunks):
+    lines = []
+    for chunk in chunks:
+        lines.extend(framer.feed(chunk))
+    return lines
+
+
+def burst(n):
+    return b"".join(b"[A] beam count %d\r\n" % i for i in range(n))
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_line_endings():
+    f = LineFramer()
+    assert f.feed(b"ok\r\nstart_a\nstop") == [b"ok", b"start_a"]
+    assert f.feed(b"_a\r") == []
+    assert f.feed(b"\n\n") == [b"stop_a", b""]
+    assert f.buf == b""
+
+
+def test_any_chunking_gives_same_lines():
+    data = burst(500) + b"finish_a\n" + b"x" * 40 + b"\r\n"
+    expected = old_split([data])
+    rnd = random.Random(1)
+    for _ in range(20):
+        chunks = []
+        i = 0
+        while i < len(data):
+            n = rnd.randint(1, 64)
+            chunks.append(data[i:i + n])
+            i += n
+        assert feed_all(LineFramer(), chunks) == expected
+
+
+def test_cr_split_from_lf():
+    f = LineFramer()
+    assert f.feed(b"abc\r") == []
+    assert f.feed(b"\n") == [b"abc"]
+
+
+def test_overlong_line_dropped():
+    f = LineFramer(max_line=16)
+    assert f.feed(b"ok\n" + b"#" * 10) == [b"ok"]
+    for _ in range(100):                        # noise without newline
+        assert f.feed(b"#" * 10) == []
+        assert len(f.buf) <= 16
+    assert f.feed(b"###\r\nstop_b\n") == [b"stop_b"]
+    assert f.dropped == 1
+    # too long, but complete in one chunk
+    assert f.feed(b"#" * 30 + b"\nfinish\n") == [b"finish"]
+    assert f.dropped == 2
+    # exactly max_line is still a line
+    assert f.feed(b"a" * 16 + b"\r\n") == [b"a" * 16]
+
+
+def test_reset():
+    f = LineFramer()
+    f.feed(b"half")
+    f.reset()
+    assert f.feed(b"line\n") == [b"line"]
+
+
+def bench():
+    for n in (1_000, 100_000):
+        data = burst(n)
+        for size in (len(data), 4096, 64):
+            chunks = chunked(data, size)
+            t0 = time.perf_counter()
+            lines = feed_all(LineFramer(), chunks)
+            new = time.perf_counter() - t0
+            assert len(lines) == n
+            t0 = time.perf_counter()
+            old_split(chunks)
+            old = time.perf_counter() - t0
+            label = "one burst" if size == len(data) else f"{size} B reads"
+            print(f"{n:>7} lines {label:<12} split {old * 1000:9.1f} ms   LineFramer {new * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["bench"]:
+        bench()
+        sys.exit(0)
+    test_line_endings()
+    test_any_chunking_gives_same_lines()
+    test_cr_split_from_lf()
+    test_overlong_line_dropped()
+    test_reset()
+    print("OK")
@@ -0,0 +1,57 @@
+# test_perf_metrics.py – testy pro perf_metrics (měření časů, JSON lines log)
+# run: python test_perf_metrics.py  (nebo pytest)
+import json
+import os
+import tempfile
+
+from perf_metrics import PerfMetrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.ns = 0
+
+    def __call__(self):
+        return self.ns
+
+
+def test_timed_summary_window():
+    clock = FakeClock()
+    perf = PerfMetrics(window=3, clock=clock)
+    for ms in (5, 1, 2, 9):
+        with perf.timed("redraw"):
+            clock.ns += ms * 1_000_000
+    last, avg, peak, count = perf.summary("redraw")
+    assert (last, peak, count) == (9, 9, 4)
+    assert avg == (1 + 2 + 9) / 3           # only the last 3 samples
+    assert perf.summary("missing") is None
+
+    perf.gauge("canvas_items", 42)
+    lines = perf.lines()
+    assert lines[0].startswith("redraw") and lines[-1].split() == ["canvas_items", "42"]
+
+
+def test_json_lines_log():
+    clock = FakeClock()
+    perf = PerfMetrics(clock=clock)
+    path = os.path.join(tempfile.mkdtemp(), "metrics.jsonl")
+    perf.record("before_log", 1.0)          # not written
+    perf.start_log(path)
+    assert perf.logging
+    clock.ns = 2_500_000
+    perf.record_since("tk_lag", 0, line="stop_a")
+    perf.gauge("canvas_items", 10)
+    perf.stop_log()
+    perf.record("after_log", 1.0)
+
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert [r["name"] for r in rows] == ["tk_lag", "canvas_items"]
+    assert rows[0]["ms"] == 2.5 and rows[0]["line"] == "stop_a"
+    assert rows[1]["value"] == 10
+
+
+if __name__ == "__main__":
+    test_timed_summary_window()
+    test_json_lines_log()
+    print("OK")
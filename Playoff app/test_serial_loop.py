@@ -0,0 +1,357 @@
+# test_serial_loop.py – testy pro serial_loop (jedna asyncio smyčka pro porty, most do Tk)
+# run: python test_serial_loop.py  (nebo pytest)
+import asyncio
+import os
+import struct
+import threading
+import time
+
+from gate_simulator import GateSimulator
+from perf_metrics import PerfMetrics
+from serial_loop import (PRIO_COMMAND, PRIO_DISPLAY, PRIO_START, SerialLoop, TkBridge,
+                         WriteQueue, watch_port)
+from usb_module import USBManager
+
+
+class PipePort:
+    """Minimal fd based port: the read end of a pipe."""
+
+    def __init__(self):
+        self.r, self.w = os.pipe()
+        self.is_open = True
+
+    def fileno(self):
+        return self.r
+
+    @property
+    def in_waiting(self):
+        import fcntl, termios
+        buf = fcntl.ioctl(self.r, termios.FIONREAD, b"\0\0\0\0")
+        return struct.unpack("i", buf)[0]
+
+    def read(self, n):
+        return os.read(self.r, n)
+
+    def close(self):
+        os.close(self.r)
+        os.close(self.w)
+
+
+class FakePanel:
+    def __init__(self):
+        self.is_open = True
+        self.written = []
+        self.times = []
+        self.threads = set()
+
+    def write(self, data):
+        self.written.append(data)
+        self.times.append(time.monotonic())
+        self.threads.add(threading.current_thread().name)
+
+    def close(self):
+        self.is_open = False
+
+
+def wait_for(cond, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not cond() and time.monotonic() < end:
+        time.sleep(0.005)
+    assert cond()
+
+
+def test_loop_submit_and_stop():
+    io = SerialLoop()
+    io.start()
+    try:
+        async def add(a, b):
+            await asyncio.sleep(0.01)
+            return a + b
+        assert io.submit(add(2, 3)).result(timeout=1) == 5
+
+        async def forever():
+            await asyncio.Event().wait()
+        pending = io.submit(forever())
+    finally:
+        io.stop()
+    assert not io.running
+    assert pending.cancelled()
+
+
+def test_watch_port_fd():
+    if os.name != "posix":
+        return                                  # Windows: executor path only
+    io = SerialLoop()
+    io.start()
+    port = PipePort()
+    got = []
+    task = io.submit(watch_port(port, lambda chunk, rx_ns: got.append((chunk, rx_ns))))
+    try:
+        time.sleep(0.05)
+        threads = threading.active_count()
+        sent = time.perf_counter_ns()
+        os.write(port.w, b"start_a\r\n")
+        wait_for(lambda: got)
+        # no extra thread waits for the port
+        assert threading.active_count() == threads
+    finally:
+        task.cancel()
+        io.stop()
+        port.close()
+    chunk, rx_ns = got[0]
+    assert chunk == b"start_a\r\n"
+    assert 0 <= rx_ns - sent < 50_000_000
+
+
+def test_gate_lines_and_commands_on_one_loop():
+    usb = USBManager(verbose=False)
+    usb.handler.ser = GateSimulator(latency_ms=(1, 3), seed=1, timeout=0.2)
+    lines = []
+    usb.reader = usb._submit(usb.handler.serve(
+        lambda text, ns: lines.append((text, threading.current_thread().name))))
+    try:
+        results = []
+        threads = threading.active_count()
+        for _ in range(50):
+            usb.send_command(b"mode_laps\n", lambda ok, reason: results.append((ok, reason)))
+        wait_for(lambda: len(results) == 50)
+        # a command is a task, not a new thread per send
+        assert threading.active_count() <= threads + 1
+        assert results[0] == (True, "sent")
+        assert usb.handler.ser.mode == "laps"
+        usb.handler.ser.event("stop_b")
+        wait_for(lambda: lines)
+    finally:
+        usb.disconnect()
+    assert lines == [("stop_b", "serial-loop")]
+    assert not usb.io.running
+
+
+def test_display_writes_in_order_on_the_loop():
+    usb = USBManager(app=object(), verbose=False)
+    usb.display_a = FakePanel()
+    usb.display_b = FakePanel()
+    panel_a, panel_b = usb.display_a, usb.display_b
+    try:
+        futures = [usb.send_display(1 + i % 2, f"TXT:{i}") for i in range(20)]
+        results = [f.result(timeout=1) for f in futures]
+        assert usb.display_sent == {1: 10, 2: 10}
+    finally:
+        usb.disconnect()
+    for panel, first in ((panel_a, 0), (panel_b, 1)):
+        # newer text replaces a pending one, never an older one after a newer
+        sent = [i for i in range(first, 20, 2) if results[i]]
+        assert panel.written == [f"TXT:{i}\r\n".encode() for i in sent]
+        assert sent[-1] == 18 + first
+    assert panel_a.threads == {"serial-loop"}
+    assert not panel_a.is_open and usb.display_a is None
+
+
+def blocked_queue(maxsize=64, perf=None, **panel):
+    """WriteQueue with two fake ports; the loop is busy for 0.1 s, so the
+    puts of a test are all queued before the writer runs."""
+    io = SerialLoop()
+    tx = WriteQueue(io, maxsize=maxsize, perf=perf)
+    out = FakePanel()
+
+    async def connect():
+        return out
+    tx.add_port("gate", lambda: out, connect)
+    tx.add_port(1, lambda: out, connect, **panel)
+    io.start()
+    io.call(time.sleep, 0.1)
+    return io, tx, out
+
+
+def test_queue_priorities():
+    perf = PerfMetrics()
+    io, tx, out = blocked_queue(perf=perf)
+    try:
+        futures = [tx.put(1, b"TXT:%d" % i, PRIO_DISPLAY) for i in range(5)]
+        futures.append(tx.put("gate", b"mode_laps", PRIO_COMMAND))
+        futures.append(tx.put("gate", b"start", PRIO_START))
+        assert all(f.result(timeout=1) for f in futures)
+    finally:
+        io.stop()
+    assert out.written == [b"start", b"mode_laps"] + [b"TXT:%d" % i for i in range(5)]
+    assert tx.stats["written"] == 7 and tx.stats["max_depth"] == 7
+    assert tx.stats["depth"] == 0 and perf.gauges["tx_queue"] == 0
+    assert perf.summary("tx_start")[3] == 1
+    assert perf.summary("tx_display")[3] == 5
+
+
+def test_queue_full_drops_display_text():
+    io, tx, out = blocked_queue(maxsize=4)
+    try:
+        texts = [tx.put(1, b"TXT:%d" % i) for i in range(4)]
+        start = tx.put("gate", b"start", PRIO_START)     # pushes out TXT:3
+        late = tx.put(1, b"TXT:late")                    # full, dropped itself
+        assert start.result(timeout=1)
+        assert all(f.result(timeout=1) for f in texts[:3])
+        for f in (texts[3], late):
+            try:
+                f.result(timeout=1)
+                assert False
+            except RuntimeError as e:
+                assert "full" in str(e)
+    finally:
+        io.stop()
+    assert out.written == [b"start", b"TXT:0", b"TXT:1", b"TXT:2"]
+    assert tx.stats["dropped"] == 2
+
+
+def test_queue_cancelled_write_skipped():
+    io, tx, out = blocked_queue()
+    try:
+        first = tx.put(1, b"CLS")
+        assert first.cancel()
+        assert tx.put(1, b"TXT:1").result(timeout=1)
+    finally:
+        io.stop()
+    assert out.written == [b"TXT:1"]
+
+
+def test_queue_latest_text_wins():
+    io, tx, out = blocked_queue(coalesce=True)
+    try:
+        texts = [tx.put(1, b"TXT:%d" % i) for i in range(10)]
+        start = tx.put("gate", b"start", PRIO_START)
+        assert [f.result(timeout=1) for f in texts] == [False] * 9 + [True]
+        assert start.result(timeout=1)
+        # already shown: done at once, nothing sent
+        assert tx.put(1, b"TXT:9").result(timeout=1)
+    finally:
+        io.stop()
+    assert out.written == [b"start", b"TXT:9"]
+    assert tx.stats["coalesced"] == 9 and tx.stats["unchanged"] == 1
+    assert tx.stats["max_depth"] == 2
+
+
+def test_queue_pace_keeps_one_message_behind():
+    io, tx, out = blocked_queue(coalesce=True, pace=lambda payload: 0.05)
+    try:
+        assert tx.put(1, b"TXT:A").result(timeout=1)
+        # panel busy with A: B waits, C replaces it, the gate is not held up
+        b = tx.put(1, b"TXT:B")
+        time.sleep(0.01)
+        c = tx.put(1, b"TXT:C")
+        start = tx.put("gate", b"start", PRIO_START)
+        assert start.result(timeout=1)
+        assert not c.done()
+        assert b.result(timeout=1) is False
+        assert c.result(timeout=1)
+    finally:
+        io.stop()
+    assert out.written == [b"TXT:A", b"start", b"TXT:C"]
+    assert out.times[2] - out.times[0] >= 0.045
+
+
+def test_queue_connect_does_not_hold_other_ports():
+    io = SerialLoop()
+    tx = WriteQueue(io)
+    gate, panel = FakePanel(), FakePanel()
+    ports = {"gate": gate, 1: None, 2: None}
+
+    async def slow_connect():
+        await asyncio.sleep(0.2)                # port open + handshake
+        ports[1] = panel
+        return panel
+
+    async def no_port():
+        return None
+    tx.add_port("gate", lambda: ports["gate"], None)
+    tx.add_port(1, lambda: ports[1], slow_connect)
+    tx.add_port(2, lambda: ports[2], no_port)
+    try:
+        texts = [tx.put(1, b"TXT:%d" % i) for i in range(3)]
+        start = tx.put("gate", b"start", PRIO_START)
+        t0 = time.monotonic()
+        assert start.result(timeout=1)
+        assert time.monotonic() - t0 < 0.1
+        assert not any(f.done() for f in texts)
+        assert all(f.result(timeout=1) for f in texts)
+        try:
+            tx.put(2, b"TXT:B").result(timeout=1)
+            assert False
+        except RuntimeError as e:
+            assert "not connected" in str(e)
+    finally:
+        io.stop()
+    assert panel.written == [b"TXT:0", b"TXT:1", b"TXT:2"]
+    assert tx.stats["failed"] == 1
+
+
+class FakeRoot:
+    """root.after only (Windows-like Tk without createfilehandler)."""
+
+    def __init__(self):
+        self.after_calls = []
+        self.tk = object()
+
+    def after(self, ms, func):
+        self.after_calls.append(func)
+
+
+class FakeTk:
+    def __init__(self):
+        self.handlers = {}
+
+    def createfilehandler(self, fd, mask, func):
+        self.handlers[fd] = func
+
+    def deletefilehandler(self, fd):
+        del self.handlers[fd]
+
+
+def test_bridge_after_fallback_batches():
+    root = FakeRoot()
+    bridge = TkBridge(root)
+    got = []
+    workers = [threading.Thread(target=lambda i=i: [bridge.post(got.append, (i, k)) for k in range(100)])
+               for i in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    # one wake-up for the whole batch
+    assert len(root.after_calls) == 1
+    root.after_calls.pop()()
+    assert len(got) == 400
+    for i in range(4):
+        assert [k for j, k in got if j == i] == list(range(100))
+    bridge.post(got.append, "next")
+    assert len(root.after_calls) == 1
+
+
+def test_bridge_pipe_wakeup():
+    root = FakeRoot()
+    root.tk = FakeTk()
+    bridge = TkBridge(root)
+    got = []
+    try:
+        (fd, on_pipe), = root.tk.handlers.items()
+        bridge.post(got.append, 1)
+        bridge.post(got.append, 2)
+        assert root.after_calls == []           # Tk not called from the poster
+        on_pipe(fd, 2)                          # Tk: pipe readable
+        assert got == [1, 2]
+        assert bridge.stats == {"posted": 2, "batches": 1}
+    finally:
+        bridge.close()
+    assert root.tk.handlers == {}
+
+
+if __name__ == "__main__":
+    test_loop_submit_and_stop()
+    test_watch_port_fd()
+    test_gate_lines_and_commands_on_one_loop()
+    test_display_writes_in_order_on_the_loop()
+    test_queue_priorities()
+    test_queue_full_drops_display_text()
+    test_queue_cancelled_write_skipped()
+    test_queue_latest_text_wins()
+    test_queue_pace_keeps_one_message_behind()
+    test_queue_connect_does_not_hold_other_ports()
+    test_bridge_after_fallback_batches()
+    test_bridge_pipe_wakeup()
+    print("OK")
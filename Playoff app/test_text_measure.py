@@ -0,0 +1,90 @@
+# test_text_measure.py – testy pro text_measure (cache šířek textu, bez Tk)
+# run: python test_text_measure.py  (nebo pytest)
+from text_measure import TextMeasure, RoundWidths
+
+
+class FakeFont:
+    created = 0
+
+    def __init__(self, family, size):
+        FakeFont.created += 1
+        self.size = size
+        self.calls = 0
+
+    def measure(self, text):
+        self.calls += 1
+        return len(text) * self.size
+
+
+def test_fonts_reused_and_widths_cached():
+    FakeFont.created = 0
+    tm = TextMeasure(FakeFont)
+    f = tm.font("Arial", 14)
+    assert tm.font("Arial", 14) is f
+    assert FakeFont.created == 1
+
+    for _ in range(3):
+        assert f.measure("Team 1") == 6 * 14
+        assert tm.measure("Arial", 14, "Team 1") == 6 * 14
+    assert f.font.calls == 1
+    assert tm.stats["misses"] == 1 and tm.stats["hits"] == 5
+
+    assert tm.measure("Arial", 28, "Team 1") == 6 * 28
+    assert FakeFont.created == 2
+
+
+def test_lru_bound():
+    tm = TextMeasure(FakeFont, maxsize=3)
+    f = tm.font("Arial", 10)
+    for text in ("a", "bb", "ccc"):
+        f.measure(text)
+    f.measure("a")          # "a" used again, "bb" is the oldest now
+    f.measure("dddd")
+    assert len(tm.widths) == 3
+    assert ("Arial", 10, "bb") not in tm.widths
+    assert ("Arial", 10, "a") in tm.widths
+    assert tm.stats["evicted"] == 1
+
+
+def test_wrapped_heights_cached():
+    tm = TextMeasure(FakeFont, maxsize=2)
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return 20 * (1 + len(text) // 10)
+
+    for _ in range(3):
+        assert tm.height("Arial", 12, "Team", 200, lambda: compute("Team")) == 20
+    assert tm.height("Arial", 12, "Team", 100, lambda: compute("Team")) == 20
+    assert tm.height("Arial", 12, "A long team name", 100, lambda: compute("long")) == 20
+    assert calls == ["Team", "Team", "long"]
+    assert len(tm.heights) == 2 and tm.stats["evicted"] == 1
+
+
+def test_round_widths_recompute_only_changed():
+    rw = RoundWidths()
+    owner = object()
+    calls = []
+
+    def compute(r):
+        calls.append(r)
+        return r * 10
+
+    for _ in range(2):
+        assert [rw.get(owner, r, (r, 0), lambda r=r: compute(r)) for r in range(3)] == [0, 10, 20]
+    assert calls == [0, 1, 2]
+
+    rw.get(owner, 1, (1, 1), lambda: compute(1))    # round 1 changed
+    assert calls == [0, 1, 2, 1]
+
+    rw.get(object(), 0, (0, 0), lambda: compute(0))  # new bracket
+    assert calls == [0, 1, 2, 1, 0]
+
+
+if __name__ == "__main__":
+    test_fonts_reused_and_widths_cached()
+    test_lru_bound()
+    test_wrapped_heights_cached()
+    test_round_widths_recompute_only_changed()
+    print("OK")
@@ -0,0 +1,181 @@
+# test_ticker.py – testy pro ticker (jeden after() pro všechny hodiny)
+# run: python test_ticker.py  (nebo pytest)
+from ticker import Ticker
+
+
+class FakeRoot:
+    """root.after / after_cancel with a virtual clock (seconds)."""
+
+    def __init__(self):
+        self.t = 0.0
+        self.pending = {}           # id -> (at, func)
+        self.next_id = 0
+        self.scheduled = 0
+
+    def clock(self):
+        return self.t
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.pending[self.next_id] = (self.t + ms / 1000, func)
+        self.scheduled += 1
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_until(self, t, lag=0.0):
+        """Fire callbacks up to time t; each fires `lag` s late."""
+        while self.pending:
+            after_id, (at, func) = min(self.pending.items(), key=lambda item: item[1][0])
+            if at > t + 1e-9:          # float sums of 0.05 s steps
+                break
+            del self.pending[after_id]
+            self.t = max(self.t, at + lag)
+            func()
+        self.t = max(self.t, t)
+
+
+def make():
+    root = FakeRoot()
+    return root, Ticker(root, clock=root.clock)
+
+
+def test_idle_without_tasks():
+    root, ticker = make()
+    runs = []
+    ticker.add("laps", 50, runs.append)
+    assert ticker.idle and not root.pending
+    ticker.start("laps")
+    root.run_until(1.0)
+    assert len(runs) == 21          # t = 0, 0.05 ... 1.0
+    ticker.stop("laps")
+    assert ticker.idle and not root.pending
+    root.run_until(2.0)
+    assert len(runs) == 21
+
+
+def test_one_pending_after_for_all_tasks():
+    root, ticker = make()
+    counts = {"datetime": 0, "countdown": 0, "laps": 0, "blink": 0}
+
+    def counter(name):
+        def run(now):
+            counts[name] += 1
+        return run
+
+    ticker.add("datetime", 1000, counter("datetime"), start=True)
+    ticker.add("countdown", 1000, counter("countdown"))
+    ticker.add("laps", 50, counter("laps"))
+    ticker.add("blink", 500, counter("blink"))
+    ticker.start("countdown", 1000)
+    ticker.start("laps")
+    ticker.start("blink")
+    for step in range(1, 201):
+        root.run_until(step * 0.05)
+        assert len(root.pending) <= 1
+    assert counts == {"datetime": 11, "countdown": 10, "laps": 201, "blink": 21}
+    # datetime, countdown and blink share the 50 ms ticks of the lap timer
+    assert ticker.stats["ticks"] == 201
+
+
+def test_deadline_does_not_drift_with_late_ticks():
+    root, ticker = make()
+    times = []
+    ticker.add("countdown", 1000, times.append)
+    ticker.start("countdown", 1000)
+    root.run_until(10.5, lag=0.03)
+    # every tick 30 ms late, the schedule stays on the full seconds
+    assert len(times) == 10
+    assert all(abs(t - (i + 1) - 0.03) < 1e-9 for i, t in enumerate(times))
+
+
+def test_long_stall_skips_missed_runs():
+    root, ticker = make()
+    times = []
+    ticker.add("laps", 50, times.append, start=True)
+    root.run_until(0.0)
+    root.t = 2.0                    # GUI blocked for 2 s
+    root.run_until(2.2)
+    assert times[1] == 2.0
+    # no burst of 40 catch-up runs
+    assert len(times) == 6
+
+
+def test_task_return_sets_next_delay():
+    root, ticker = make()
+    times = []
+
+    def aligned(now):
+        times.append(now)
+        return 1000 - (now * 1000) % 1000
+
+    root.t = 0.3
+    ticker.add("datetime", 1000, aligned, start=True)
+    root.run_until(3.5)
+    assert times == [0.3, 1.0, 2.0, 3.0]
+
+
+def test_task_stops_itself():
+    root, ticker = make()
+    runs = []
+
+    def once(now):
+        runs.append(now)
+        ticker.stop("blink")
+
+    ticker.add("blink", 500, once, start=True)
+    root.run_until(5.0)
+    assert runs == [0.0]
+    assert ticker.idle
+
+
+def test_earlier_task_reschedules():
+    root, ticker = make()
+    ticker.add("usb", 1500, lambda now: None)
+    ticker.add("laps", 50, lambda now: None)
+    ticker.start("usb", 1500)
+    assert len(root.pending) == 1
+    ticker.start("laps")
+    assert len(root.pending) == 1
+    (at, _), = root.pending.values()
+    assert at == 0.0
+
+
+def test_set_text_skips_unchanged():
+    _, ticker = make()
+    shown = []
+    for text in ["00:10", "00:10", "00:09", "00:09", "00:09"]:
+        ticker.set_text("timer", text, shown.append)
+    assert shown == ["00:10", "00:09"]
+    assert ticker.stats["text_set"] == 2
+    assert ticker.stats["text_skipped"] == 3
+    ticker.forget_text("timer")
+    ticker.set_text("timer", "00:09", shown.append)
+    assert shown[-1] == "00:09" and len(shown) == 3
+
+
+def test_failing_task_keeps_running():
+    root, ticker = make()
+    runs = []
+
+    def bad(now):
+        runs.append(now)
+        raise ValueError
+
+    ticker.add("usb", 1500, bad, start=True)
+    root.run_until(3.0)
+    assert runs == [0.0, 1.5, 3.0]
+
+
+if __name__ == "__main__":
+    test_idle_without_tasks()
+    test_one_pending_after_for_all_tasks()
+    test_deadline_does_not_drift_with_late_ticks()
+    test_long_stall_skips_missed_runs()
+    test_task_return_sets_next_delay()
+    test_task_stops_itself()
+    test_earlier_task_reschedules()
+    test_set_text_skips_unchanged()
+    test_failing_task_keeps_running()
+    print("OK")
@@ -0,0 +1,131 @@
+# test_usb_reader.py – testy čtecího vlákna SerialHandler (bez hardware)
+# run: python test_usb_reader.py  (nebo pytest)
+import threading
+import time
+
+from usb_module import SerialHandler
+
+
+class FakeSerial:
+    """Bytes fed by the test, read by the reader thread.
+
+    read() blocks like pyserial with a timeout: until data, timeout or
+    cancel_read().
+    """
+
+    def __init__(self, timeout=5.0):
+        self.is_open = True
+        self.timeout = timeout
+        self.data = b""
+        self.reads = 0
+        self.cancelled = False
+        self.cond = threading.Condition()
+
+    def feed(self, data):
+        with self.cond:
+            self.data += data
+            self.cond.notify_all()
+
+    @property
+    def in_waiting(self):
+        with self.cond:
+            return len(self.data)
+
+    def read(self, n):
+        with self.cond:
+            self.reads += 1
+            self.cond.wait_for(lambda: self.data or self.cancelled, self.timeout)
+            self.cancelled = False
+            chunk, self.data = self.data[:n], self.data[n:]
+            return chunk
+
+    def cancel_read(self):
+        with self.cond:
+            self.cancelled = True
+            self.cond.notify_all()
+
+    def close(self):
+        self.is_open = False
+
+
+def run_reader(callback):
+    handler = SerialHandler()
+    handler.ser = FakeSerial()
+    handler.start_reader(callback)
+    return handler
+
+
+def wait_for(cond, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not cond() and time.monotonic() < end:
+        time.sleep(0.005)
+    assert cond()
+
+
+def test_lines_carry_arrival_time():
+    got = []
+
+    def slow_gui(text, rx_ns):
+        got.append((text, rx_ns, time.perf_counter_ns()))
+        time.sleep(0.05)                            # GUI hiccup
+
+    handler = run_reader(slow_gui)
+    try:
+        before = time.perf_counter_ns()
+        handler.ser.feed(b"start_a\r\nstop_a\n")   # one chunk, two lines
+        wait_for(lambda: len(got) == 2)
+    finally:
+        handler.stop_reader()
+
+    (t1, rx1, seen1), (t2, rx2, seen2) = got
+    assert (t1, t2) == ("start_a", "stop_a")
+    assert before <= rx1 == rx2                     # same chunk = same arrival
+    # the second line waited for the slow callback, its timestamp did not
+    assert seen2 - rx2 >= 50_000_000
+
+
+def test_wakes_on_data_and_idles():
+    got = []
+    handler = run_reader(lambda text, rx_ns: got.append((text, time.perf_counter_ns())))
+    try:
+        time.sleep(0.3)
+        # blocked in read(), no 10 ms polling
+        assert handler.ser.reads <= 2
+        sent = time.perf_counter_ns()
+        handler.ser.feed(b"stop_b\n")
+        wait_for(lambda: got)
+    finally:
+        handler.stop_reader()
+    assert got[0][0] == "stop_b"
+    assert got[0][1] - sent < 5_000_000
+
+
+def test_stop_interrupts_blocking_read():
+    handler = run_reader(lambda text, rx_ns: None)
+    time.sleep(0.05)                                # reader waits in read()
+    start = time.monotonic()
+    handler.stop_reader()
+    assert time.monotonic() - start < 0.1           # port timeout is 5 s
+    assert handler.rx_thread is None
+
+
+def test_waits_for_port_open():
+    got = []
+    handler = SerialHandler()
+    handler.start_reader(lambda text, rx_ns: got.append(text))
+    try:
+        time.sleep(0.05)                            # no port yet
+        handler.ser = FakeSerial()
+        handler.rx_wake.set()                       # what open() does
+        handler.ser.feed(b"ok\n")
+        wait_for(lambda: got == ["ok"], timeout=0.5)
+    finally:
+        handler.stop_reader()
+
+
+if __name__ == "__main__":
+    test_lines_carry_arrival_time()
+    test_wakes_on_data_and_idles()
+    test_stop_interrupts_blocking_read()
+    test_waits_for_port_open()
+    print("OK")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# text_measure.py
+# -*- coding: utf-8 -*-
+# Cached text measurement for the bracket layout (redraw, PDF export).
+# Font objects are created once per (family, size), measured widths are kept
+# in a bounded LRU keyed by (family, size, text), wrapped text heights by
+# (family, size, width, text). No Tk import here, the font factory and the
+# height measurement are passed in by playoff.py.
+# test: python test_text_measure.py
+__author__ = 'Martin Pihrt'
+
+from collections import OrderedDict
+
+MEASURE_CACHE_SIZE = 8192   # measured texts kept (all sizes together)
+
+
+class CachedFont:
+    """Wraps a font object, measure() goes through the shared LRU."""
+    __slots__ = ("owner", "key", "font")
+
+    def __init__(self, owner, key, font):
+        self.owner = owner
+        self.key = key          # (family, size)
+        self.font = font
+
+    def measure(self, text):
+        return self.owner._measure(self, text)
+
+
+class TextMeasure:
+    """font_factory(family, size) -> object with measure(text) (tkfont.Font)."""
+
+    def __init__(self, font_factory, maxsize=MEASURE_CACHE_SIZE):
+        self.font_factory = font_factory
+        self.maxsize = maxsize
+        self.fonts = {}                 # (family, size) -> CachedFont
+        self.widths = OrderedDict()     # (family, size, text) -> px
+        self.heights = OrderedDict()    # (family, size, width, text) -> px
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+    def font(self, family, size):
+        key = (family, size)
+        cf = self.fonts.get(key)
+        if cf is None:
+            cf = CachedFont(self, key, self.font_factory(family, size))
+            self.fonts[key] = cf
+        return cf
+
+    def measure(self, family, size, text):
+        return self.font(family, size).measure(text)
+
+    def _measure(self, cf, text):
+        key = cf.key + (text,)
+        px = self.widths.get(key)
+        if px is not None:
+            self.widths.move_to_end(key)
+            self.stats["hits"] += 1
+            return px
+        px = cf.font.measure(text)
+        self.stats["misses"] += 1
+        self.widths[key] = px
+        if len(self.widths) > self.maxsize:
+            self.widths.popitem(last=False)
+            self.stats["evicted"] += 1
+        return px
+
+    def height(self, family, size, text, width, compute):
+        """Height of text wrapped to width px; compute() measures a miss."""
+        key = (family, size, width, text)
+        px = self.heights.get(key)
+        if px is not None:
+            self.heights.move_to_end(key)
+            self.stats["hits"] += 1
+            return px
+        px = compute()
+        self.stats["misses"] += 1
+        self.heights[key] = px
+        if len(self.heights) > self.maxsize:
+            self.heights.popitem(last=False)
+            self.stats["evicted"] += 1
+        return px
+
+    def clear(self):
+        self.widths.clear()
+        self.heights.clear()
+
+
+class RoundWidths:
+    """Column width per round, recomputed only when the round's key changes.
+
+    key is anything that changes with the round texts, e.g.
+    (Bracket.round_versions[r], font size).
+    """
+
+    def __init__(self):
+        self.owner = None
+        self.cache = {}                 # round key -> (key, width)
+        self.stats = {"hits": 0, "computed": 0}
+
+    def get(self, owner, r_key, key, compute):
+        if owner is not self.owner:     # new bracket
+            self.owner = owner
+            self.cache.clear()
+        hit = self.cache.get(r_key)
+        if hit is not None and hit[0] == key:
+            self.stats["hits"] += 1
+            return hit[1]
+        width = compute()
+        self.cache[r_key] = (key, width)
+        self.stats["computed"] += 1
+        return width
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# ticker.py
+# -*- coding: utf-8 -*-
+# One root.after() loop for all on-screen clocks (date/time, countdown, lap
+# timers, blinking, USB status). Tasks run at their own rate, tasks due at
+# about the same time run in the same tick, and with no active task no
+# after() is pending at all. No Tk import, the root is passed in.
+# test: python test_ticker.py
+__author__ = 'Martin Pihrt'
+
+import time
+
+SLACK_MS = 5        # tasks due within this window run in the same tick
+
+
+class Task:
+    __slots__ = ("name", "interval_ms", "func", "active", "due")
+
+    def __init__(self, name, interval_ms, func):
+        self.name = name
+        self.interval_ms = interval_ms
+        self.func = func            # func(now) -> None or ms to the next run
+        self.active = False
+        self.due = 0.0
+
+
+class Ticker:
+    """Central scheduler.
+
+        ticker.add("laps", 50, self.update_lap_display)
+        ticker.start("laps")        # runs now, then every 50 ms
+        ticker.stop("laps")         # no more runs; last task stopped = idle
+
+    A task may return the delay in ms to its next run (e.g. the date/time
+    clock aligned to the full second). Deadlines advance by the interval,
+    not from the moment the task ran, so a late tick does not shift the
+    following ones; if a task is more than one interval late it skips
+    the missed runs.
+    """
+
+    def __init__(self, root, clock=time.monotonic):
+        self.root = root
+        self.clock = clock
+        self.tasks = {}
+        self.texts = {}             # key -> last text shown
+        self._after_id = None
+        self._next_at = None
+        self.stats = {"ticks": 0, "runs": 0, "text_set": 0, "text_skipped": 0}
+
+    def add(self, name, interval_ms, func, start=False):
+        self.tasks[name] = Task(name, interval_ms, func)
+        if start:
+            self.start(name)
+
+    def start(self, name, delay_ms=0):
+        """Activate a task; first run after delay_ms (0 = in this frame)."""
+        task = self.tasks[name]
+        task.active = True
+        task.due = self.clock() + delay_ms / 1000
+        self._schedule()
+
+    def stop(self, name):
+        task = self.tasks.get(name)
+        if task is not None:
+            task.active = False
+        self._schedule()
+
+    def active(self, name):
+        task = self.tasks.get(name)
+        return bool(task and task.active)
+
+    @property
+    def idle(self):
+        return self._after_id is None
+
+    def set_text(self, key, text, setter):
+        """setter(text) only if text differs from the last one for key."""
+        if self.texts.get(key) == text:
+            self.stats["text_skipped"] += 1
+            return False
+        self.texts[key] = text
+        setter(text)
+        self.stats["text_set"] += 1
+        return True
+
+    def forget_text(self, key):
+        """The widget was changed elsewhere: next set_text always applies."""
+        self.texts.pop(key, None)
+
+    # --- loop ---
+    def _schedule(self):
+        dues = [t.due for t in self.tasks.values() if t.active]
+        if not dues:
+            if self._after_id is not None:
+                self.root.after_cancel(self._after_id)
+                self._after_id = None
+                self._next_at = None
+            return
+        next_at = min(dues)
+        if self._after_id is not None:
+            if next_at >= self._next_at:
+                return              # the pending tick comes first anyway
+            self.root.after_cancel(self._after_id)
+        delay = max(0, int((next_at - self.clock()) * 1000 + 0.5))
+        self._next_at = next_at
+        self._after_id = self.root.after(delay, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        self._next_at = None
+        self.stats["ticks"] += 1
+        now = self.clock()
+        limit = now + SLACK_MS / 1000
+        for task in list(self.tasks.values()):
+            if not task.active or task.due > limit:
+                continue
+            self.stats["runs"] += 1
+            try:
+                wait_ms = task.func(now)
+            except Exception:
+                wait_ms = None
+            if not task.active:
+                continue            # the task stopped itself
+            if wait_ms is not None:
+                task.due = now + wait_ms / 1000
+            else:
+                task.due += task.interval_ms / 1000
+                if task.due <= now:
+                    # more than one interval late: skip the missed runs
+                    task.due = now + task.interval_ms / 1000
+        self._schedule()
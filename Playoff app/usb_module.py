@@ -6,10 +6,14 @@ from __future__ import annotations
 # -*- coding: utf-8 -*-
 __author__ = 'Martin Pihrt'
 
+import asyncio
 import threading
 import time
 import sys
 
+from serial_loop import (PRIO_COMMAND, PRIO_DISPLAY, PRIO_START, SerialLoop,
+                         WriteQueue, watch_port)
+
 try:
     import serial
     import serial.tools.list_ports as list_ports
@@ -24,6 +28,26 @@ DEFAULT_SERIAL_PORT = ""
 DEFAULT_SERIAL_BAUD = 115200
 DEFAULT_SERIAL_TIMEOUT = 5.0
 
+# gate fw1.6+: "ts_on" -> every event ends with " @<micros>" plus a
+# "sync @<micros>" line every 500 ms (fw1.5 and older ignore "ts_on")
+TS_SEPARATOR = " @"
+SYNC_EVENT = "sync"
+
+MAX_LINE = 1024     # longer RX lines (noise, lost newline) are dropped
+
+# readiness after open (fw1.6: "[BOOT] READY" at the end of setup, "ping" -> "pong")
+READY_LINES = ("pong", "[BOOT] READY")
+READY_TIMEOUT = 2.0     # no answer (fw1.5 and older): the old fixed wait
+DISPLAY_READY_TIMEOUT = 1.0
+BOOTLOADER_S = 1.2      # after a reset no pings while the bootloader listens
+PING_EVERY_S = 0.25
+READY_POLL_S = 0.05     # read timeout during the handshake
+
+# 7SEG fw1.0 (Nano): a command takes its bytes on the wire plus ~1 ms for
+# 7x shiftOut and the "OK" answer; the next one is sent after that
+DISPLAY_CMD_S = 0.001
+DISPLAY_BYTES_CACHE = 256
+
 
 def _now():
     return time.strftime("%H:%M:%S")
@@ -33,6 +57,181 @@ def _dbg(msg: str):
     print(f"[usb_module {_now()}] {msg}", file=sys.stderr)
 
 
+class DeviceClock:
+    """Maps the gate's micros() counter to host time.perf_counter_ns().
+
+    Every timestamped line is a sample (device_us, host_rx_ns). Host
+    receive time = device time + offset + USB/serial latency, the latency
+    is never negative, so only the lowest samples carry the offset:
+    - drift (crystal error) = least squares slope through the minimum of
+      each block of BLOCK samples,
+    - offset = the lowest line with that slope under the last RECENT
+      samples.
+    Lap time = difference of two mapped device times, so the latency
+    jitter does not get into it.
+    """
+
+    WINDOW = 1024       # samples kept (500 ms sync -> ~8.5 min)
+    BLOCK = 16          # samples per lower-envelope point
+    RECENT = 64         # samples for the offset (~30 s)
+    WRAP = 1 << 32      # micros() overflows after ~71.6 min
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.samples = []           # (device_ns, offset_ns)
+        self._last_raw = None
+        self._wraps = 0
+        self.offset_ns = None       # host - device at device time base_ns
+        self.base_ns = 0
+        self.drift = 0.0            # ppm / 1e6
+
+    def unwrap(self, raw_us):
+        """32 bit micros() -> monotonic device time in ns."""
+        last = self._last_raw
+        if last is not None and raw_us < last:
+            if last - raw_us > self.WRAP // 2:
+                self._wraps += 1
+            else:
+                self.reset()        # counter went back = gate restarted
+        self._last_raw = raw_us
+        return (raw_us + self._wraps * self.WRAP) * 1000
+
+    def add(self, raw_us, host_ns):
+        """New sample; returns the unwrapped device time in ns."""
+        dev_ns = self.unwrap(raw_us)
+        self.samples.append((dev_ns, host_ns - dev_ns))
+        if len(self.samples) > self.WINDOW:
+            del self.samples[:len(self.samples) - self.WINDOW]
+        self._estimate()
+        return dev_ns
+
+    def _estimate(self):
+        samples = self.samples
+        b = self.BLOCK
+        mins = [min(samples[i:i + b], key=lambda p: p[1])
+                for i in range(0, len(samples) - b + 1, b)]
+        drift = 0.0
+        if len(mins) >= 3:
+            n = len(mins)
+            mx = sum(p[0] for p in mins) / n
+            my = sum(p[1] for p in mins) / n
+            sxx = sum((p[0] - mx) ** 2 for p in mins)
+            sxy = sum((p[0] - mx) * (p[1] - my) for p in mins)
+            drift = sxy / sxx if sxx else 0.0
+        base = samples[-1][0]
+        self.offset_ns = min(o - drift * (d - base) for d, o in samples[-self.RECENT:])
+        self.base_ns = base
+        self.drift = drift
+
+    @property
+    def synced(self):
+        return self.offset_ns is not None
+
+    def to_host_ns(self, dev_ns):
+        """Unwrapped device time (ns) -> host perf_counter_ns()."""
+        off = self.offset_ns + self.drift * (dev_ns - self.base_ns)
+        return int(dev_ns + off)
+
+
+def split_timestamp(text):
+    """'stop_a @123456' -> ('stop_a', 123456); no timestamp -> (text, None)."""
+    head, sep, tail = text.rpartition(TS_SEPARATOR)
+    if sep and tail.isdigit():
+        return head.strip(), int(tail)
+    return text, None
+
+
+class LineFramer:
+    """Serial bytes -> complete lines without the "\r\n" / "\n" ending.
+
+    Only the new bytes are searched for a newline and the consumed part
+    of the buffer is dropped once per feed(), so a burst of N lines costs
+    O(N), not O(N^2) like splitting an immutable bytes buffer per line.
+    A line longer than max_line is dropped up to its newline (dropped
+    counter), the buffer never grows beyond max_line.
+    """
+
+    def __init__(self, max_line=MAX_LINE):
+        self.max_line = max_line
+        self.buf = bytearray()
+        self.scanned = 0        # bytes of buf already searched for a newline
+        self.skipping = False   # inside an overlong line
+        self.dropped = 0
+
+    def reset(self):
+        self.buf.clear()
+        self.scanned = 0
+        self.skipping = False
+
+    def feed(self, data):
+        """Add received bytes, return the list of completed lines."""
+        buf = self.buf
+        buf += data
+        last = buf.rfind(b"\n", self.scanned)
+        if last < 0:
+            if len(buf) > self.max_line:
+                # no newline in sight: drop what we have, skip to the next one
+                self.skipping = True
+                buf.clear()
+            self.scanned = len(buf)
+            return []
+        # completed part: one copy and C level replace/split, no per-line
+        # copies of the rest of the buffer
+        done = bytes(buf[:last + 1])
+        del buf[:last + 1]
+        if b"\r" in done:
+            done = done.replace(b"\r\n", b"\n")
+        lines = done.split(b"\n")
+        lines.pop()                     # empty tail after the last newline
+        if self.skipping:
+            # end of an overlong line
+            self.skipping = False
+            self.dropped += 1
+            del lines[0]
+        if len(buf) > self.max_line:
+            self.skipping = True
+            buf.clear()
+        self.scanned = len(buf)
+        if lines and max(map(len, lines)) > self.max_line:
+            keep = [line for line in lines if len(line) <= self.max_line]
+            self.dropped += len(lines) - len(keep)
+            lines = keep
+        return lines
+
+
+def wait_ready(ser, probe=b"ping\n", ready=READY_LINES.__contains__,
+               timeout=READY_TIMEOUT, reset=True, clock=time.monotonic):
+    """Wait until the device on an open port answers.
+
+    reset=False (DTR/RTS held low, the board kept running): ping at once,
+    a running fw1.6 answers within milliseconds. After a reset the first
+    ping waits BOOTLOADER_S; the boot banner ends the wait as well.
+    Returns the seconds waited, None after `timeout` without an answer
+    (old firmware - the caller goes on, like after the fixed sleep).
+    """
+    framer = LineFramer()
+    old_timeout = ser.timeout
+    ser.timeout = READY_POLL_S
+    start = clock()
+    next_ping = start + (BOOTLOADER_S if reset else 0.0)
+    try:
+        while True:
+            now = clock()
+            if now - start >= timeout:
+                return None
+            if now >= next_ping:
+                ser.write(probe)
+                next_ping = now + PING_EVERY_S
+            data = ser.read(max(1, ser.in_waiting))
+            for line in framer.feed(data):
+                if ready(line.decode(errors="ignore").strip()):
+                    return clock() - start
+    finally:
+        ser.timeout = old_timeout
+
+
 class SerialHandler:
     def __init__(self, verbose: bool = False, prevent_reset: bool = True):
         self.ser = None
@@ -44,6 +243,8 @@ class SerialHandler:
         self.rx_thread = None
         self.rx_running = False
         self.rx_callback = None
+        self.rx_wake = threading.Event()    # port opened / reader stopped
+        self.device_clock = DeviceClock()   # gate fw1.6 timestamps
         self.write_lock = threading.Lock()
         self.open_lock = threading.Lock()
 
@@ -100,10 +301,12 @@ class SerialHandler:
                         f"open {self.port} {self.baud} attempt {attempt}"
                     )
 
+                    # read timeout only bounds the reader's blocking
+                    # read; <= 0 = block until data or cancel_read()
                     ser = serial.Serial(
                         port=None,
                         baudrate=self.baud,
-                        timeout=self.timeout,
+                        timeout=self.timeout if self.timeout > 0 else None,
                         write_timeout=1
                     )
 
@@ -124,10 +327,16 @@ class SerialHandler:
                     except Exception:
                         pass
 
-                    time.sleep(2)
+                    # until the gate answers, not a fixed 2 s
+                    waited = wait_ready(ser, reset=not self.prevent_reset)
+                    if waited is None:
+                        self._log("no ready answer (fw1.5 or older?)")
+                    else:
+                        self._log(f"ready after {waited * 1000:.0f} ms")
 
                     self.ser = ser
                     self._log("opened")
+                    self.rx_wake.set()
 
                     return
 
@@ -177,7 +386,25 @@ class SerialHandler:
     def send_finish(self):
         self.send(b"finish\n")
 
+    def set_device_timestamps(self, on: bool):
+        """Ask the gate (fw1.6+) to timestamp its events."""
+        self.device_clock.reset()
+        self.send(b"ts_on\n" if on else b"ts_off\n")
+
     def start_reader(self, callback):
+        """callback(text, rx_ns) on the reader thread.
+
+        The thread blocks in ser.read() (select() on the descriptor on
+        Linux) and wakes up on the first byte, so an idle port costs no
+        CPU and a line is not delayed by a polling interval.
+        stop_reader() interrupts the read with ser.cancel_read().
+
+        rx_ns = time.perf_counter_ns() when the first byte of the chunk
+        arrived, so gate times do not depend on GUI latency. Lines
+        with a gate timestamp ("stop_a @123456", fw1.6 + ts_on) get the
+        device time mapped to host time instead (no USB latency jitter);
+        "sync" lines only feed the clock estimate.
+        """
 
         if self.rx_running:
             return
@@ -186,59 +413,37 @@ class SerialHandler:
         self.rx_running = True
 
         def worker():
-            buffer = b""
+            framer = LineFramer()
             while self.rx_running:
                 try:
                     if not self.is_open():
-                        time.sleep(0.05)
+                        # until open() or stop_reader()
+                        self.rx_wake.wait(1.0)
+                        self.rx_wake.clear()
                         continue
 
-                    waiting = 0
-
-                    try:
-                        waiting = self.ser.in_waiting
-                    except Exception:
-                        pass
-
-                    if waiting <= 0:
-                        time.sleep(0.01)
-                        continue
-
-                    chunk = self.ser.read(waiting)
+                    # blocks until a byte arrives, timeout or cancel_read()
+                    chunk = self.ser.read(1)
 
                     if not chunk:
-                        time.sleep(0.01)
                         continue
 
-                    buffer += chunk
-
-                    while b"\n" in buffer:
-                        line, buffer = buffer.split(b"\n", 1)
-
-                        try:
-                            text = line.decode(
-                                errors="ignore"
-                            ).strip()
-                        except Exception:
-                            text = ""
+                    # arrival time of every line in this chunk
+                    rx_ns = time.perf_counter_ns()
 
-                        if not text:
-                            continue
-
-                        self._log(f"RX {text}")
+                    try:
+                        waiting = self.ser.in_waiting
+                    except Exception:
+                        waiting = 0
 
-                        try:
-                            if self.rx_callback:
-                                self.rx_callback(text)
+                    if waiting > 0:
+                        chunk += self.ser.read(waiting)
 
-                        except Exception as e:
-                            self._log(
-                                f"callback error {e}"
-                            )
+                    self._handle_chunk(framer, chunk, rx_ns)
 
                 except Exception as e:
                     self._log(f"reader error {e}")
-                    time.sleep(0.05)
+                    self.rx_wake.wait(0.05)
 
         self.rx_thread = threading.Thread(
             target=worker,
@@ -249,6 +454,12 @@ class SerialHandler:
 
     def stop_reader(self):
         self.rx_running = False
+        self.rx_wake.set()
+        try:
+            if self.ser is not None:
+                self.ser.cancel_read()      # wake the blocking read
+        except Exception:
+            pass
         try:
             if self.rx_thread and self.rx_thread.is_alive():
                 self.rx_thread.join(timeout=0.3)
@@ -258,13 +469,71 @@ class SerialHandler:
 
         self.rx_thread = None
 
+    def _handle_chunk(self, framer, chunk, rx_ns):
+        # received bytes -> lines -> rx_callback(text, event_ns)
+        for line in framer.feed(chunk):
+
+            try:
+                text = line.decode(
+                    errors="ignore"
+                ).strip()
+            except Exception:
+                text = ""
+
+            if not text:
+                continue
+
+            self._log(f"RX {text}")
+
+            text, dev_us = split_timestamp(text)
+            event_ns = rx_ns
+            if dev_us is not None:
+                clock = self.device_clock
+                event_ns = clock.to_host_ns(clock.add(dev_us, rx_ns))
+                if text == SYNC_EVENT:
+                    continue
+
+            try:
+                if self.rx_callback:
+                    self.rx_callback(text, event_ns)
+
+            except Exception as e:
+                self._log(
+                    f"callback error {e}"
+                )
+
+    async def serve(self, callback):
+        """Reader coroutine for SerialLoop, the same lines as start_reader().
+
+        callback(text, rx_ns) runs on the loop thread. Runs until
+        cancelled; a lost port is retried every 0.5 s.
+        """
+        self.rx_callback = callback
+        framer = LineFramer()
+        while True:
+            if not self.is_open():
+                await asyncio.sleep(0.5)
+                continue
+            try:
+                await watch_port(
+                    self.ser,
+                    lambda chunk, rx_ns: self._handle_chunk(framer, chunk, rx_ns)
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log(f"reader error {e}")
+                framer.reset()
+                await asyncio.sleep(0.5)
+
 
 class USBManager:
     def __init__(
         self,
         app=None,
         verbose: bool = True,
-        prevent_reset: bool = True
+        prevent_reset: bool = True,
+        perf=None
     ):
 
         self.app = app
@@ -282,7 +551,22 @@ class USBManager:
         self.timeout = DEFAULT_SERIAL_TIMEOUT
         self.display_a = None
         self.display_b = None
-        self.display_lock = threading.Lock()
+        self.device_timestamps = False      # gate fw1.6: events with micros()
+        # gate reader, panel writes and commands: tasks on one asyncio loop
+        self.io = SerialLoop()
+        self.reader = None                  # Future of handler.serve()
+        self._display_locks = None          # {1: asyncio.Lock, 2: ...}
+        # every gate / panel write: one priority queue, one writer task
+        self.tx = WriteQueue(self.io, perf=perf)
+        self.tx.add_port("gate", lambda: self.handler.ser, self._connect_gate)
+        # panels: latest text wins, paced to the Nano
+        for id in (1, 2):
+            self.tx.add_port(id, lambda id=id: self._get_display(id),
+                             lambda id=id: self._locked_connect(id),
+                             self._display_error, coalesce=True,
+                             pace=lambda msg, id=id: self._display_pace(id, msg))
+        self._display_bytes = {}            # text -> encoded command
+        self.display_sent = {1: 0, 2: 0}    # send_display() calls per panel
 
     def _log(self, msg: str):
         if self.verbose:
@@ -322,148 +606,207 @@ class USBManager:
         )
 
     def disconnect(self):
-        self.handler.close()
+        """Stop the reader, close all ports and the serial loop."""
+        if self.io.running:
+            try:
+                self.io.submit(self._close_all()).result(timeout=3)
+            except Exception as e:
+                self._log(f"disconnect error {e}")
+            self.io.stop()
+        self.reader = None
+        if self.handler.is_open():
+            self.handler.close()
+        self.disconnect_displays()
+
+    def _submit(self, coro):
+        self.io.start()
+        return self.io.submit(coro)
+
+    async def _close_all(self):
+        self._stop_reader_task()
+        self.tx.fail_pending(RuntimeError("port closed"))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.handler.close)
+        self.disconnect_displays()
 
     def start_reader(self, callback):
-        if self.handler.rx_running:
+        if self.reader is not None and not self.reader.done():
             return
         self.connect()
-        self.handler.start_reader(callback)
+        self.reader = self._submit(self.handler.serve(callback))
+        if self.device_timestamps:
+            self.set_device_timestamps(True)
+
+    def set_device_timestamps(self, on: bool):
+        self.device_timestamps = on
+        if self.handler.is_open():
+            # clock reset on the loop (the reader uses it), before the write
+            self.io.start()
+            self.io.call(self.handler.device_clock.reset)
+            self.send_command(
+                b"ts_on\n" if on else b"ts_off\n",
+                lambda ok, reason: ok or self._log(f"timestamps error {reason}")
+            )
+
+    def _stop_reader_task(self):
+        if self.reader is not None:
+            self.reader.cancel()
+            self.reader = None
 
     def stop_reader(self):
+        self._stop_reader_task()
         self.handler.stop_reader()
 
-    def connect_displays(self):
-        try:
-            if self.app.display_port_a and self.display_a is None:
-                self.display_a = serial.Serial(
-                    port=None,
-                    baudrate=int(self.app.display_baud_a),
-                    timeout=1
-                )
-                self.display_a.port = self.app.display_port_a
-                #self.display_a.dtr = False
-                #self.display_a.rts = False
-                self.display_a.open()
-                time.sleep(1)
-
-            if self.app.display_port_b and self.display_b is None:
-                self.display_b = serial.Serial(
-                    port=None,
-                    baudrate=int(self.app.display_baud_b),
-                    timeout=1
-                )
-                self.display_b.port = self.app.display_port_b
-                #self.display_b.dtr = False
-                #self.display_b.rts = False
-                self.display_b.open()
-                time.sleep(1)
+    # --- gate commands ---
+    def send_command(self, payload: bytes, on_result=None, prio=PRIO_COMMAND):
+        """Queue a command for the gate, never blocks the caller.
 
-        except Exception as e:
-            self._log(f"Display connect error {e}")
+        on_result(ok, reason) is called on the loop thread. Returns a
+        concurrent.futures.Future (True when written).
+        """
+        self._log(f"TX {payload!r}")
+        fut = self.tx.put("gate", payload, prio)
+        if on_result is not None:
+            def done(f):
+                try:
+                    f.result()
+                    on_result(True, "sent")
+                except Exception as e:
+                    on_result(False, str(e))
+            fut.add_done_callback(done)
+        return fut
 
+    async def _connect_gate(self):
+        # open() waits for the gate's answer, not on the loop
+        await asyncio.get_running_loop().run_in_executor(None, self.connect)
+        return self.handler.ser
 
-    def send_display(self, id, text):
-        self.connect_displays()
+    def send_start_async(self, on_result):
+        return self.send_command(b"start\n", on_result, PRIO_START)
 
+    def send_finish_async(self, on_result):
+        return self.send_command(b"finish\n", on_result, PRIO_START)
+
+    # --- LED panels ---
+    def _open_display(self, id):
+        # blocking (port open + handshake), runs in the executor
         if id == 1:
-            ser = self.display_a
-        elif id == 2:
-            ser = self.display_b
+            port, baud = self.app.display_port_a, self.app.display_baud_a
         else:
-            return False
-
-        if ser is None or not ser.is_open:
-            self.disconnect_displays()
-            self.connect_displays()
-
-            if id == 1:
-                ser = self.display_a
-            else:
-                ser = self.display_b
+            port, baud = self.app.display_port_b, self.app.display_baud_b
+        if not port:
+            return None
+        ser = serial.Serial(
+            port=None,
+            baudrate=int(baud),
+            timeout=1
+        )
+        ser.port = port
+        #ser.dtr = False
+        #ser.rts = False
+        ser.open()
+        # "7SEG READY" after a reset, "PONG" to the probe when running
+        waited = wait_ready(ser, probe=b"PING\n", ready=bool,
+                            timeout=DISPLAY_READY_TIMEOUT, reset=False)
+        self._log(f"Display {id} ready after {waited * 1000:.0f} ms" if waited is not None
+                  else f"Display {id}: no answer")
+        return ser
+
+    def _get_display(self, id):
+        return self.display_a if id == 1 else self.display_b
+
+    def _set_display(self, id, ser):
+        if id == 1:
+            self.display_a = ser
+        else:
+            self.display_b = ser
+
+    def _display_lock(self, id):
+        # created on the loop thread, one per panel: open/write in order
+        if self._display_locks is None:
+            self._display_locks = {1: asyncio.Lock(), 2: asyncio.Lock()}
+        return self._display_locks[id]
+
+    async def _connect_display(self, id):
+        ser = self._get_display(id)
+        if ser is not None and ser.is_open:
+            return ser
+        try:
+            ser = await asyncio.get_running_loop().run_in_executor(None, self._open_display, id)
+        except Exception as e:
+            self._log(f"Display connect error {e}")
+            ser = None
+        self._set_display(id, ser)
+        return ser
 
-        if ser is None:
-            return False
+    async def _locked_connect(self, id):
+        async with self._display_lock(id):
+            return await self._connect_display(id)
 
+    def _display_pace(self, id, msg):
+        baud = getattr(self.app, "display_baud_a" if id == 1 else "display_baud_b", None)
         try:
-            msg = (str(text) + "\r\n").encode()
-            self._log(f"Display msg: {msg}")
-            with self.display_lock:
-                ser.write(msg)
-                ser.flush()
-            return True
+            baud = int(baud)
+        except (TypeError, ValueError):
+            baud = DEFAULT_SERIAL_BAUD
+        return len(msg) * 10 / baud + DISPLAY_CMD_S     # 8N1 = 10 bits per byte
 
-        except Exception as e:
-            self._log(f"Display error {e}")
-            try:
-                if id == 1 and self.display_a:
-                    self.display_a.close()
+    def _display_error(self, id, e):
+        # failed write: reopen on the next one
+        self._log(f"Display error {e}")
+        self._close_display(id)
 
-                if id == 2 and self.display_b:
-                    self.display_b.close()
-            except:
-                pass
+    async def _connect_displays(self):
+        for id in (1, 2):
+            async with self._display_lock(id):
+                await self._connect_display(id)
 
-            if id == 1:
-                self.display_a = None
-            if id == 2:
-                self.display_b = None
-            return False      
+    def connect_displays(self):
+        """Open the LED panel ports in the background (serial loop)."""
+        if PY_SERIAL_AVAILABLE and self.app is not None:
+            self._submit(self._connect_displays())
 
+    def send_display(self, id, text):
+        """Queue text for LED panel id (1 = A, 2 = B); returns a Future.
+
+        Only the newest pending text per panel is sent (the Future of a
+        replaced one is False), text already shown is not sent again.
+        """
+        if id not in (1, 2) or not PY_SERIAL_AVAILABLE or self.app is None:
+            return None
+        msg = self._display_bytes.get(text)
+        if msg is None:
+            if len(self._display_bytes) >= DISPLAY_BYTES_CACHE:
+                self._display_bytes.clear()
+            msg = self._display_bytes[text] = (str(text) + "\r\n").encode()
+        if self.verbose:
+            self._log(f"Display msg: {msg}")
+        self.display_sent[id] += 1
+        return self.tx.put(id, msg, PRIO_DISPLAY)
 
-    def disconnect_displays(self):
-        try:
-            if self.display_a:
-                self.display_a.close()
-        except:
-            pass
+    async def _disconnect_displays(self):
+        for id in (1, 2):
+            async with self._display_lock(id):
+                self._close_display(id)
 
+    def _close_display(self, id):
+        ser = self._get_display(id)
         try:
-            if self.display_b:
-                self.display_b.close()
+            if ser:
+                ser.close()
         except:
             pass
+        self._set_display(id, None)
 
-        self.display_a = None
-        self.display_b = None
-
-
-    def send_start_async(self, on_result):
-        def worker():
-            try:
-                self.connect()
-                self.handler.send_start()
-                on_result(True, "sent")
-
-            except Exception as e:
-                on_result(False, str(e))
-
-        t = threading.Thread(
-            target=worker,
-            daemon=True
-        )
-
-        t.start()
-        return t
-
-
-    def send_finish_async(self, on_result):
-        def worker():
+    def disconnect_displays(self):
+        if self.io.running and not self.io.in_loop():
             try:
-                self.connect()
-                self.handler.send_finish()
-                on_result(True, "sent")
-
+                self.io.submit(self._disconnect_displays()).result(timeout=3)
+                return
             except Exception as e:
-                on_result(False, str(e))
-
-        t = threading.Thread(
-            target=worker,
-            daemon=True
-        )
-
-        t.start()
-        return t
+                self._log(f"Display disconnect error {e}")
+        self._close_display(1)
+        self._close_display(2)
 
 
 if __name__ == "__main__":
@@ -485,8 +828,8 @@ if __name__ == "__main__":
         2.0
     )
 
-    def rx(line):
-        print("RX:", line)
+    def rx(line, rx_ns):
+        print("RX:", line, rx_ns)
 
     um.start_reader(rx)
 